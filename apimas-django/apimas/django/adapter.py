@@ -9,6 +9,7 @@ from apimas.tabmatch import Tabmatch
 from apimas.errors import (InvalidInput, ConflictError, AdapterError,
                            InvalidSpec)
 from apimas.adapters.actions import ApimasAction
+from apimas.django.instrumentation import count_queries
 from apimas.django.wrapper import DjangoWrapper
 from apimas.django.testing import TestCase
 
@@ -70,23 +71,39 @@ class DjangoAdapter(object):
                 'apimas.components.processors.DeSerialization'
             ],
             'post': [
-                'apimas.components.processors.Serialization'
+                'apimas.components.processors.Serialization',
+                'apimas.django.processors.CacheInvalidation',
             ]
         },
         'list': {
             'method': 'GET',
             'url': '/',
             'handler': 'apimas.django.handlers.ListHandler',
+            'pre': [
+                'apimas.components.processors.Projection',
+                'apimas.django.processors.Filtering',
+                'apimas.django.processors.ConditionalRequest',
+                'apimas.django.processors.CacheLookup',
+            ],
             'post': [
-                'apimas.components.processors.Serialization'
+                'apimas.components.processors.Serialization',
+                'apimas.components.processors.ConditionalResponse',
+                'apimas.django.processors.CacheStore',
             ]
         },
         'retrieve': {
             'method': 'GET',
             'url': '/',
             'handler': 'apimas.django.handlers.RetrieveHandler',
+            'pre': [
+                'apimas.components.processors.Projection',
+                'apimas.django.processors.ConditionalRequest',
+                'apimas.django.processors.CacheLookup',
+            ],
             'post': [
-                'apimas.components.processors.Serialization'
+                'apimas.components.processors.Serialization',
+                'apimas.components.processors.ConditionalResponse',
+                'apimas.django.processors.CacheStore',
             ]
         },
         'update': {
@@ -98,6 +115,7 @@ class DjangoAdapter(object):
             'handler': 'apimas.django.handlers.UpdateHandler',
             'post': [
                 'apimas.components.processors.Serialization',
+                'apimas.django.processors.CacheInvalidation',
             ]
 
         },
@@ -110,6 +128,7 @@ class DjangoAdapter(object):
             'handler': 'apimas.django.handlers.UpdateHandler',
             'post': [
                 'apimas.components.processors.Serialization',
+                'apimas.django.processors.CacheInvalidation',
             ]
 
         },
@@ -117,6 +136,9 @@ class DjangoAdapter(object):
             'method': 'DELETE',
             'url': '/',
             'handler': 'apimas.django.handlers.DeleteHandler',
+            'post': [
+                'apimas.django.processors.CacheInvalidation',
+            ]
         },
     }
 
@@ -175,9 +197,11 @@ class DjangoAdapter(object):
         return [url for endpoint_urls in self.urls.values()
                 for url in endpoint_urls]
 
-    def _update_testcase_content(self, matches, pattern_spec, content):
+    def _update_testcase_content(self, matches, pattern_spec, content,
+                                 test_keys):
         for row in matches:
             key = (row.endpoint, row.collection, row.action)
+            test_keys.add(key)
             for stage, func in pattern_spec.iteritems():
                 if stage not in content:
                     content[stage] = {}
@@ -240,6 +264,58 @@ class DjangoAdapter(object):
             ... }
             >>> TestCase = adapter.get_testcase(patterns=patterns)
         """
+        content, test_keys = self._get_testcase_content(patterns)
+        return self._create_testcase(name, content, test_keys, kwargs)
+
+    def get_testcases(self, patterns=None, name='DjangoTestCase', **kwargs):
+        """
+        Gets a test case class per collection for testing the API made by
+        the adapter.
+
+        It works like `get_testcase()`, but the test methods of every
+        collection are put on a separate class, named
+        `<name>_<endpoint>_<collection>`. Thus, test runners which
+        distribute test classes to processes, e.g. `pytest -n <workers>
+        --dist loadscope` (pytest-xdist), can run the tests of different
+        collections in parallel, each worker with its own test database.
+        The default instances of every class (see
+        `TestCase.setUpTestData()`) are created only for its collection.
+
+        Args:
+            patterns (dict): Dictionary of execution spec per pattern.
+            name (str): (optional) Prefix of the names of generated classes.
+            **kwargs: Additional content for generated classes.
+
+        Returns:
+            dict: The generated classes keyed by their name.
+
+        Examples:
+            The following snippet can be included in your `tests.py` file,
+            so that all classes are discovered by the test runner.
+            >>> globals().update(adapter.get_testcases(patterns=patterns))
+        """
+        content, test_keys = self._get_testcase_content(patterns)
+        groups = defaultdict(list)
+        for key in test_keys:
+            groups[key[:2]].append(key)
+        testcases = {}
+        for (endpoint, collection), keys in groups.iteritems():
+            method_names = {'test_%s_%s_%s' % key for key in keys}
+            group_content = {}
+            for attr, value in content.iteritems():
+                if isinstance(value, dict):
+                    # Functions of a stage, keyed by test.
+                    group_content[attr] = {
+                        key: func for key, func in value.iteritems()
+                        if key[:2] == (endpoint, collection)}
+                elif attr in method_names:
+                    group_content[attr] = value
+            class_name = '%s_%s_%s' % (name, endpoint, collection)
+            testcases[class_name] = self._create_testcase(
+                class_name, group_content, keys, kwargs)
+        return testcases
+
+    def _get_testcase_content(self, patterns):
         rules = self._test_methods.keys()
         patterns = patterns or rules
         if not self._test_methods:
@@ -254,14 +330,19 @@ class DjangoAdapter(object):
         columns = ('endpoint', 'collection', 'action')
         tab = Tabmatch(columns, rules)
         content = {}
+        test_keys = set()
         for pattern, pattern_spec in patterns.iteritems():
             pattern = _parse_pattern(pattern)
             matches = tab.multimatch(pattern, expand=columns)
-            self._update_testcase_content(matches, pattern_spec, content)
+            self._update_testcase_content(matches, pattern_spec, content,
+                                          test_keys)
+        return content, sorted(test_keys)
 
+    def _create_testcase(self, name, content, test_keys, kwargs):
         standard_content = {
             'adapter': self,
             'spec': self.spec,
+            'test_keys': test_keys,
         }
         content = dict(standard_content, **content)
         content.update(kwargs)
@@ -285,9 +366,9 @@ class DjangoAdapter(object):
         context = self._get_orm_context(
             collection_spec.get('.collection'), collection_path)
         apimas_action = ApimasAction(
-            collection_path, action_url, action_name,
+            collection_path, action_name, action_url,
             handler(collection_spec), request_proc=pre_proc,
-            response_proc=post_proc, **context)
+            response_proc=post_proc, query_counter=count_queries, **context)
         return apimas_action
 
     def _construct_url(self, path, view, action_url, is_collection):
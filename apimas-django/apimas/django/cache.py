@@ -0,0 +1,305 @@
+import fcntl
+import hashlib
+import os
+import threading
+import time
+import cPickle as pickle
+from collections import OrderedDict
+from apimas import utils
+from apimas.errors import InvalidSpec
+
+
+def new_generation():
+    """
+    Gets a random initial value of a generation.
+
+    Generations which are missing, e.g. evicted ones, start again from a
+    random value, so that they never match the generation of older
+    entries.
+    """
+    return int(os.urandom(6).encode('hex'), 16)
+
+
+class BaseCache(object):
+    """
+    Interface for implementing the backend of a response cache.
+
+    Args:
+        timeout (int): (optional) Default number of seconds after which
+            cached values expire. If `None`, values never expire.
+    """
+    def __init__(self, timeout=None):
+        self.timeout = timeout
+
+    def get(self, key, default=None):
+        """ Gets the value of the given key or `default` if missing. """
+        raise NotImplementedError('get() must be implemented')
+
+    def set(self, key, value, timeout=None):
+        """ Caches a value under the given key. """
+        raise NotImplementedError('set() must be implemented')
+
+    def add(self, key, value, timeout=None):
+        """
+        Caches a value under the given key, unless the key exists.
+
+        Returns:
+            bool: `True` if the value is cached; `False` otherwise.
+
+        Backends should override it to make it atomic.
+        """
+        if self.get(key) is not None:
+            return False
+        self.set(key, value, timeout=timeout)
+        return True
+
+    def incr(self, key):
+        """
+        Increments the integer value of the given key. Missing keys start
+        from a random generation (see `new_generation()`).
+
+        Used for the generations of cached collections; these never expire.
+        Backends should override it to make it atomic.
+        """
+        value = self.get(key)
+        value = new_generation() if value is None else value + 1
+        self.set(key, value, timeout=0)
+        return value
+
+    def get_generation(self, key):
+        """
+        Gets the generation stored under the given key. A missing
+        generation is initialized to a random value.
+        """
+        generation = self.get(key)
+        if generation is not None:
+            return generation
+        generation = new_generation()
+        if self.add(key, generation, timeout=0):
+            return generation
+        # Another process has initialized it in the meantime.
+        return self.get(key, generation)
+
+    def _get_expiry(self, timeout):
+        timeout = self.timeout if timeout is None else timeout
+        return None if not timeout else time.time() + timeout
+
+
+class LRUCache(BaseCache):
+    """
+    An in-process cache which evicts the least recently used entries.
+
+    Note that entries are not shared among processes, so writes in one
+    process do not invalidate the entries of the others.
+
+    Args:
+        max_entries (int): (optional) Maximum number of cached entries.
+    """
+    def __init__(self, max_entries=1024, **kwargs):
+        super(LRUCache, self).__init__(**kwargs)
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return default
+            value, expiry = entry
+            if expiry is not None and expiry < time.time():
+                return default
+            # Re-insert entry, so that it becomes the most recently used.
+            self._entries[key] = entry
+            return value
+
+    def _get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expiry = entry
+        if expiry is not None and expiry < time.time():
+            return None
+        return value
+
+    def _set(self, key, value, timeout):
+        self._entries.pop(key, None)
+        self._entries[key] = (value, self._get_expiry(timeout))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def set(self, key, value, timeout=None):
+        with self._lock:
+            self._set(key, value, timeout)
+
+    def add(self, key, value, timeout=None):
+        with self._lock:
+            if self._get(key) is not None:
+                return False
+            self._set(key, value, timeout)
+            return True
+
+    def incr(self, key):
+        with self._lock:
+            value = self._get(key)
+            value = new_generation() if value is None else value + 1
+            self._set(key, value, 0)
+            return value
+
+
+class DjangoCache(BaseCache):
+    """
+    A cache which stores entries to the django cache framework.
+
+    Generations are incremented with the atomic `add()` and `incr()` of the
+    django cache. Note that the backend may evict them (e.g. the culling of
+    the local-memory cache or the LRU of memcached); they start again from a
+    random value then.
+
+    Args:
+        alias (str): (optional) Alias of the django cache to be used.
+    """
+    def __init__(self, alias='default', **kwargs):
+        super(DjangoCache, self).__init__(**kwargs)
+        self.alias = alias
+
+    @property
+    def cache(self):
+        from django.core.cache import caches
+        return caches[self.alias]
+
+    def get(self, key, default=None):
+        return self.cache.get(key, default)
+
+    def set(self, key, value, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        # Django treats `None` as "never expire", and `0` as "expire now".
+        self.cache.set(key, value, timeout=timeout or None)
+
+    def add(self, key, value, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        return self.cache.add(key, value, timeout=timeout or None)
+
+    def incr(self, key):
+        cache = self.cache
+        while True:
+            generation = new_generation()
+            if cache.add(key, generation, timeout=None):
+                return generation
+            try:
+                return cache.incr(key)
+            except ValueError:
+                # The key was evicted in the meantime.
+                continue
+
+
+class FileCache(BaseCache):
+    """
+    A cache which stores every entry to a file of a local directory.
+
+    Entries are shared among processes of the same host. Entries are never
+    evicted, only overwritten; the directory grows with the number of
+    distinct keys, so it should be cleaned up externally.
+
+    Args:
+        directory (str): Directory where entries are stored.
+    """
+    def __init__(self, directory, **kwargs):
+        super(FileCache, self).__init__(**kwargs)
+        self.directory = directory
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def _get_path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(key).hexdigest())
+
+    def get(self, key, default=None):
+        try:
+            with open(self._get_path(key), 'rb') as f:
+                value, expiry = pickle.load(f)
+        except (IOError, EOFError, pickle.UnpicklingError):
+            return default
+        if expiry is not None and expiry < time.time():
+            return default
+        return value
+
+    def set(self, key, value, timeout=None):
+        path = self._get_path(key)
+        tmp_path = '%s.%d.tmp' % (path, os.getpid())
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((value, self._get_expiry(timeout)), f,
+                        pickle.HIGHEST_PROTOCOL)
+        # Renaming is atomic, so readers never see partial entries.
+        os.rename(tmp_path, path)
+
+    def _lock(self, key):
+        # An exclusive lock among the processes which modify the key.
+        lock_file = open(self._get_path(key) + '.lock', 'a')
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        return lock_file
+
+    def add(self, key, value, timeout=None):
+        with self._lock(key):
+            return super(FileCache, self).add(key, value, timeout=timeout)
+
+    def incr(self, key):
+        with self._lock(key):
+            return super(FileCache, self).incr(key)
+
+
+DEFAULT_BACKEND = 'apimas.django.cache.LRUCache'
+
+_caches = {}
+
+
+def get_cache(backend=DEFAULT_BACKEND, **kwargs):
+    """
+    Gets the cache of the given backend and options.
+
+    Caches are created once per process, so that all collections which are
+    configured with the same backend and options share the same cache.
+    """
+    key = (backend, tuple(sorted(kwargs.iteritems())))
+    cache = _caches.get(key)
+    if cache is None:
+        cache_cls = utils.import_object(backend)
+        cache = cache_cls(**kwargs)
+        _caches[key] = cache
+    return cache
+
+
+def get_caches():
+    """ Gets all caches created in this process. """
+    return _caches.values()
+
+
+def get_collection_cache(spec):
+    """
+    Gets the cache of a collection as declared on the `cache` parameter of
+    its `.collection` predicate, e.g.
+
+        '.collection': {
+            'model': 'myapp.models.MyModel',
+            'cache': {
+                'backend': 'apimas.django.cache.FileCache',
+                'timeout': 60,
+                'directory': '/var/cache/myapp',
+            },
+        }
+
+    `cache: true` uses an `LRUCache` with no timeout.
+
+    Returns:
+        The cache of the collection or `None` if it is not cached.
+    """
+    params = (spec.get('.collection') or {}).get('cache')
+    if not params:
+        return None
+    if params is True:
+        params = {}
+    if not isinstance(params, dict):
+        raise InvalidSpec('Parameter `cache` must be a dict or a boolean',
+                          loc=('.collection', 'cache'))
+    params = dict(params)
+    backend = params.pop('backend', DEFAULT_BACKEND)
+    return get_cache(backend, **params)
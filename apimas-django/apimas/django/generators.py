@@ -1,4 +1,3 @@
-import random
 from urlparse import urljoin
 from django.db import models
 from django.core.files.uploadedfile import SimpleUploadedFile
@@ -8,7 +7,7 @@ from apimas.decorators import after
 from apimas.utils import generators as gen, import_object
 
 
-def generate_file(file_name=None, size=8, archived=True):
+def generate_file(file_name=None, size=8, archived=True, gen_context=None):
     """
     Generate a mock file used to represent an uploaded file for a django
     request.
@@ -18,17 +17,21 @@ def generate_file(file_name=None, size=8, archived=True):
             random name is generated.
         size (int):  (optional) Size of the generated file in bytes.
         archived (bool): `True` if generated file should be archived.
+        gen_context (GeneratorContext): (optional) Source of random data.
     """
-    file_name = file_name or gen.fake.file_name()
+    gen_context = gen.get_gen_context(gen_context)
+    file_name = file_name or gen_context.fake.file_name()
     mock_file = gen.generate_fake_file(size=size, file_name=file_name,
-                                       archived=archived)
+                                       archived=archived,
+                                       gen_context=gen_context)
     uploaded = SimpleUploadedFile(
-        file_name, mock_file.getvalue(), content_type=gen.fake.mime_type())
+        file_name, mock_file.getvalue(),
+        content_type=gen_context.fake.mime_type())
     mock_file.close()
     return uploaded
 
 
-def generate_ref(to, instances=None):
+def generate_ref(to, instances=None, gen_context=None):
     """
     Generates a ref URL based on the given endpoint which points to one of
     the existing model instances.
@@ -37,13 +40,15 @@ def generate_ref(to, instances=None):
         to (str): Collection path from which URL is constructed, e.g. api/foo.
         instances (dict): A dictionary of lists which containts the existing
             model instances per collection path.
+        gen_context (GeneratorContext): (optional) Source of random data.
 
     Returns:
         URL pointing to a specific instance of a collection, e.g. api/foo/1/.
     """
     instances = instances or {}
     ref_instances = instances.get(to)
-    random_instance = random.choice(ref_instances)
+    random_instance = gen.get_gen_context(gen_context).random.choice(
+        ref_instances)
     if random_instance is None:
         return None
     ref = to.strip('/') + '/'
@@ -58,9 +63,10 @@ class DjangoRequestGenerator(gen.RequestGenerator):
     # Override generator for files.
     gen.RequestGenerator.RANDOM_GENERATORS['.file'] = generate_file
 
-    def __init__(self, spec, instances):
+    def __init__(self, spec, instances, gen_context=None):
         self.instances = instances
-        super(DjangoRequestGenerator, self).__init__(spec)
+        super(DjangoRequestGenerator, self).__init__(
+            spec, gen_context=gen_context)
 
     def _common_constructor(self, field_type):
         @after(['.readonly'])
@@ -69,8 +75,10 @@ class DjangoRequestGenerator(gen.RequestGenerator):
                 return None
             if field_type == '.ref':
                 return generate_ref(
-                    **dict(context.spec, **{'instances': self.instances}))
-            return self.RANDOM_GENERATORS[field_type](**context.spec)
+                    instances=self.instances, gen_context=self.gen_context,
+                    **context.spec)
+            return self.RANDOM_GENERATORS[field_type](
+                gen_context=self.gen_context, **context.spec)
         return generate
 
 
@@ -96,6 +104,7 @@ class SpecGenerator(object):
     Args:
         endpoint (str): (optional) The name of endpoint. If `None` a random
             name is generated.
+        gen_context (GeneratorContext): (optional) Source of random data.
 
     Example:
         >>> from django.db import models
@@ -164,9 +173,10 @@ class SpecGenerator(object):
         '.list',
     }
 
-    def __init__(self, endpoint=None):
-        self.endpoint = endpoint or gen.generate_random_string(
-            max_length=10)
+    def __init__(self, endpoint=None, gen_context=None):
+        self.gen_context = gen.get_gen_context(gen_context)
+        self.endpoint = endpoint or gen.generate_string(
+            max_length=10, gen_context=self.gen_context)
 
     def generate(self, django_models):
         """
@@ -212,8 +222,11 @@ class SpecGenerator(object):
     def _get_actions(self, isresource):
         actions = self.COLLECTION_ACTIONS if not isresource\
                 else self.RESOURCE_ACTIONS
-        nactions = gen.generate_integer(upper=len(actions), lower=1)
-        selected = random.sample(actions, nactions)
+        nactions = gen.generate_integer(upper=len(actions), lower=1,
+                                        gen_context=self.gen_context)
+        # Sets are sorted, so that the same actions are selected for the
+        # same random state.
+        selected = self.gen_context.random.sample(sorted(actions), nactions)
         return {k: {} for k in selected}
 
     def _generate_field_spec(self, model_fields, isfield=False):
@@ -225,7 +238,8 @@ class SpecGenerator(object):
         for model_field in model_fields:
             predicate_type = self.MODEL_FIELD_TYPES[type(model_field)]
             if isinstance(predicate_type, list):
-                predicate_type = random.choice(predicate_type)
+                predicate_type = self.gen_context.random.choice(
+                    predicate_type)
             path = predicate_type.split('/')
             node = to_dict(path)
             # The last element of path denotes the predicate type of
@@ -1,10 +1,12 @@
-from django.core.exceptions import ObjectDoesNotExist
+from django.core.exceptions import (
+    ObjectDoesNotExist, ValidationError as DjangoValidationError)
 from django.db.models import Model
 from django.db.models.query import QuerySet
 from apimas import documents as doc
 from apimas.errors import NotFound, InvalidInput, ValidationError
 from apimas.components import BaseHandler
-from apimas.components.processors import DeSerialization
+from apimas.components.processors import DeSerialization, Projection
+from apimas.django.processors import Filtering
 
 
 REF = '.ref'
@@ -25,6 +27,7 @@ class DjangoBaseHandler(BaseHandler):
         * `data`: A dictionary representing data of request (if any).
         * `pk`: Primary key of the resource if handler operates on a specific
                 model instance, e.g. update.
+        * `fields`: Fields to which the response is restricted (if any).
 
     The final response of the handler is a dictionary of kwargs needed by
     APIMAS in order response can be constructed later. This includes:
@@ -67,6 +70,7 @@ class DjangoBaseHandler(BaseHandler):
         'pk': 'request/kwargs/pk',
     }
     READ_KEYS.update(DeSerialization.WRITE_KEYS)
+    READ_KEYS.update(Projection.WRITE_KEYS)
 
     REQUIRED_KEYS = {
         'model',
@@ -165,7 +169,7 @@ class DjangoBaseHandler(BaseHandler):
         """
         if instance is None:
             return None
-        spec_properties = spec or self.spec.get('*')
+        spec_properties = self.spec.get('*') if spec is None else spec
         data = {}
         for k, v in spec_properties.iteritems():
             # Ignore predicates.
@@ -181,7 +185,51 @@ class DjangoBaseHandler(BaseHandler):
             data[source] = value
         return data
 
-    def get_resource(self, orm_model, resource_id):
+    def get_projected_spec(self, fields):
+        """
+        Gets the specification of the fields of the collection to which
+        the response is restricted.
+
+        Args:
+            fields (frozenset): Names of projected fields.
+
+        Returns:
+            dict: The subset of node `*` of specification which corresponds
+                to the projected fields, or `None` if there is no projection.
+        """
+        if fields is None:
+            return None
+        return {k: v for k, v in self.spec.get('*').iteritems()
+                if k in fields}
+
+    def get_queryset(self, orm_model, fields=None):
+        """
+        Gets the queryset of the given model.
+
+        If `fields` are given, only the columns of the projected fields are
+        loaded from the database (along with the primary key). Many to many
+        and reverse relations do not correspond to columns of the model.
+
+        Args:
+            orm_model: Django model to query.
+            fields (frozenset): (optional) Names of projected fields.
+
+        Returns:
+            A django QuerySet.
+        """
+        queryset = orm_model.objects.all()
+        spec = self.get_projected_spec(fields)
+        if spec is None:
+            return queryset
+        columns = [orm_model._meta.pk.name]
+        for k, v in spec.iteritems():
+            source = doc.doc_get(v, ('.field', 'source')) or k
+            field = orm_model._meta.get_field(source)
+            if field.concrete and not field.many_to_many:
+                columns.append(field.name)
+        return queryset.only(*columns)
+
+    def get_resource(self, orm_model, resource_id, fields=None):
         """
         Get model instance based on the given resource id.
 
@@ -189,12 +237,13 @@ class DjangoBaseHandler(BaseHandler):
             orm_model: ORM model which corresponds to the resource we want
                 to retrieve.
             resource_id: ID of resource to be retrieved.
+            fields (frozenset): (optional) Names of projected fields.
 
         Raises:
             NotFound: A model instance with the given id cannot be found.
         """
         try:
-            return orm_model.objects.get(pk=resource_id)
+            return self.get_queryset(orm_model, fields).get(pk=resource_id)
         except (ObjectDoesNotExist, ValueError, TypeError):
             msg = 'Resource with ID {pk!r} not found'
             raise NotFound(msg.format(pk=str(resource_id)))
@@ -301,11 +350,12 @@ class DjangoBaseHandler(BaseHandler):
             msg = 'A model instance or a queryset is expected. {!r} found.'
             raise InvalidInput(msg.format(str(type(resource))))
         model = context_data['model']
+        spec = self.get_projected_spec(context_data.get('fields'))
         if isinstance(resource, QuerySet):
-            instance = [self.to_dict(model, inst) for inst in resource]
+            instance = [self.to_dict(model, inst, spec) for inst in resource]
         else:
             instance = None if resource is None\
-                    else self.to_dict(model, resource)
+                    else self.to_dict(model, resource, spec)
         return {
             'content': instance,
             'content_type': self.CONTENT_TYPE,
@@ -353,17 +403,44 @@ class ListHandler(DjangoBaseHandler):
 
     STATUS_CODE = 200
     CONTENT_TYPE = 'application/json'
+    READ_KEYS = dict(DjangoBaseHandler.READ_KEYS, **Filtering.WRITE_KEYS)
     REQUIRED_KEYS = {
         'model',
     }
 
+    def filter_queryset(self, queryset, filters=None, ordering=None):
+        """
+        Filters and orders the given queryset.
+
+        Args:
+            queryset: Django QuerySet to be filtered.
+            filters: (optional) A django `Q` object.
+            ordering (list): (optional) Expressions passed to
+                `QuerySet.order_by()`.
+
+        Raises:
+            ValidationError: Values of filters are not valid for the
+                corresponding model fields.
+        """
+        if filters is not None:
+            try:
+                queryset = queryset.filter(filters)
+            except (ValueError, TypeError, DjangoValidationError) as e:
+                msg = 'Invalid filter value: {!s}'
+                raise ValidationError(msg.format(e))
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        return queryset
+
     def execute(self, collection, url, action, context_data):
         """
         Gets all django model instances based on the orm model extracted
-        from request context.
+        from request context, filtered and ordered as requested.
         """
         model = context_data['model']
-        return model.objects.all()
+        queryset = self.get_queryset(model, context_data.get('fields'))
+        return self.filter_queryset(queryset, context_data.get('filters'),
+                                    context_data.get('ordering'))
 
 
 class RetrieveHandler(DjangoBaseHandler):
@@ -383,7 +460,7 @@ class RetrieveHandler(DjangoBaseHandler):
         """
         model = context_data['model']
         pk = context_data['pk']
-        return self.get_resource(model, pk)
+        return self.get_resource(model, pk, context_data.get('fields'))
 
 
 class UpdateHandler(CreateHandler):
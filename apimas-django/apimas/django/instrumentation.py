@@ -0,0 +1,15 @@
+from django.db import connections
+
+
+def count_queries():
+    """
+    Counts the queries logged by all database connections.
+
+    Used as the query counter of instrumented actions (see
+    `apimas.adapters.instrumentation`). Django logs queries only if
+    `settings.DEBUG` is `True` or `force_debug_cursor` is set on a
+    connection; otherwise, queries are not counted. Logs are reset at the
+    start of every request.
+    """
+    return sum(len(connection.queries_log)
+               for connection in connections.all())
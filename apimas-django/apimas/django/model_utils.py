@@ -1,5 +1,7 @@
-from django.db import models as dmodels
-from apimas.utils import generators as gen
+from collections import OrderedDict
+from django.db import models as dmodels, transaction
+from apimas.errors import InvalidInput
+from apimas.utils import generators as gen, utils
 from apimas.django.generators import generate_file
 
 # Dictionary of generators per model field.
@@ -16,6 +18,21 @@ FIELD_TYPE_MAPPING = {
     dmodels.FileField: generate_file,
 }
 
+# Dictionary of generators of many values at once per model field, used by
+# bulk population. Fields which are not included are populated by the
+# generators of `FIELD_TYPE_MAPPING`.
+BATCH_FIELD_TYPE_MAPPING = {
+    dmodels.TextField: gen.generate_strings,
+    dmodels.CharField: gen.generate_strings,
+    dmodels.EmailField: gen.generate_emails,
+    dmodels.IntegerField: gen.generate_integers,
+    dmodels.BigIntegerField: gen.generate_integers,
+    dmodels.FloatField: gen.generate_floats,
+    dmodels.DateTimeField: gen.generate_datetimes,
+    dmodels.DateField: gen.generate_dates,
+    dmodels.BooleanField: gen.generate_booleans,
+}
+
 
 def _extra_model_kwargs(model_field):
     if type(model_field) is dmodels.CharField:
@@ -23,11 +40,38 @@ def _extra_model_kwargs(model_field):
     return {}
 
 
-def _generate_field_value(model_field, instances):
-    model_kwargs = _extra_model_kwargs(model_field)
-    if model_field.related_model is None:
-        generator = FIELD_TYPE_MAPPING[type(model_field)]
-        return generator(**model_kwargs), False
+# Fields of every model along with the generators of their values.
+_model_fields = {}
+
+
+def _get_model_fields(model):
+    """
+    Gets the fields of a model, which are populated with random data.
+
+    Returns:
+        list: A `(model field, generator, kwargs)` tuple for every field.
+        The generator of related fields is `None`.
+    """
+    model_fields = _model_fields.get(model)
+    if model_fields is None:
+        model_fields = []
+        for model_field in model._meta.get_fields():
+            if not isinstance(model_field, dmodels.Field) or isinstance(
+                    model_field, dmodels.AutoField):
+                continue
+            generator = None
+            if model_field.related_model is None:
+                generator = FIELD_TYPE_MAPPING[type(model_field)]
+            model_fields.append(
+                (model_field, generator, _extra_model_kwargs(model_field)))
+        _model_fields[model] = model_fields
+    return model_fields
+
+
+def _generate_field_value(model_field, generator, model_kwargs, instances,
+                          gen_context=None):
+    if generator is not None:
+        return generator(gen_context=gen_context, **model_kwargs), False
     ref_instance = instances.get(
         model_field.related_model)
     if model_field.one_to_one or model_field.many_to_one:
@@ -69,7 +113,7 @@ def get_models_to_create(models):
     return schema
 
 
-def populate_model(model, instances, save=True):
+def populate_model(model, instances, save=True, gen_context=None):
     """
     Creates a new instance of a model using random data.
 
@@ -80,20 +124,17 @@ def populate_model(model, instances, save=True):
             required modele that instance requires in order to be created.
         save (bool): (optional) `True` if istance is saved to db; `False`
             otherwise.
+        gen_context (GeneratorContext): (optional) Source of random data.
 
     Returns:
         Created model instance with random data.
     """
-    model_fields = filter(lambda x: isinstance(x, dmodels.Field),
-                          model._meta.get_fields())
     kwargs = {}
     # Outstanding instances in case of Many-to-Many relations.
     outstanding = {}
-    for model_field in model_fields:
-        if isinstance(model_field, dmodels.AutoField):
-            continue
+    for model_field, generator, model_kwargs in _get_model_fields(model):
         field_value, isoutstanding = _generate_field_value(
-            model_field, instances)
+            model_field, generator, model_kwargs, instances, gen_context)
         if isoutstanding:
             outstanding[model_field.name] = field_value
         else:
@@ -101,3 +142,158 @@ def populate_model(model, instances, save=True):
     if not save:
         return kwargs
     return _save(model, kwargs, outstanding)
+
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def _get_pks(model, **filters):
+    return list(model.objects.filter(**filters).order_by('pk').values_list(
+        'pk', flat=True))
+
+
+def _generate_refs(model, model_field, ref_pks, count, gen_context=None):
+    """
+    Generates the primary keys of the instances referenced by `count` new
+    instances of a model.
+
+    Instances are referenced at random, except for one-to-one relations,
+    where every instance is referenced at most once.
+    """
+    rng = gen.get_gen_context(gen_context).random
+    if not model_field.one_to_one:
+        if not ref_pks:
+            return [None] * count
+        choice = rng.choice
+        return [choice(ref_pks) for _ in xrange(count)]
+    referenced = set(model.objects.exclude(**{
+        model_field.attname: None}).values_list(
+            model_field.attname, flat=True))
+    available = [pk for pk in ref_pks if pk not in referenced]
+    if len(available) < count and not model_field.null:
+        raise InvalidInput(
+            'Not enough instances of {!r} for the one-to-one field {!r}'
+            .format(model_field.related_model.__name__, model_field.name))
+    refs = rng.sample(available, min(count, len(available)))
+    return refs + [None] * (count - len(refs))
+
+
+def _bulk_populate(model, count, pks, batch_size, gen_context=None):
+    """
+    Inserts `count` instances of a model with random data, in batches of
+    `batch_size` instances. Column values are generated per batch.
+    """
+    model_fields = [(model_field, generator, model_kwargs)
+                    for model_field, generator, model_kwargs
+                    in _get_model_fields(model)
+                    if not model_field.many_to_many]
+    if not model_fields:
+        # Rows without any column but their primary key cannot be inserted
+        # in bulk.
+        for _ in xrange(count):
+            model.objects.create()
+        return
+    for start in xrange(0, count, batch_size):
+        size = min(batch_size, count - start)
+        columns = []
+        for model_field, generator, model_kwargs in model_fields:
+            batch_generator = BATCH_FIELD_TYPE_MAPPING.get(type(model_field))
+            if generator is None:
+                values = _generate_refs(
+                    model, model_field,
+                    pks.get(model_field.related_model, []), size,
+                    gen_context)
+            elif batch_generator is not None:
+                values = batch_generator(size, gen_context=gen_context,
+                                         **model_kwargs)
+            else:
+                values = [generator(gen_context=gen_context, **model_kwargs)
+                          for _ in xrange(size)]
+            columns.append((model_field.attname, values))
+        model.objects.bulk_create([
+            model(**{name: values[i] for name, values in columns})
+            for i in xrange(size)])
+
+
+def _bulk_populate_m2m(model, new_pks, pks, m2m_count, batch_size,
+                       gen_context=None):
+    """
+    Relates every new instance of a model with `m2m_count` instances of
+    its many-to-many fields, by inserting rows to their through tables.
+    """
+    sample = gen.get_gen_context(gen_context).random.sample
+    for model_field in model._meta.many_to_many:
+        through = model_field.rel.through
+        ref_pks = pks.get(model_field.related_model)
+        if not through._meta.auto_created or not ref_pks:
+            continue
+        source = through._meta.get_field(
+            model_field.m2m_field_name()).attname
+        target = through._meta.get_field(
+            model_field.m2m_reverse_field_name()).attname
+        size = min(m2m_count, len(ref_pks))
+        rows = []
+        for pk in new_pks:
+            for ref_pk in sample(ref_pks, size):
+                rows.append(through(**{source: pk, target: ref_pk}))
+            if len(rows) >= batch_size:
+                through.objects.bulk_create(rows)
+                rows = []
+        through.objects.bulk_create(rows)
+
+
+def populate_models(counts, batch_size=DEFAULT_BATCH_SIZE, m2m_count=1,
+                    gen_context=None):
+    """
+    Creates many instances of models using random data, in bulk.
+
+    Models are populated in topological order of their relations, i.e.
+    every model after the models that it refers to. Models which are
+    referred to but are not given are populated with a single instance,
+    unless they have instances already. Relations refer to random
+    instances (existing or new ones) of the related models.
+
+    Rows are inserted with `bulk_create()`, in batches of `batch_size`
+    rows, in a single transaction. Models are expected to have
+    auto-incremented primary keys.
+
+    Args:
+        counts (dict): Number of instances to create per Model class.
+        batch_size (int): (optional) Number of rows of every insert.
+        m2m_count (int): (optional) Number of instances related to every
+            new instance via each of its many-to-many fields.
+        gen_context (GeneratorContext): (optional) Source of random data,
+            e.g. a seeded one, so that the same data are generated for the
+            same seed.
+
+    Returns:
+        dict: The primary keys of the new instances per Model class.
+
+    Examples:
+        >>> populate_models({MyModel: 100000, RefModel: 1000000})
+    """
+    schema = get_models_to_create(counts.keys())
+    # Models are populated in the same order every time, so that they get
+    # the same data for the same random state.
+    schema = OrderedDict(sorted(
+        schema.iteritems(), key=lambda item: (
+            item[0]._meta.app_label, item[0]._meta.model_name)))
+    # Primary keys of all instances per model.
+    pks = {}
+    new_pks = {}
+    with transaction.atomic():
+        for model in utils.topological_sort(schema):
+            existing = _get_pks(model)
+            count = counts.get(model)
+            if count is None:
+                count = 0 if existing else 1
+            _bulk_populate(model, count, pks, batch_size, gen_context)
+            # Primary keys are not set by `bulk_create()` on every
+            # database, so they are queried.
+            new_pks[model] = _get_pks(
+                model, pk__gt=existing[-1]) if existing else _get_pks(model)
+            pks[model] = existing + new_pks[model]
+        for model in schema:
+            _bulk_populate_m2m(model, new_pks[model], pks, m2m_count,
+                               batch_size, gen_context)
+    return new_pks
@@ -0,0 +1,469 @@
+import hashlib
+from calendar import timegm
+from datetime import datetime
+from email.utils import formatdate
+from django.core.exceptions import (
+    FieldDoesNotExist, FieldError, ValidationError as DjangoValidationError)
+from django.db.models import Count, Max, Q
+from apimas import documents as doc, utils
+from apimas.adapters.actions import ApimasAction
+from apimas.components import BaseProcessor
+from apimas.components.processors import (
+    ConditionalResponse, is_not_modified)
+from apimas.django import cache as apimas_cache
+from apimas.errors import InvalidSpec, ValidationError
+
+
+REF = '.ref'
+STRUCT = '.struct='
+ARRAY_OF = '.array of='
+
+
+def _is_indexed(orm_model, field):
+    """
+    Checks if the given model field is the leading column of a database
+    index.
+    """
+    if field.primary_key or field.unique or field.db_index:
+        return True
+    meta = orm_model._meta
+    return any(fields[0] == field.name for fields in (
+        tuple(meta.index_together) + tuple(meta.unique_together)))
+
+
+def _get_params(params):
+    """ Normalizes query parameters into a sorted list. """
+    if params is None:
+        return []
+    if hasattr(params, 'lists'):
+        return sorted(params.lists())
+    return sorted(params.iteritems())
+
+
+def _get_refs(field_schema):
+    """ Gets the collections referenced by the fields of a schema. """
+    refs = set()
+    for field_name, field_spec in field_schema.iteritems():
+        if field_name.startswith('.') or not isinstance(field_spec, dict):
+            continue
+        if REF in field_spec:
+            refs.add(field_spec[REF]['to'])
+        if STRUCT in field_spec:
+            refs.update(_get_refs(field_spec[STRUCT]))
+        if ARRAY_OF in field_spec:
+            refs.update(_get_refs({'': field_spec[ARRAY_OF]}))
+    return refs
+
+
+class Filtering(BaseProcessor):
+    """
+    Processor responsible for the filtering and ordering of a collection.
+
+    Fields are declared as filterable or orderable via the `.filterable`
+    and `.orderable` predicates respectively, e.g.
+
+        'name': {
+            '.string': {},
+            '.filterable': {'operators': ['exact', 'icontains']},
+            '.orderable': {},
+        }
+
+    If no operators are specified, all operators are allowed.
+
+    Clients filter a collection through query parameters of the form
+    `<field>__<operator>=<value>`, e.g. `?name__icontains=foo`. If the
+    operator is omitted, `exact` is used. Ordering is specified through the
+    `ordering` parameter, e.g. `?ordering=-name,id`.
+
+    If `strict_filtering` is set on the `.collection` predicate, only fields
+    backed by a database index can be filterable or orderable, so that
+    clients cannot trigger full table scans.
+
+    The processor writes a django `Q` object and a list of ordering
+    expressions (or `None` if not any) to the context.
+    """
+    name = 'apimas.django.processors.Filtering'
+
+    ORDERING_PARAM = 'ordering'
+
+    LOOKUP_SEP = '__'
+
+    OPERATORS = (
+        'exact',
+        'iexact',
+        'contains',
+        'icontains',
+        'startswith',
+        'istartswith',
+        'endswith',
+        'iendswith',
+        'gt',
+        'gte',
+        'lt',
+        'lte',
+        'in',
+        'isnull',
+    )
+
+    TRUE_VALUES = {'true', 'True', '1'}
+
+    FALSE_VALUES = {'false', 'False', '0'}
+
+    READ_KEYS = {
+        'params': 'request/kwargs/params',
+    }
+
+    WRITE_KEYS = {
+        'filters': 'store/' + name + '/filters',
+        'ordering': 'store/' + name + '/ordering',
+    }
+
+    def __init__(self, spec):
+        super(Filtering, self).__init__(spec)
+        self.filterable = {}
+        self.orderable = {}
+        for field_name, field_spec in spec.get('*', {}).iteritems():
+            if field_name.startswith('.'):
+                continue
+            source = doc.doc_get(field_spec, ('.field', 'source')) or\
+                field_name
+            if '.filterable' in field_spec:
+                operators = (field_spec['.filterable'] or {}).get(
+                    'operators') or self.OPERATORS
+                unknown = set(operators) - set(self.OPERATORS)
+                if unknown:
+                    msg = 'Unknown filtering operators: {!s}'
+                    raise InvalidSpec(msg.format(', '.join(sorted(unknown))),
+                                      loc=('*', field_name, '.filterable'))
+                self.filterable[field_name] = (source, frozenset(operators))
+            if '.orderable' in field_spec:
+                self.orderable[field_name] = source
+        if doc.doc_get(spec, ('.collection', 'strict_filtering')):
+            self._validate_indexes(spec)
+
+    def _validate_indexes(self, spec):
+        model = doc.doc_get(spec, ('.collection', 'model'))
+        orm_model = utils.import_object(model)
+        fields = [(k, v[0]) for k, v in self.filterable.iteritems()] +\
+            self.orderable.items()
+        for field_name, source in fields:
+            try:
+                field = orm_model._meta.get_field(source)
+            except FieldDoesNotExist:
+                field = None
+            if field is None or not _is_indexed(orm_model, field):
+                msg = ('Field {!r} cannot be filterable or orderable because'
+                       ' it is not indexed')
+                raise InvalidSpec(msg.format(field_name),
+                                  loc=('*', field_name))
+
+    def _get_value(self, key, operator, value):
+        if operator == 'in':
+            return [v.strip() for v in value.split(',') if v.strip()]
+        if operator == 'isnull':
+            if value in self.TRUE_VALUES:
+                return True
+            if value in self.FALSE_VALUES:
+                return False
+            msg = 'Parameter {!r} must be a boolean'
+            raise ValidationError(msg.format(key))
+        return value
+
+    def get_filters(self, params):
+        """
+        Compiles the filtering query parameters into a django `Q` object.
+
+        Parameters which do not refer to a filterable field are ignored.
+
+        Raises:
+            ValidationError: An operator is not allowed for a field.
+        """
+        filters = []
+        for key in params:
+            field_name, _, operator = key.partition(self.LOOKUP_SEP)
+            if field_name not in self.filterable:
+                continue
+            source, operators = self.filterable[field_name]
+            operator = operator or 'exact'
+            if operator not in operators:
+                msg = ('Operator {operator!r} is not allowed for field'
+                       ' {field!r}')
+                raise ValidationError(msg.format(
+                    operator=operator, field=field_name))
+            value = self._get_value(key, operator, params.get(key))
+            filters.append(Q(**{source + self.LOOKUP_SEP + operator: value}))
+        if not filters:
+            return None
+        return reduce(lambda x, y: x & y, filters)
+
+    def get_ordering(self, params):
+        """
+        Compiles the ordering query parameter into a list of expressions
+        understood by `QuerySet.order_by()`.
+
+        Raises:
+            ValidationError: A field is not orderable.
+        """
+        ordering = []
+        for field_name in (params.get(self.ORDERING_PARAM) or '').split(','):
+            field_name = field_name.strip()
+            if not field_name:
+                continue
+            descending = field_name.startswith('-')
+            field_name = field_name.lstrip('-')
+            if field_name not in self.orderable:
+                msg = 'Field {!r} is not orderable'
+                raise ValidationError(msg.format(field_name))
+            source = self.orderable[field_name]
+            ordering.append('-' + source if descending else source)
+        return ordering or None
+
+    def process(self, collection, url, action, context):
+        params = self.read(context)['params'] or {}
+        self.write({
+            'filters': self.get_filters(params),
+            'ordering': self.get_ordering(params),
+        }, context)
+
+
+class ConditionalRequest(BaseProcessor):
+    """
+    Processor responsible for conditional requests based on a version
+    column.
+
+    It is enabled if the `.collection` predicate specifies the model field
+    which is updated on every change of a resource, e.g.
+
+        '.collection': {
+            'model': 'myapp.models.MyModel',
+            'conditional': {'version': 'updated_at'},
+        }
+
+    The processor computes the `ETag` (and `Last-Modified` for datetime
+    fields) with a single aggregate query on the version column. If the
+    client already has the current representation, a `304 Not Modified`
+    response preempts the handler, so that neither the resources are loaded
+    nor the serialization pipeline runs. Otherwise, `ETag` and
+    `Last-Modified` are written to the context and they are set by
+    `ConditionalResponse` on the final response.
+
+    It must follow the `Filtering` processor in `list` actions.
+    """
+    name = 'apimas.django.processors.ConditionalRequest'
+
+    READ_KEYS = {
+        'model': 'store/orm_model',
+        'pk': 'request/kwargs/pk',
+        'params': 'request/kwargs/params',
+        'headers': 'request/kwargs/headers',
+        'filters': Filtering.WRITE_KEYS['filters'],
+    }
+
+    WRITE_KEYS = {
+        'etag': ConditionalResponse.READ_KEYS['etag'],
+        'last_modified': ConditionalResponse.READ_KEYS['last_modified'],
+        'preempted': 'store/' + ApimasAction.PREEMPTED_KEY,
+    }
+
+    def __init__(self, spec):
+        super(ConditionalRequest, self).__init__(spec)
+        self.version = doc.doc_get(
+            spec, ('.collection', 'conditional', 'version'))
+
+    def get_version(self, context_data):
+        """
+        Gets the version of the requested resource (or collection of
+        resources) along with the number of resources.
+        """
+        queryset = context_data['model'].objects.all()
+        if context_data['pk'] is not None:
+            queryset = queryset.filter(pk=context_data['pk'])
+        elif context_data['filters'] is not None:
+            queryset = queryset.filter(context_data['filters'])
+        aggregation = queryset.aggregate(
+            version=Max(self.version), count=Count('pk'))
+        return aggregation['version'], aggregation['count']
+
+    def process(self, collection, url, action, context):
+        if self.version is None:
+            return
+        context_data = self.read(context)
+        try:
+            version, count = self.get_version(context_data)
+        except (ValueError, TypeError, DjangoValidationError, FieldError):
+            # Invalid input, e.g. a malformed filter value; let the handler
+            # report the error.
+            return
+        if not count and context_data['pk'] is not None:
+            # Resource does not exist; let the handler report the error.
+            return
+        # Representation also depends on the query parameters,
+        # e.g. projection.
+        key = repr((collection, action, context_data['pk'], version, count,
+                    _get_params(context_data['params'])))
+        etag = '"' + hashlib.sha1(key).hexdigest() + '"'
+        last_modified = None
+        if isinstance(version, datetime):
+            last_modified = formatdate(timegm(version.utctimetuple()),
+                                       usegmt=True)
+        preempted = None
+        if is_not_modified(context_data['headers'], etag, last_modified):
+            headers = {'ETag': etag}
+            if last_modified:
+                headers['Last-Modified'] = last_modified
+            preempted = {
+                'content': None,
+                'content_type': None,
+                'status_code': 304,
+                'headers': headers,
+            }
+        self.write({
+            'etag': etag,
+            'last_modified': last_modified,
+            'preempted': preempted,
+        }, context)
+
+
+def get_generation_key(collection):
+    """ Gets the key of the generation of a cached collection. """
+    return 'apimas:generation:' + collection
+
+
+class CacheLookup(BaseProcessor):
+    """
+    Processor which serves the responses of read actions from a cache.
+
+    It is enabled if the `.collection` predicate of a collection specifies
+    `cache` (see `apimas.django.cache.get_collection_cache()`).
+
+    Responses are cached by `CacheStore` and they are keyed by the
+    collection, the action, the resource ID, the query parameters, the
+    roles of the user, and the generation of the collection. Write actions
+    increment the generation (see `CacheInvalidation`), so that previously
+    cached responses are never served again.
+
+    On a hit, the cached response preempts the handler. It must follow the
+    processors which can preempt the handler themselves, e.g.
+    `ConditionalRequest`.
+    """
+    name = 'apimas.django.processors.CacheLookup'
+
+    ANONYMOUS_ROLES = ['anonymous']
+
+    READ_KEYS = {
+        'pk': 'request/kwargs/pk',
+        'params': 'request/kwargs/params',
+        'headers': 'request/kwargs/headers',
+        'user': 'request/native/user',
+        'preempted': 'store/' + ApimasAction.PREEMPTED_KEY,
+    }
+
+    WRITE_KEYS = {
+        'key': 'store/' + name + '/key',
+        'preempted': 'store/' + ApimasAction.PREEMPTED_KEY,
+    }
+
+    def __init__(self, spec):
+        super(CacheLookup, self).__init__(spec)
+        self.cache = apimas_cache.get_collection_cache(spec)
+
+    def get_roles(self, user):
+        """
+        Gets the roles of the given user which determine the response.
+
+        Authenticated users without `apimas_roles` are treated as distinct
+        roles.
+        """
+        if user is None or not user.is_authenticated():
+            return self.ANONYMOUS_ROLES
+        roles = getattr(user, 'apimas_roles', None)
+        if roles is None:
+            return ['user:' + str(user.pk)]
+        return sorted(roles)
+
+    def get_key(self, collection, url, action, context_data):
+        generation = self.cache.get_generation(get_generation_key(collection))
+        key = repr((collection, url, action, context_data['pk'],
+                    _get_params(context_data['params']),
+                    self.get_roles(context_data['user']), generation))
+        return 'apimas:response:' + hashlib.sha1(key).hexdigest()
+
+    def process(self, collection, url, action, context):
+        if self.cache is None:
+            return
+        context_data = self.read(context)
+        if context_data['preempted'] is not None:
+            return
+        key = self.get_key(collection, url, action, context_data)
+        preempted = self.cache.get(key)
+        if preempted is not None:
+            etag = preempted.get('headers', {}).get('ETag')
+            if etag and is_not_modified(context_data['headers'], etag):
+                preempted = dict(preempted, content=None, status_code=304)
+        self.write({'key': key, 'preempted': preempted}, context)
+
+
+class CacheStore(BaseProcessor):
+    """
+    Processor which caches successful responses of read actions, under the
+    key computed by `CacheLookup`.
+
+    It must be the last response processor, so that the final response is
+    cached.
+    """
+    name = 'apimas.django.processors.CacheStore'
+
+    READ_KEYS = {
+        'key': CacheLookup.WRITE_KEYS['key'],
+        'content': 'response/content',
+        'content_type': 'response/kwargs/content_type',
+        'status_code': 'response/kwargs/status_code',
+        'headers': 'response/kwargs/headers',
+    }
+
+    def __init__(self, spec):
+        super(CacheStore, self).__init__(spec)
+        self.cache = apimas_cache.get_collection_cache(spec)
+
+    def process(self, collection, url, action, context):
+        if self.cache is None:
+            return
+        context_data = self.read(context)
+        if context_data['key'] is None or\
+                context_data['status_code'] != 200:
+            return
+        self.cache.set(context_data['key'], {
+            'content': context_data['content'],
+            'content_type': context_data['content_type'],
+            'status_code': context_data['status_code'],
+            'headers': context_data['headers'] or {},
+        })
+
+
+class CacheInvalidation(BaseProcessor):
+    """
+    Processor which invalidates cached responses after a successful write
+    action.
+
+    It increments the generation of the collection and the collections it
+    references (via `.ref`) in every cache of the process, so that it
+    works even if the collection itself is not cached.
+    """
+    name = 'apimas.django.processors.CacheInvalidation'
+
+    READ_KEYS = {
+        'status_code': 'response/kwargs/status_code',
+    }
+
+    def __init__(self, spec):
+        super(CacheInvalidation, self).__init__(spec)
+        self.refs = _get_refs(spec.get('*', {}))
+
+    def process(self, collection, url, action, context):
+        status_code = self.read(context)['status_code']
+        if status_code is None or status_code >= 400:
+            return
+        collections = {collection} | self.refs
+        for cache in apimas_cache.get_caches():
+            for invalidated in collections:
+                cache.incr(get_generation_key(invalidated))
@@ -60,34 +60,84 @@ class TestCase(DjangoTestCase):
         204
     ]
 
+    # `(endpoint, collection, action)` of every generated test method.
+    test_keys = ()
+
+    # If `True`, the instances required by the default setup of every test
+    # method are created once per class (see `setUpTestData()`), and every
+    # test runs in a transaction which is rolled back.
+    reuse_fixtures = True
+
+    @classmethod
+    def setUpTestData(cls):
+        super(TestCase, cls).setUpTestData()
+        # Plans of instance creation per collection, see
+        # `get_creation_plan()`.
+        cls._creation_plans = {}
+        # Instances created for the default setup of test methods, keyed by
+        # `(endpoint, collection, action == 'create')`. Note that
+        # `fixtures` is taken by django, i.e. the fixture files to load.
+        cls.default_instances = {}
+        if not cls.reuse_fixtures:
+            return
+        setup_methods = getattr(cls, 'SETUP', None) or {}
+        for endpoint, collection, action in cls.test_keys:
+            if (endpoint, collection, action) in setup_methods:
+                # Tests with a custom setup create their own instances.
+                continue
+            key = (endpoint, collection, action == 'create')
+            if key not in cls.default_instances:
+                cls.default_instances[key] = cls._create_default_instances(
+                    endpoint, collection, action)
+
     def setUp(self):
         self.test_url = None
         self.request_kwargs = {}
+        self.collection_instances = {}
         self.models = self.adapter.models
-        self.spec = deepcopy(self.spec)
 
-    def create_instances(self, endpoint, collection, excluded_models=None):
+    @classmethod
+    def get_creation_plan(cls, endpoint, collection, excluded_models=None):
         """
-        Create instance of the model associated with the collection model
-        along with its dependencies.
+        Gets the models to be created for the instances of a collection,
+        i.e. its model and the models of the collections which it refers
+        to, in the order of their creation.
 
-        Models along with their dependencies are specifies, and then a
+        Models along with their dependencies are specified, and then a
         topological sort algorithm is applied on the derived graph in order
-        model to be created with the right sequence.
+        models to be created with the right sequence. Plans are computed once
+        per collection.
+
+        Returns:
+            tuple: The list of models to be created and a dictionary of the
+            model of every involved collection.
         """
-        collections = [endpoint + '/' + collection] + get_ref_collections(
-            self.spec, endpoint, collection)
-        models = {k: v for k, v in self.models.iteritems()
-                  if k in collections}
-        schema = mutils.get_models_to_create(models.values())
-        top_ordered_models = utils.topological_sort(schema)
+        excluded = tuple(excluded_models or ())
+        plans = cls.__dict__.get('_creation_plans')
+        if plans is None:
+            plans = cls._creation_plans = {}
+        key = (endpoint, collection, excluded)
+        plan = plans.get(key)
+        if plan is None:
+            collections = [endpoint + '/' + collection] + \
+                get_ref_collections(cls.spec, endpoint, collection)
+            models = {k: v for k, v in cls.adapter.models.iteritems()
+                      if k in collections}
+            schema = mutils.get_models_to_create(models.values())
+            top_ordered_models = [
+                model for model in utils.topological_sort(schema)
+                if model not in excluded]
+            plan = plans[key] = (top_ordered_models, models)
+        return plan
+
+    @classmethod
+    def _create_instances(cls, endpoint, collection, excluded_models=None):
+        top_ordered_models, models = cls.get_creation_plan(
+            endpoint, collection, excluded_models)
         instances = {}
         collection_instances = {collection: []
                                 for collection in models.iterkeys()}
-        excluded = excluded_models or []
         for model in top_ordered_models:
-            if model in excluded:
-                continue
             instance = mutils.populate_model(model, instances=instances)
             instances[model] = instance
             for collection, collection_model in models.iteritems():
@@ -95,13 +145,35 @@ class TestCase(DjangoTestCase):
                     collection_instances[collection].append(instance)
         return collection_instances
 
+    @classmethod
+    def _create_default_instances(cls, endpoint, collection, action):
+        if action == 'create':
+            # We do not need to create an instance corresponding to the
+            # specified collection, but only instances of the dependencies.
+            full_collection_name = endpoint + '/' + collection
+            return cls._create_instances(
+                endpoint, collection,
+                excluded_models=[cls.adapter.models.get(
+                    full_collection_name)])
+        return cls._create_instances(endpoint, collection)
+
+    def create_instances(self, endpoint, collection, excluded_models=None):
+        """
+        Create instance of the model associated with the collection model
+        along with its dependencies.
+
+        See `get_creation_plan()` for the models which are created.
+        """
+        return self._create_instances(endpoint, collection, excluded_models)
+
     def setUp_default(self, endpoint, collection, action, action_spec):
         """
         Setup a test scenario for a particular endpoint, collection and action.
 
         A model instance corresponding to the model associated with the
         provided collection (which belongs to a particular endpoint), is
-        created along with its dependencies.
+        created along with its dependencies. If `reuse_fixtures` is set,
+        the instances created once for the class are used.
 
         In case of the `create` action, the instances of the dependencies
         are created only.
@@ -113,16 +185,12 @@ class TestCase(DjangoTestCase):
             action_spec (dict): Dictionary acting as a descriptor of the
                 action (e.g. http method, action url, subject).
         """
-        if action == 'create':
-            # We do not need to create an instance corresponding to the
-            # specified collection, but only instances of the dependencies.
-            full_collection_name = endpoint + '/' + collection
-            self.collection_instances = self.create_instances(
-                endpoint, collection,
-                excluded_models=[self.models.get(full_collection_name)])
-        else:
-            self.collection_instances = self.create_instances(
-                endpoint, collection)
+        instances = self.default_instances.get(
+            (endpoint, collection, action == 'create'))
+        if instances is None:
+            instances = self._create_default_instances(
+                endpoint, collection, action)
+        self.collection_instances = instances
 
     def _get_url(self, endpoint, collection, action_spec):
         slash = '/'
@@ -140,8 +208,9 @@ class TestCase(DjangoTestCase):
 
     def _get_content_and_type(self, endpoint, collection, action_spec):
         # Create random data based on the spec.
+        # Generators modify the spec from which they construct data.
         gen = DjangoRequestGenerator(
-            doc.doc_get(self.spec, (endpoint, collection)),
+            deepcopy(doc.doc_get(self.spec, (endpoint, collection))),
             instances=self.collection_instances)
         data = gen.construct()
         if any(isinstance(v, (file, InMemoryUploadedFile))
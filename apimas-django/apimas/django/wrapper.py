@@ -1,11 +1,12 @@
 import json
 import re
+from django.conf import settings
 from django.http import HttpResponse
 from apimas.errors import ConflictError
 from apimas.adapters.actions import Request
 
 
-HTTP_REGEX = re.compile(r'^HTTP_+$')
+HTTP_REGEX = re.compile(r'^HTTP_.+$')
 CONTENT_TYPE_REGEX = re.compile(r'^CONTENT_TYPE$')
 CONTENT_LENGTH_REGEX = re.compile(r'^CONTENT_LENGTH$')
 
@@ -104,11 +105,17 @@ class DjangoWrapper(object):
             raise ConflictError('Native Response object already exists')
         content = response.content
         content_type = response.kwargs.get('content_type')
-        if content_type == 'application/json':
+        if content is None:
+            content = ''
+        elif content_type == 'application/json':
             content = json.dumps(content)
         status_code = response.kwargs.get('status_code')
-        return HttpResponse(content=content, content_type=content_type,
-                            status=status_code)
+        native_response = HttpResponse(
+            content=content, content_type=content_type, status=status_code)
+        headers = response.kwargs.get('headers') or {}
+        for header, value in headers.iteritems():
+            native_response[header] = value
+        return native_response
 
     def _get_apimas_request(self, request, **kwargs):
         """
@@ -131,7 +138,16 @@ class DjangoWrapper(object):
         apimas_request = self._get_apimas_request(request, **kwargs)
         apimas_response = action.process_request(apimas_request)
         action.process_response(apimas_response)
-        django_response = self.create_native_response(apimas_response)
+        trace = action.trace
+        if trace is None:
+            return self.create_native_response(apimas_response)
+        with trace.stage('render'):
+            django_response = self.create_native_response(apimas_response)
+        trace.record_size('request', len(request.body))
+        trace.record_size('response', len(django_response.content))
+        trace.finish()
+        if settings.DEBUG:
+            django_response['Server-Timing'] = trace.get_server_timing()
         return django_response
 
     def __call__(self, request, **kwargs):
@@ -0,0 +1,136 @@
+import json
+import shutil
+import tempfile
+import time
+from django.db.models import F
+from django.test import TestCase
+from django.test.utils import override_settings
+from apimas.django import cache
+from apimas.django import model_utils as mutils
+from apimas.django.adapter import DjangoAdapter
+from apimas.django.generators import SpecGenerator
+from tests.models import MyModel, RefModel
+
+
+generator = SpecGenerator(endpoint='cache')
+SPEC = generator.generate(['tests.models.MyModel', 'tests.models.RefModel'])
+SPEC['cache']['mymodel_collection']['.collection']['cache'] = {
+    'max_entries': 16}
+for collection_spec in SPEC['cache'].itervalues():
+    if isinstance(collection_spec, dict) and '*' in collection_spec:
+        # Actions of generated specs are random.
+        collection_spec['.actions='] = {'.list': {}}
+        collection_spec['*']['.actions='] = {'.retrieve': {}, '.delete': {}}
+
+adapter = DjangoAdapter()
+adapter.construct(SPEC)
+urlpatterns = adapter.get_urlpatterns()
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class TestCache(TestCase):
+    url = '/cache/mymodel_collection/'
+
+    def setUp(self):
+        self.instances = [mutils.populate_model(MyModel, instances={})
+                          for _ in range(2)]
+        self.ref_instance = RefModel.objects.create(mymodel=self.instances[0])
+
+    def get_numbers(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return {row['id']: row['number']
+                for row in json.loads(response.content)}
+
+    def modify(self):
+        MyModel.objects.update(number=F('number') + 1)
+        return MyModel.objects.get(pk=self.instances[0].pk).number
+
+    def test_cache(self):
+        numbers = self.get_numbers()
+        # Changes made outside the API are not visible until invalidation.
+        self.modify()
+        self.assertEqual(self.get_numbers(), numbers)
+
+        # Write on a collection which references the cached one.
+        response = self.client.delete(
+            '/cache/refmodel_collection/%d/' % self.ref_instance.pk)
+        self.assertEqual(response.status_code, 204)
+        number = MyModel.objects.get(pk=self.instances[0].pk).number
+        numbers = self.get_numbers()
+        self.assertEqual(numbers[self.instances[0].pk], number)
+
+        # Write on the cached collection.
+        self.modify()
+        response = self.client.delete(
+            self.url + '%d/' % self.instances[1].pk)
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.get_numbers(), {
+            self.instances[0].pk: number + 1})
+
+    def test_cache_key(self):
+        numbers = self.get_numbers()
+        number = self.modify()
+        # Query parameters are part of the key.
+        response = self.client.get(self.url, {'foo': 'bar'})
+        self.assertEqual(
+            json.loads(response.content)[0]['number'], number)
+        self.assertEqual(self.get_numbers(), numbers)
+
+
+class TestCacheBackends(TestCase):
+    def test_lru_cache(self):
+        lru = cache.LRUCache(max_entries=2)
+        lru.set('a', 1)
+        lru.set('b', 2)
+        self.assertEqual(lru.get('a'), 1)
+        lru.set('c', 3)
+        # 'b' is the least recently used entry.
+        self.assertIsNone(lru.get('b'))
+        self.assertEqual(lru.get('a'), 1)
+        self.assertEqual(lru.incr('c'), 4)
+        generation = lru.get_generation('gen')
+        self.assertEqual(lru.get_generation('gen'), generation)
+        self.assertEqual(lru.incr('gen'), generation + 1)
+        # An evicted generation starts again from a random value.
+        lru.set('e', 5)
+        lru.set('f', 6)
+        self.assertIsNone(lru.get('gen'))
+        self.assertNotIn(lru.incr('gen'), (generation, generation + 1))
+        lru.set('d', 4, timeout=-1)
+        self.assertEqual(lru.get('d', 'expired'), 'expired')
+
+    def test_file_cache(self):
+        directory = tempfile.mkdtemp()
+        try:
+            file_cache = cache.FileCache(directory=directory, timeout=60)
+            self.assertIsNone(file_cache.get('a'))
+            file_cache.set('a', {'content': [1, 2]})
+            self.assertEqual(file_cache.get('a'), {'content': [1, 2]})
+            generation = file_cache.incr('gen')
+            self.assertEqual(file_cache.incr('gen'), generation + 1)
+            self.assertEqual(file_cache.get_generation('gen'), generation + 1)
+            file_cache.set('b', 1, timeout=-1)
+            self.assertIsNone(file_cache.get('b'))
+        finally:
+            shutil.rmtree(directory)
+
+    def test_django_cache(self):
+        django_cache = cache.DjangoCache()
+        django_cache.set('apimas:test', 'value')
+        self.assertEqual(django_cache.get('apimas:test'), 'value')
+        generation = django_cache.incr('apimas:test:gen')
+        self.assertEqual(
+            django_cache.incr('apimas:test:gen'), generation + 1)
+        self.assertEqual(
+            django_cache.get_generation('apimas:test:gen'), generation + 1)
+        self.assertFalse(django_cache.add('apimas:test:gen', 0))
+
+    def test_get_collection_cache(self):
+        self.assertIsNone(cache.get_collection_cache({'.collection': {}}))
+        lru = cache.get_collection_cache({'.collection': {'cache': True}})
+        self.assertIsInstance(lru, cache.LRUCache)
+        self.assertIs(
+            lru, cache.get_collection_cache({'.collection': {'cache': True}}))
+        self.assertIsNot(lru, cache.get_collection_cache(
+            {'.collection': {'cache': {'timeout': 10}}}))
@@ -0,0 +1,91 @@
+import json
+from django.test import TestCase
+from django.test.utils import override_settings
+from apimas.django import model_utils as mutils
+from apimas.django.adapter import DjangoAdapter
+from apimas.django.generators import SpecGenerator
+from tests.models import MyModel, MyModel2
+
+
+generator = SpecGenerator(endpoint='conditional')
+SPEC = generator.generate(['tests.models.MyModel', 'tests.models.MyModel2'])
+SPEC['conditional']['mymodel_collection']['.collection']['conditional'] = {
+    'version': 'datetime_field'}
+SPEC['conditional']['mymodel_collection']['*']['date_field'][
+    '.filterable'] = {}
+SPEC['conditional']['mymodel2_collection']['.collection'][
+    'conditional'] = True
+for collection_spec in SPEC['conditional'].itervalues():
+    if isinstance(collection_spec, dict) and '*' in collection_spec:
+        collection_spec['.collection']['projection'] = True
+        # Actions of generated specs are random.
+        collection_spec['.actions='] = {'.list': {}}
+        collection_spec['*']['.actions='] = {'.retrieve': {}}
+
+adapter = DjangoAdapter()
+adapter.construct(SPEC)
+urlpatterns = adapter.get_urlpatterns()
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class TestConditional(TestCase):
+    def setUp(self):
+        self.instance = mutils.populate_model(MyModel, instances={})
+        self.instance2 = mutils.populate_model(MyModel2, instances={})
+
+    def assert_conditional(self, url, modify):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, '')
+        self.assertEqual(response['ETag'], etag)
+
+        # ETag depends on the query parameters.
+        response = self.client.get(url, {'fields': 'id'},
+                                   HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        modify()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        return response
+
+    def test_version_column(self):
+        def modify():
+            self.instance.datetime_field = mutils.gen.DateTimeGenerator(
+                native=True)()
+            self.instance.save()
+
+        url = '/conditional/mymodel_collection/'
+        resource_url = url + str(self.instance.pk) + '/'
+        response = self.client.get(resource_url)
+        last_modified = response['Last-Modified']
+        response = self.client.get(resource_url,
+                                   HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+        response = self.assert_conditional(resource_url, modify)
+        self.assertEqual(json.loads(response.content)['id'],
+                         self.instance.pk)
+        self.assert_conditional(url, modify)
+
+    def test_content(self):
+        def modify():
+            self.instance2.bar += 1
+            self.instance2.save()
+
+        url = '/conditional/mymodel2_collection/'
+        self.assert_conditional(url + str(self.instance2.pk) + '/', modify)
+        self.assert_conditional(url, modify)
+
+    def test_invalid_filter(self):
+        # Invalid filters are reported by the handler, as for any list.
+        url = '/conditional/mymodel_collection/'
+        for params in ({'date_field': 'not a date'},
+                       {'date_field': '2017-13-45'}):
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 400)
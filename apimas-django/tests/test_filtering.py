@@ -0,0 +1,92 @@
+import json
+from django.test import TestCase
+from django.test.utils import override_settings
+from apimas.errors import InvalidSpec
+from apimas.django import model_utils as mutils
+from apimas.django.adapter import DjangoAdapter
+from apimas.django.generators import SpecGenerator
+from apimas.django.processors import Filtering
+from tests.models import MyModel
+
+
+generator = SpecGenerator(endpoint='filtering')
+SPEC = generator.generate(['tests.models.MyModel'])
+COLLECTION_SPEC = SPEC['filtering']['mymodel_collection']
+# Actions of generated specs are random.
+COLLECTION_SPEC['.actions='] = {'.list': {}}
+COLLECTION_SPEC['*']['.actions='] = {}
+COLLECTION_SPEC['*']['number']['.filterable'] = {}
+COLLECTION_SPEC['*']['number']['.orderable'] = {}
+COLLECTION_SPEC['*']['string']['.filterable'] = {
+    'operators': ['exact', 'in']}
+
+adapter = DjangoAdapter()
+adapter.construct(SPEC)
+urlpatterns = adapter.get_urlpatterns()
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class TestFiltering(TestCase):
+    url = '/filtering/mymodel_collection/'
+
+    def setUp(self):
+        self.instances = [mutils.populate_model(MyModel, instances={})
+                          for _ in range(5)]
+        for i, instance in enumerate(self.instances):
+            instance.number = i
+            instance.string = 'a' if i % 2 else 'b'
+            instance.save()
+
+    def get_ids(self, params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return [row['id'] for row in json.loads(response.content)]
+
+    def test_filtering(self):
+        ids = [instance.pk for instance in self.instances]
+        self.assertEqual(self.get_ids({'number': '2'}), [ids[2]])
+        self.assertEqual(sorted(self.get_ids({'number__gte': '3'})),
+                         ids[3:])
+        self.assertEqual(
+            sorted(self.get_ids({'number__lt': '3', 'string': 'a'})),
+            [ids[1]])
+        self.assertEqual(
+            sorted(self.get_ids({'string__in': 'a,b'})), ids)
+        # Parameters irrelevant to filtering are ignored.
+        self.assertEqual(sorted(self.get_ids({'foo': 'bar'})), ids)
+
+    def test_ordering(self):
+        ids = [instance.pk for instance in self.instances]
+        self.assertEqual(self.get_ids({'ordering': '-number'}),
+                         list(reversed(ids)))
+        self.assertEqual(self.get_ids({'ordering': 'number'}), ids)
+
+    def test_invalid_filtering(self):
+        invalid_params = [
+            {'string__icontains': 'a'},
+            {'number__unknown': '1'},
+            {'number': 'not a number'},
+            {'ordering': 'string'},
+        ]
+        for params in invalid_params:
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 400)
+
+    def test_strict_filtering(self):
+        spec = {
+            '.collection': {
+                'model': 'tests.models.MyModel',
+                'strict_filtering': True,
+            },
+            '*': {
+                'id': {'.serial': {}, '.filterable': {}, '.orderable': {}},
+                'number': {'.integer': {}},
+            }
+        }
+        processor = Filtering(spec)
+        self.assertEqual(processor.orderable, {'id': 'id'})
+        spec['*']['number']['.filterable'] = {}
+        self.assertRaises(InvalidSpec, Filtering, spec)
+        del spec['*']['number']['.filterable']
+        spec['*']['id']['.filterable'] = {'operators': ['unknown']}
+        self.assertRaises(InvalidSpec, Filtering, spec)
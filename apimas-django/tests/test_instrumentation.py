@@ -0,0 +1,59 @@
+from django.test import TestCase
+from django.test.utils import override_settings
+from apimas.adapters import instrumentation
+from apimas.django import model_utils as mutils
+from apimas.django.adapter import DjangoAdapter
+from apimas.django.generators import SpecGenerator
+from tests.models import MyModel
+
+
+generator = SpecGenerator(endpoint='instrumentation')
+SPEC = generator.generate(['tests.models.MyModel'])
+# Actions of generated specs are random.
+SPEC['instrumentation']['mymodel_collection']['.actions='] = {'.list': {}}
+
+adapter = DjangoAdapter()
+adapter.construct(SPEC)
+urlpatterns = adapter.get_urlpatterns()
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class TestInstrumentation(TestCase):
+    url = '/instrumentation/mymodel_collection/'
+
+    def setUp(self):
+        mutils.populate_model(MyModel, instances={})
+        self.traces = []
+        instrumentation.register(self.traces.append)
+
+    def tearDown(self):
+        instrumentation.unregister(self.traces.append)
+
+    @override_settings(DEBUG=True)
+    def test_trace(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.traces), 1)
+        trace = self.traces[0]
+        self.assertEqual(trace.collection, 'instrumentation/mymodel_collection')
+        self.assertEqual(trace.action, 'list')
+        stages = [name for name, _ in trace.stages]
+        self.assertIn('ListHandler', stages)
+        self.assertIn('Serialization', stages)
+        self.assertEqual(stages[-1], 'render')
+        self.assertEqual(trace.sizes['response'], len(response.content))
+        self.assertGreater(trace.get_queries(), 0)
+        self.assertTrue(response['Server-Timing'].endswith(
+            'total;dur=%.3f' % (trace.wall * 1000)))
+
+    def test_no_server_timing(self):
+        response = self.client.get(self.url)
+        self.assertEqual(len(self.traces), 1)
+        self.assertNotIn('Server-Timing', response)
+
+    def test_disabled(self):
+        instrumentation.unregister(self.traces.append)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.traces, [])
+        self.assertNotIn('Server-Timing', response)
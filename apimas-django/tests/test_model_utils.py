@@ -0,0 +1,79 @@
+from django.test import TestCase
+from apimas.django import model_utils as mutils
+from apimas.errors import InvalidInput
+from apimas.utils.generators import GeneratorContext
+from tests.models import (
+    MyModel, MyModel2, OneToOneModel, ManyToManyModel, RefModel, RefRefModel)
+
+
+class TestModelUtils(TestCase):
+    def test_populate_models(self):
+        new_pks = mutils.populate_models(
+            {RefRefModel: 50, ManyToManyModel: 10, MyModel2: 5},
+            batch_size=7, m2m_count=2)
+        # Referred models are populated with a single instance.
+        self.assertEqual(MyModel.objects.count(), 1)
+        self.assertEqual(RefModel.objects.count(), 1)
+        self.assertEqual(RefRefModel.objects.count(), 50)
+        self.assertEqual(MyModel2.objects.count(), 5)
+        self.assertEqual(len(new_pks[RefRefModel]), 50)
+        self.assertFalse(RefRefModel.objects.filter(refmodel=None).exists())
+        mymodel = MyModel.objects.get()
+        self.assertEqual(RefModel.objects.get().mymodel, mymodel)
+        self.assertLessEqual(len(mymodel.string), 2)
+        # There is a single instance to relate to.
+        self.assertEqual(
+            ManyToManyModel.manytomany.through.objects.count(), 10)
+
+        # Existing instances are reused, and referred to at random.
+        new_pks = mutils.populate_models(
+            {RefModel: 100, MyModel: 10, ManyToManyModel: 5}, m2m_count=3)
+        self.assertEqual(MyModel.objects.count(), 11)
+        self.assertEqual(new_pks[MyModel], range(2, 12))
+        self.assertGreater(RefModel.objects.values('mymodel').distinct()
+                           .count(), 1)
+        for instance in ManyToManyModel.objects.filter(
+                pk__in=new_pks[ManyToManyModel]):
+            self.assertEqual(instance.manytomany.count(), 3)
+
+    def test_populate_models_seed(self):
+        def populate(seed):
+            MyModel.objects.all().delete()
+            mutils.populate_models({MyModel: 20},
+                                   gen_context=GeneratorContext(seed))
+            return list(MyModel.objects.order_by('pk').values_list(
+                'string', 'text', 'email', 'number', 'date_field',
+                'datetime_field'))
+        self.assertEqual(populate(1), populate(1))
+        self.assertNotEqual(populate(1), populate(2))
+        kwargs = mutils.populate_model(
+            MyModel, instances={}, save=False, gen_context=GeneratorContext(1))
+        self.assertEqual(kwargs, mutils.populate_model(
+            MyModel, instances={}, save=False, gen_context=GeneratorContext(1)))
+
+    def test_populate_models_one_to_one(self):
+        mutils.populate_models({MyModel: 3})
+        mutils.populate_models({OneToOneModel: 2})
+        mutils.populate_models({OneToOneModel: 2})
+        related = OneToOneModel.objects.values_list('onetoone', flat=True)
+        self.assertEqual(len(set(related) - {None}), 3)
+        self.assertEqual(list(related).count(None), 1)
+
+    def test_populate_model(self):
+        instance = mutils.populate_model(RefModel, instances={})
+        self.assertIsNone(instance.mymodel)
+        kwargs = mutils.populate_model(MyModel, instances={}, save=False)
+        self.assertEqual(MyModel.objects.count(), 0)
+        instance = mutils.populate_model(
+            RefModel, instances={MyModel: MyModel.objects.create(**kwargs)})
+        self.assertIsNotNone(instance.mymodel)
+
+        model_field = OneToOneModel._meta.get_field('onetoone')
+        self.assertEqual(mutils._generate_refs(
+            OneToOneModel, model_field, [], 2), [None, None])
+        model_field.null = False
+        try:
+            self.assertRaises(InvalidInput, mutils._generate_refs,
+                              OneToOneModel, model_field, [], 2)
+        finally:
+            model_field.null = True
@@ -0,0 +1,54 @@
+import json
+from django.test import TestCase
+from django.test.utils import override_settings
+from apimas.django import model_utils as mutils
+from apimas.django.adapter import DjangoAdapter
+from apimas.django.generators import SpecGenerator
+from tests.models import MyModel
+
+
+generator = SpecGenerator(endpoint='projection')
+SPEC = generator.generate(['tests.models.MyModel'])
+COLLECTION_SPEC = SPEC['projection']['mymodel_collection']
+COLLECTION_SPEC['.collection']['projection'] = True
+# Actions of generated specs are random.
+COLLECTION_SPEC['.actions='] = {'.list': {}}
+COLLECTION_SPEC['*']['.actions='] = {'.retrieve': {}}
+
+adapter = DjangoAdapter()
+adapter.construct(SPEC)
+urlpatterns = adapter.get_urlpatterns()
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class TestProjection(TestCase):
+    url = '/projection/mymodel_collection/'
+
+    def setUp(self):
+        self.instance = mutils.populate_model(MyModel, instances={})
+
+    def test_projection_fields(self):
+        response = self.client.get(self.url, {'fields': 'id,number'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), [
+            {'id': self.instance.pk, 'number': self.instance.number}])
+
+        response = self.client.get(
+            self.url + str(self.instance.pk) + '/', {'fields': 'string'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), {'string': self.instance.string})
+
+    def test_projection_exclude(self):
+        response = self.client.get(
+            self.url, {'exclude': 'text,email,datetime_field'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(json.loads(response.content)[0].keys()), {
+            'id', 'string', 'number', 'big_number', 'float_number',
+            'boolean', 'date_field'})
+
+    def test_projection_invalid(self):
+        response = self.client.get(self.url, {'fields': 'id,unknown'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(json.loads(response.content)[0]), 10)
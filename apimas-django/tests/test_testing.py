@@ -0,0 +1,102 @@
+import unittest
+import mock
+from django.test import TransactionTestCase
+from django.test.utils import override_settings
+from apimas.django import model_utils as mutils
+from apimas.django.adapter import DjangoAdapter
+from apimas.django.generators import SpecGenerator
+from tests.models import MyModel
+
+
+generator = SpecGenerator(endpoint='fixtures')
+SPEC = generator.generate(['tests.models.MyModel', 'tests.models.RefModel',
+                           'tests.models.RefRefModel'])
+for collection_spec in SPEC['fixtures'].itervalues():
+    if isinstance(collection_spec, dict) and '*' in collection_spec:
+        # Actions of generated specs are random.
+        collection_spec['.actions='] = {'.list': {}, '.create': {}}
+        collection_spec['*']['.actions='] = {
+            '.retrieve': {}, '.update': {}, '.delete': {}}
+
+adapter = DjangoAdapter()
+adapter.construct(SPEC)
+urlpatterns = adapter.get_urlpatterns()
+
+
+# Generated test cases run in transactions, hence this one does not.
+class TestTestCase(TransactionTestCase):
+    def run_testcase(self, testcase=None, **kwargs):
+        testcase = override_settings(ROOT_URLCONF=__name__)(
+            testcase or adapter.get_testcase(patterns={'*/*/*': {}},
+                                             **kwargs))
+        result = unittest.TestResult()
+        with mock.patch.object(mutils, 'populate_model',
+                               wraps=mutils.populate_model) as mock_populate:
+            unittest.defaultTestLoader.loadTestsFromTestCase(
+                testcase).run(result)
+        self.assertEqual(result.errors + result.failures, [])
+        self.assertEqual(result.testsRun, len(testcase.test_keys))
+        return testcase, mock_populate.call_count
+
+    def test_reuse_fixtures(self):
+        testcase, count = self.run_testcase()
+        self.assertEqual(len(testcase.test_keys), 15)
+        # A fixture for the create action and one for the rest, i.e. 1 + 2
+        # + 3 instances for the non-create actions and 0 + 1 + 2 for create.
+        self.assertEqual(count, 9)
+        self.assertEqual(len(testcase.default_instances), 6)
+        self.assertEqual(len(testcase._creation_plans), 6)
+        models, _ = testcase.get_creation_plan('fixtures',
+                                               'refrefmodel_collection')
+        self.assertEqual([model.__name__ for model in models],
+                         ['MyModel', 'RefModel', 'RefRefModel'])
+
+        _, count = self.run_testcase(reuse_fixtures=False)
+        # Instances are created for every test.
+        self.assertEqual(count, 4 * 6 + 3)
+
+        # Tests with a custom setup do not use fixtures.
+        def setup(endpoint, collection, action, action_spec):
+            mutils.populate_model(MyModel, instances={})
+        testcase, count = self.run_testcase(SETUP={
+            ('fixtures', 'mymodel_collection', 'create'): setup})
+        self.assertEqual(count, 10)
+        self.assertEqual(len(testcase.default_instances), 5)
+
+        # The fixture files of django are kept.
+        testcase, _ = self.run_testcase(fixtures=[])
+        self.assertEqual(testcase.fixtures, [])
+        self.assertEqual(len(testcase.default_instances), 6)
+
+    def test_get_testcases(self):
+        def validate(endpoint, collection, action, action_spec, response):
+            self.assertEqual(collection, 'refmodel_collection')
+            validated.append(action)
+        validated = []
+
+        testcases = adapter.get_testcases(patterns={
+            '*/*/*': {},
+            'fixtures/refmodel_collection/*': {'VALIDATE': validate},
+        }, name='Test')
+        self.assertEqual(sorted(testcases), [
+            'Test_fixtures_mymodel_collection',
+            'Test_fixtures_refmodel_collection',
+            'Test_fixtures_refrefmodel_collection'])
+        testcase = testcases['Test_fixtures_refmodel_collection']
+        self.assertEqual(testcase.test_keys, [
+            ('fixtures', 'refmodel_collection', action) for action in
+            ['create', 'delete', 'list', 'retrieve', 'update']])
+        self.assertEqual(
+            sorted(attr for attr in vars(testcase) if attr.startswith('test_')
+                   and attr != 'test_keys'),
+            ['test_fixtures_refmodel_collection_' + action for action in
+             ['create', 'delete', 'list', 'retrieve', 'update']])
+
+        _, count = self.run_testcase(testcase)
+        self.assertEqual(sorted(validated),
+                         ['create', 'delete', 'list', 'retrieve', 'update'])
+        # Fixtures of this collection only (1 + 2 instances).
+        self.assertEqual(count, 3)
+        _, count = self.run_testcase(
+            testcases['Test_fixtures_mymodel_collection'])
+        self.assertEqual(count, 1)
@@ -7,9 +7,13 @@ which allows mixin classes to be composed in interesting ways.
 from __future__ import unicode_literals
 
 from collections import namedtuple
+from rest_framework import exceptions
 from rest_framework import mixins
 from rest_framework import status
 from rest_framework.response import Response
+from apimas.components.processors import get_projection
+from apimas.drf.serializers import get_projected_columns
+from apimas.errors import ValidationError
 
 StashedObj = namedtuple(
     'StashedObj', ['instance', 'data', 'extra', 'response', 'validated_data'])
@@ -89,6 +93,53 @@ class HookMixin(object):
                           response=response, validated_data=validated_data)
 
 
+class ProjectionMixin(object):
+    """
+    Restricts the fields of `list` and `retrieve` responses to those
+    requested via the `fields` or `exclude` query parameters, e.g.
+    `?fields=id,name`.
+
+    Only the columns of the projected model fields are loaded from the
+    database.
+    """
+    FIELDS_PARAM = 'fields'
+    EXCLUDE_PARAM = 'exclude'
+    PROJECTED_ACTIONS = ('list', 'retrieve')
+
+    def get_projected_fields(self):
+        """
+        Gets the names of the projected fields, or `None` if there is no
+        projection.
+        """
+        if self.action not in self.PROJECTED_ACTIONS:
+            return None
+        context = self.request.parser_context
+        if 'projected_fields' not in context:
+            field_names = self.get_serializer_class().get_field_names()
+            try:
+                context['projected_fields'] = get_projection(
+                    self.request.query_params, field_names,
+                    fields_param=self.FIELDS_PARAM,
+                    exclude_param=self.EXCLUDE_PARAM)
+            except ValidationError as e:
+                raise exceptions.ValidationError(e.message)
+        return context['projected_fields']
+
+    def get_queryset(self):
+        queryset = super(ProjectionMixin, self).get_queryset()
+        fields = self.get_projected_fields()
+        if fields is None:
+            return queryset
+        columns = get_projected_columns(
+            self.get_serializer_class(), queryset.model, fields)
+        return queryset if columns is None else queryset.only(*columns)
+
+    def get_serializer_context(self):
+        context = super(ProjectionMixin, self).get_serializer_context()
+        context['projected_fields'] = self.get_projected_fields()
+        return context
+
+
 class CreateModelMixin(mixins.CreateModelMixin):
     """
     Create a model instance.
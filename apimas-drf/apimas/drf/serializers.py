@@ -1,6 +1,8 @@
 import copy
 import inspect
 from collections import OrderedDict
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 from rest_framework.settings import api_settings
@@ -11,34 +13,67 @@ from apimas.errors import GenericFault
 from apimas.drf import utils
 
 
-def lookup_value(field_name, source, instance):
+def resolve_source(field_name, source):
     """
-    Get the actual value of a non-model field from the specified source.
-
-    The `source` is expected to be a string that indicates the location of
-    a callable.
+    Resolve the source of a non-model field into a tuple of callables.
 
-    Subsequently, this function imports this callable. This callable takes
-    the instance a parameter and it must return the python value of this
-    field.
+    The `source` is expected to be a string of comma-separated locations of
+    callables. Each callable is imported once, so that getting the value of
+    the field for an instance is just a matter of function application.
     """
-    if instance is None:
-        return instance
-
     if source is None:
         raise GenericFault(
             'Cannot retrieve instance value for the field {!r} given a'
             ' NoneType source'.format(field_name))
 
-    attrs = source.split(',')
-    for attr in attrs:
-        func = utils.import_object(attr)
-        if callable(func):
-            instance = func(instance)
-        else:
+    funcs = []
+    for attr in source.split(','):
+        try:
+            func = utils.import_object(attr)
+        except ImportError as e:
+            raise GenericFault(
+                'Cannot resolve source {!r} of the field {!r}: {!s}'.format(
+                    source, field_name, e))
+        if not callable(func):
             raise GenericFault(
                 'Cannot retrieve instance value of the'
                 ' field {!r} given the source {!r}'.format(field_name, source))
+        funcs.append(func)
+    return tuple(funcs)
+
+
+def resolve_instance_sources(instance_sources):
+    """
+    Resolve the sources of the given non-model fields.
+
+    Fields without a source are omitted from the returned dictionary.
+    """
+    return {
+        field_name: resolve_source(field_name, source)
+        for field_name, source in (instance_sources or {}).iteritems()
+        if source is not None
+    }
+
+
+def lookup_value(field_name, source, instance):
+    """
+    Get the actual value of a non-model field from the specified source.
+
+    The `source` is either a string that indicates the location of
+    a callable or a tuple of already resolved callables (see
+    `resolve_source()`).
+
+    Each callable takes the instance (or the output of the previous
+    callable) as a parameter and it must return the python value of this
+    field.
+    """
+    if instance is None:
+        return instance
+
+    funcs = source if isinstance(source, tuple) else resolve_source(
+        field_name, source)
+    for func in funcs:
+        instance = func(instance)
     return instance
 
 
@@ -58,6 +93,15 @@ def get_paths(serializer_fields):
     return paths
 
 
+def has_default_representation(serializer):
+    """
+    Checks if a serializer uses the `to_representation()` of
+    `ApimasSerializer`, i.e. it is not overridden by a custom base class.
+    """
+    return getattr(type(serializer).to_representation, 'im_func', None) is \
+        ApimasSerializer.to_representation.im_func
+
+
 class ContainerSerializer(serializers.BaseSerializer):
     """
     This class represents a `ContainerSerializer`.
@@ -70,6 +114,13 @@ class ContainerSerializer(serializers.BaseSerializer):
     deserializing and validation of data. This is responsibility of child
     serializers. The `ContainerSerializer`, however, it combines the output of
     child serializers.
+
+    When used with `many=True`, `Meta.list_serializer_class` should be a
+    `ContainerListSerializer`, so that the readable fields of child
+    serializers are computed once and they are reused across rows.
+
+    If the serializer context contains `projected_fields`, the top-level
+    representation is restricted to these fields.
     """
     model_ser_cls = None
 
@@ -79,6 +130,8 @@ class ContainerSerializer(serializers.BaseSerializer):
         super(ContainerSerializer, self).__init__(*args, **kwargs)
         self.model_ser = None
         self.ser = None
+        self._fields = None
+        self._representation_plan = None
         self.build_serializers()
         # Bind child serializers to the parent
         if self.ser is not None:
@@ -209,13 +262,74 @@ class ContainerSerializer(serializers.BaseSerializer):
     def update(self, instance, validated_data, **kwargs):
         return self.perform_action(validated_data, instance=instance, **kwargs)
 
+    @classmethod
+    def get_field_names(cls):
+        """ Gets the names of all fields of the serializer class. """
+        meta_cls = getattr(cls, 'Meta', None)
+        return frozenset(getattr(meta_cls, 'model_fields', [])) | frozenset(
+            getattr(meta_cls, 'extra_fields', []))
+
+    def get_projected_fields(self):
+        """
+        Gets the fields to which the representation is restricted.
+
+        Projection applies only to the top-level serializer, or to the child
+        of a top-level list serializer, and not to nested serializers.
+        """
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        if parent is not None:
+            return None
+        return self.context.get('projected_fields')
+
+    def get_representation_plan(self):
+        """
+        Gets the readable fields of every child serializer.
+
+        The plan is computed once per serializer, i.e. once per request, and
+        it is reused for every instance being represented. Child serializers
+        whose `to_representation()` is overridden (e.g. by custom base
+        classes) are represented by it instead, restricted to the projected
+        fields.
+        """
+        if self._representation_plan is None:
+            projected = self.get_projected_fields()
+            plan = []
+            for serializer in self.contained_sers:
+                if serializer is None:
+                    continue
+                if has_default_representation(serializer):
+                    plan.append((serializer, tuple(
+                        field for field in serializer._readable_fields
+                        if projected is None or
+                        field.field_name in projected), False))
+                else:
+                    # Serializers which customize their representation are
+                    # represented as a whole, and then projected.
+                    plan.append((serializer, projected, True))
+            self._representation_plan = tuple(plan)
+        return self._representation_plan
+
+    def represent(self, instance, plan):
+        """
+        Represents the given instance according to a representation plan.
+
+        All child serializers write their output to the same dictionary.
+        """
+        ret = OrderedDict()
+        for serializer, fields, custom in plan:
+            if not custom:
+                serializer.represent_fields(instance, fields, ret)
+                continue
+            for key, value in serializer.to_representation(
+                    instance).iteritems():
+                if fields is None or key in fields:
+                    ret[key] = value
+        return ret
+
     def to_representation(self, instance):
-        data = {}
-        if self.ser:
-            data.update(self.ser.to_representation(instance))
-        if self.model_ser:
-            data.update(self.model_ser.to_representation(instance))
-        return data
+        return self.represent(instance, self.get_representation_plan())
 
     def to_internal_value(self, data):
         output = []
@@ -226,11 +340,12 @@ class ContainerSerializer(serializers.BaseSerializer):
 
     @property
     def fields(self):
-        self._fields = {}
-        for serializer in self.contained_sers:
-            if serializer is None:
-                continue
-            self._fields.update(serializer.fields)
+        if self._fields is None:
+            self._fields = {}
+            for serializer in self.contained_sers:
+                if serializer is None:
+                    continue
+                self._fields.update(serializer.fields)
         return self._fields
 
     @property
@@ -269,7 +384,26 @@ class ContainerSerializer(serializers.BaseSerializer):
         return serializers.BoundField(field, value, error)
 
 
+class ContainerListSerializer(serializers.ListSerializer):
+    """
+    A `ListSerializer` optimized for `ContainerSerializer` children.
+
+    The child serializers of the container are built once per request. Their
+    representation plan is computed once, and then, every row is represented
+    directly into a single dictionary.
+    """
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.Manager) else data
+        child = self.child
+        plan = child.get_representation_plan()
+        return [child.represent(item, plan) for item in iterable]
+
+
 class ApimasSerializer(serializers.Serializer):
+    # Resolved sources of non-model fields, i.e. a tuple of callables per
+    # field name.
+    instance_sources = None
+
     def __init__(self, *args, **kwargs):
         super(ApimasSerializer, self).__init__(
             *args, **kwargs)
@@ -452,16 +586,20 @@ class ApimasSerializer(serializers.Serializer):
         """
         Object instance -> Dict of primitive datatypes.
         """
-        ret = OrderedDict()
-        fields = self._readable_fields
+        return self.represent_fields(
+            instance, self._readable_fields, OrderedDict())
+
+    def represent_fields(self, instance, fields, ret):
+        """
+        Writes the primitive datatypes of the given fields of an object
+        instance to the given dictionary.
+        """
+        instance_sources = self.instance_sources or {}
         for field in fields:
-            try:
-                instance_sources = getattr(self, 'instance_sources', {})
-                attribute = lookup_value(
-                    field.field_name,
-                    instance_sources.get(field.field_name),
-                    instance)
-            except (ImportError, GenericFault):
+            funcs = instance_sources.get(field.field_name)
+            if funcs is not None:
+                attribute = lookup_value(field.field_name, funcs, instance)
+            else:
                 try:
                     attribute = field.get_attribute(instance)
                 except serializers.SkipField:
@@ -557,6 +695,38 @@ class ApimasModelSerializer(serializers.HyperlinkedModelSerializer,
         return fields
 
 
+def get_projected_columns(serializer_class, model, fields):
+    """
+    Gets the model columns required to represent the given fields of a
+    `ContainerSerializer` class.
+
+    Returns `None` if a field cannot be mapped to a model field, e.g. a
+    non-model field, so that the whole rows have to be loaded.
+    """
+    if fields & set(getattr(serializer_class.Meta, 'extra_fields', [])):
+        return None
+    model_ser_cls = serializer_class.model_ser_cls
+    meta_cls = getattr(model_ser_cls, 'Meta', None)
+    extra_kwargs = getattr(meta_cls, 'extra_kwargs', {})
+    declared_fields = getattr(model_ser_cls, '_declared_fields', {})
+    columns = [model._meta.pk.name]
+    for field_name in fields:
+        if field_name in declared_fields:
+            source = declared_fields[field_name].source
+        else:
+            source = extra_kwargs.get(field_name, {}).get('source')
+        if source == '*':
+            # Field represents the whole instance, e.g. an identity field.
+            continue
+        try:
+            model_field = model._meta.get_field(source or field_name)
+        except FieldDoesNotExist:
+            return None
+        if model_field.concrete and not model_field.many_to_many:
+            columns.append(model_field.name)
+    return columns
+
+
 def generate_container_serializer(model_fields, extra_fields, name,
                                   model, model_serializers=None,
                                   extra_serializers=None,
@@ -571,7 +741,8 @@ def generate_container_serializer(model_fields, extra_fields, name,
         name, extra_fields, bases=extra_serializers,
         instance_sources=instance_sources)
     content = {'extra_fields': extra_fields.keys(),
-               'model_fields': model_fields.keys()}
+               'model_fields': model_fields.keys(),
+               'list_serializer_class': ContainerListSerializer}
     meta_cls = type('Meta', (object,), content)
     content = {
         'model_ser_cls': model_serializer,
@@ -621,7 +792,7 @@ def generate_serializer(name, drf_fields, bases=None,
         field_name: serializer
         for field_name, serializer in drf_fields.iteritems()
     }
-    content['instance_sources'] = instance_sources
+    content['instance_sources'] = resolve_instance_sources(instance_sources)
     custom_bases = map(utils.LOAD_CLASS, bases or [])
     base_cls = tuple(custom_bases) + (ApimasSerializer,)
     meta_cls = type('Meta', (object,), meta_cls_content)
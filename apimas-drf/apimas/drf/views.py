@@ -26,7 +26,7 @@ def generate_view(name, serializer, model, permissions=None,
                   authentication_classes=(), permission_classes=(),
                   mixins=(), hook_class=None, filter_fields=None,
                   ordering_fields=None, search_fields=None,
-                  actions=(), **kwargs):
+                  actions=(), projection=False, **kwargs):
     """
     A function to generate a viewset according to the model given as
     parameter.
@@ -40,6 +40,8 @@ def generate_view(name, serializer, model, permissions=None,
     `ViewSet` based on it.
     :param config: Dictionary with all required configuration of the viewset
     class.
+    :param projection: `True` if clients can restrict the fields of the
+    response via the `fields` or `exclude` query parameters.
     :return: A `ViewSet` class.
     """
     permission_classes = map(utils.LOAD_CLASS, permission_classes)
@@ -60,6 +62,8 @@ def generate_view(name, serializer, model, permissions=None,
     # Update class content with extra attributes.
     class_dict.update(kwargs)
     bases = get_bases_classes(mixins, hook_class, actions)
+    if projection:
+        bases = (view_mixins.ProjectionMixin,) + bases
     return type(name, bases, class_dict)
 
 
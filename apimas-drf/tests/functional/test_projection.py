@@ -0,0 +1,107 @@
+from rest_framework import status
+from apimas.drf.testing import (
+    apimas_context, ApimasTestCase)
+from apimas.drf.testing import utils
+from apimas.drf.serializers import get_projected_columns
+from tests.models import MyModel
+
+
+def get_value(instance):
+    return 'foo'
+
+
+SPEC = {
+    'api': {
+        '.endpoint': {
+            'permissions': [('*',) * 6],
+        },
+        'mymodel': {
+            '.collection': {},
+            '.drf_collection': {
+                'model': 'tests.models.MyModel',
+                'projection': True,
+            },
+            '*': {
+                'id': {
+                    '.serial': {},
+                    '.drf_field': {},
+                    '.readonly': {},
+                },
+                'string': {
+                    '.string': {'max_length': 2},
+                    '.drf_field': {},
+                    '.required': {},
+                },
+                'text': {
+                    '.text': {},
+                    '.drf_field': {},
+                    '.required': {},
+                },
+                'number': {
+                    '.drf_field': {},
+                    '.integer': {},
+                    '.required': {},
+                },
+                'url': {
+                    '.identity': {},
+                    '.drf_field': {},
+                },
+                'extra_field': {
+                    '.string': {},
+                    '.readonly': {},
+                    '.drf_field': {
+                        'onmodel': False,
+                        'instance_source': __name__ + '.get_value'}
+                },
+            },
+            '.actions=': {
+                '.list': {},
+                '.retrieve': {},
+            }
+        },
+    }
+}
+
+
+@apimas_context(__name__, SPEC)
+class TestProjection(ApimasTestCase):
+    def setUp(self):
+        super(TestProjection, self).setUp()
+        self.instance = utils.populate_model(MyModel, instances={})
+        self.url = '/api/mymodel/'
+
+    def test_projection_fields(self):
+        response = self.client.get(self.url, {'fields': 'id,number'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(dict(response.data[0]), {
+            'id': self.instance.pk, 'number': self.instance.number})
+
+        response = self.client.get(
+            self.url + str(self.instance.pk) + '/',
+            {'fields': 'string,extra_field'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(dict(response.data), {
+            'string': self.instance.string, 'extra_field': 'foo'})
+
+    def test_projection_exclude(self):
+        response = self.client.get(self.url, {'exclude': 'text,url'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data[0].keys()),
+                         {'id', 'string', 'number', 'extra_field'})
+
+    def test_projection_invalid(self):
+        response = self.client.get(self.url, {'fields': 'id,unknown'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(
+            self.url, {'fields': 'id', 'exclude': 'text'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_projected_columns(self):
+        serializer = self.adapter.get_serializer('api', 'mymodel')
+        columns = get_projected_columns(
+            serializer, MyModel, frozenset(['string', 'url']))
+        self.assertEqual(set(columns), {'id', 'string'})
+        columns = get_projected_columns(
+            serializer, MyModel, frozenset(['number', 'extra_field']))
+        self.assertIsNone(columns)
@@ -1,5 +1,7 @@
 import mock
 import unittest
+from apimas.errors import GenericFault
+from apimas.drf import serializers
 from apimas.drf.serializers import get_paths
 
 
@@ -28,3 +30,84 @@ class TestSerializers(unittest.TestCase):
         self.assertEqual(set(paths),
                          {'field1', 'nested/field/field1',
                           'nested/field/field2'})
+
+    @mock.patch.object(serializers.utils, 'import_object')
+    def test_resolve_source(self, mock_import):
+        self.assertRaises(GenericFault, serializers.resolve_source,
+                          'field', None)
+
+        mock_import.side_effect = ImportError()
+        self.assertRaises(GenericFault, serializers.resolve_source,
+                          'field', 'module.func')
+
+        mock_import.side_effect = None
+        mock_import.return_value = 'not a callable'
+        self.assertRaises(GenericFault, serializers.resolve_source,
+                          'field', 'module.func')
+
+        mock_import.return_value = len
+        funcs = serializers.resolve_source('field', 'module.a,module.b')
+        self.assertEqual(funcs, (len, len))
+        mock_import.assert_any_call('module.a')
+        mock_import.assert_any_call('module.b')
+
+        sources = serializers.resolve_instance_sources(
+            {'foo': 'module.a', 'bar': None})
+        self.assertEqual(sources, {'foo': (len,)})
+
+    def test_lookup_value(self):
+        funcs = (lambda x: x + 1, lambda x: x * 2)
+        self.assertEqual(serializers.lookup_value('field', funcs, 1), 4)
+        self.assertIsNone(serializers.lookup_value('field', funcs, None))
+
+    def test_container_list_serializer(self):
+        mock_child = mock.MagicMock()
+        mock_child.get_representation_plan.return_value = 'plan'
+        mock_child.represent.side_effect = lambda item, plan: {'id': item}
+        list_serializer = serializers.ContainerListSerializer(
+            child=mock_child)
+        data = list_serializer.to_representation([1, 2, 3])
+        self.assertEqual(data, [{'id': 1}, {'id': 2}, {'id': 3}])
+        mock_child.get_representation_plan.assert_called_once_with()
+        mock_child.represent.assert_has_calls(
+            [mock.call(1, 'plan'), mock.call(2, 'plan'),
+             mock.call(3, 'plan')])
+
+
+class UpperCaseSerializer(serializers.ApimasModelSerializer):
+    """ A custom base class which overrides the representation. """
+    def to_representation(self, instance):
+        ret = super(UpperCaseSerializer, self).to_representation(instance)
+        ret['string'] = ret['string'].upper()
+        return ret
+
+
+class TestContainerSerializer(unittest.TestCase):
+    def test_custom_representation(self):
+        from rest_framework import serializers as drf_serializers
+        from tests.models import MyModel
+        model_fields = {
+            'string': {},
+            'number': {},
+        }
+        extra_fields = {'extra': drf_serializers.CharField()}
+        instance = MyModel(pk=1, string='ab', number=3)
+        instance.extra = 'foo'
+        expected = {'string': 'ab', 'number': 3, 'extra': 'foo'}
+        for bases, string in ((None, 'ab'),
+                              (['tests.test_serializers.UpperCaseSerializer'],
+                               'AB')):
+            container_cls = serializers.generate_container_serializer(
+                model_fields, extra_fields, 'MyModelSerializer', MyModel,
+                model_serializers=bases)
+            self.assertEqual(
+                dict(container_cls(instance).data),
+                dict(expected, string=string))
+            data = container_cls([instance, instance], many=True).data
+            self.assertEqual([dict(item) for item in data],
+                             [dict(expected, string=string)] * 2)
+
+            # Customized representations are projected, too.
+            serializer = container_cls(
+                instance, context={'projected_fields': {'string'}})
+            self.assertEqual(dict(serializer.data), {'string': string})
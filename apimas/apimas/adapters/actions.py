@@ -1,4 +1,5 @@
 from functools import wraps
+from apimas.adapters import instrumentation
 
 
 class Response(object):
@@ -36,15 +37,31 @@ def handle_exception(func):
                 assert response_args is not None, (
                     'Error handler returned a `NoneType` response'
                 )
-                return Response(response_args)
+                return Response(**response_args)
             # An unexpectedly error occurred.
             raise
     return wrapper
 
 
 class ApimasAction(object):
+    """
+    Executes the pipeline of an action, i.e. its request processors, its
+    handler and its response processors.
+
+    A fresh context is created for every request. If a request processor
+    writes the kwargs of a response to `store/preempted` (e.g. a `304 Not
+    Modified` response), the handler and the response processors are
+    skipped, and this response is returned instead.
+
+    If instrumentation is enabled (see `apimas.adapters.instrumentation`),
+    every request records a trace of its stages in `trace`. The trace is
+    finished by the caller, after the response is rendered.
+    """
+    PREEMPTED_KEY = 'preempted'
+
     def __init__(self, collection, action, url, handler, request_proc=None,
-                 response_proc=None, orm_model=None, orm_type=None):
+                 response_proc=None, orm_model=None, orm_type=None,
+                 query_counter=None):
         assert bool(orm_model) == bool(orm_type)
         self.collection = collection
         self.action = action
@@ -54,6 +71,8 @@ class ApimasAction(object):
         self.response_proc = response_proc or []
         self.orm_model = orm_model
         self.orm_type = orm_type
+        self.query_counter = query_counter
+        self.trace = None
         self.context = {
             'store': self._create_context()
         }
@@ -66,24 +85,48 @@ class ApimasAction(object):
         }
 
     def _iter_processors(self, processors, *processor_args):
+        trace = self.trace
         for processor in processors:
             try:
-                processor.process(*processor_args)
+                if trace is None:
+                    processor.process(*processor_args)
+                else:
+                    with trace.stage(
+                            instrumentation.get_stage_name(processor.name)):
+                        processor.process(*processor_args)
             except Exception as e:
                 self._error_context = (processor.name, processor_args, e)
                 raise
 
+    def _process_handler(self, *args):
+        if self.trace is None:
+            return self.handler.process(*args)
+        with self.trace.stage(
+                instrumentation.get_stage_name(self.handler.name)):
+            return self.handler.process(*args)
+
     def get_post_processors(self):
         return self.response_proc
 
+    def _get_preempted(self):
+        return self.context['store'].get(self.PREEMPTED_KEY)
+
     @handle_exception
     def process_request(self, request):
+        self.context = {
+            'store': self._create_context(),
+            'request': request,
+        }
+        self.trace = instrumentation.start_trace(
+            self.collection, self.action, query_counter=self.query_counter)
         # Args for the request processors and handler.
-        self.context['request'] = request
         args = (self.collection, self.url, self.action, self.context)
         self._iter_processors(self.request_proc, *args)
+        preempted = self._get_preempted()
+        if preempted is not None:
+            return Response(**preempted)
         try:
-            response_kwargs = self.handler.process(*args)
+            response_kwargs = self._process_handler(*args)
         except Exception as e:
             self._error_context = (self.handler.name, args, e)
             response_kwargs = self.handler.handle_error(*self._error_context)
@@ -99,6 +142,8 @@ class ApimasAction(object):
             # Reset error context back to `None`.
             self._error_context = None
             return response
+        if self._get_preempted() is not None:
+            return response
         # Args for the response processors.
         args = (self.collection, self.url, self.action, self.context)
         self._iter_processors(self.response_proc, *args)
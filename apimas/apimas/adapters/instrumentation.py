@@ -0,0 +1,210 @@
+"""
+Instrumentation of the pipelines of apimas actions.
+
+When at least one callback is registered, every request records a `Trace`,
+i.e. the wall and CPU time, the database queries and the payload size of
+each stage of the pipeline (request processors, handler, response
+processors and rendering). Finished traces are passed to the registered
+callbacks, e.g. a `StatsdSink`:
+
+    >>> from apimas.adapters import instrumentation
+    >>> instrumentation.register(instrumentation.StatsdSink(prefix='myapi'))
+
+When no callback is registered, no trace is created and the pipelines run
+without any overhead.
+"""
+import re
+import socket
+import time
+from contextlib import contextmanager
+
+
+_callbacks = []
+
+
+def register(callback):
+    """
+    Registers a callback which is called with every finished `Trace`.
+
+    Exceptions raised by callbacks propagate to the caller, so callbacks
+    should not fail.
+    """
+    if callback not in _callbacks:
+        _callbacks.append(callback)
+    return callback
+
+
+def unregister(callback):
+    """ Unregisters a callback; it is a no-op if it is not registered. """
+    if callback in _callbacks:
+        _callbacks.remove(callback)
+
+
+def is_enabled():
+    """ Checks whether there is at least one registered callback. """
+    return bool(_callbacks)
+
+
+def start_trace(collection, action, query_counter=None):
+    """
+    Starts the trace of a request to the given action of a collection.
+
+    Args:
+        collection (str): Path of the collection, e.g. `api/foo`.
+        action (str): Name of the action, e.g. `list`.
+        query_counter: (optional) Callable which returns the number of
+            database queries executed so far.
+
+    Returns:
+        A `Trace` or `None` if instrumentation is disabled.
+    """
+    if not _callbacks:
+        return None
+    return Trace(collection, action, query_counter=query_counter)
+
+
+def get_stage_name(name):
+    """
+    Gets the name of a stage from the name of a processor or handler, e.g.
+    `apimas.components.processors.Serialization` -> `Serialization`.
+    """
+    return name.rsplit('.', 1)[-1]
+
+
+class Trace(object):
+    """
+    Timings of the stages of a single request.
+
+    Attributes:
+        collection (str): Path of the collection.
+        action (str): Name of the action.
+        stages (list): List of `(name, metrics)` tuples in order of
+            execution. Metrics is a dict with `wall` and `cpu` time in
+            seconds, and `queries` if a query counter is given.
+        sizes (dict): Payload sizes in bytes, e.g. `response`.
+        wall (float): Total wall time in seconds; set by `finish()`.
+    """
+    def __init__(self, collection, action, query_counter=None):
+        self.collection = collection
+        self.action = action
+        self.query_counter = query_counter
+        self.stages = []
+        self.sizes = {}
+        self.wall = None
+        self._start = time.time()
+        self._finished = False
+
+    @contextmanager
+    def stage(self, name):
+        """ Context manager which records the metrics of a stage. """
+        count_queries = self.query_counter
+        queries = count_queries() if count_queries else None
+        wall, cpu = time.time(), time.clock()
+        try:
+            yield
+        finally:
+            metrics = {
+                'wall': time.time() - wall,
+                'cpu': time.clock() - cpu,
+            }
+            if count_queries:
+                metrics['queries'] = count_queries() - queries
+            self.stages.append((name, metrics))
+
+    def record_size(self, name, size):
+        """ Records the size of a payload, e.g. of the response. """
+        self.sizes[name] = size
+
+    def get_queries(self):
+        """ Gets the total number of queries or `None` if not counted. """
+        if self.query_counter is None:
+            return None
+        return sum(metrics['queries'] for _, metrics in self.stages)
+
+    def finish(self):
+        """
+        Finishes the trace and passes it to the registered callbacks.
+        Subsequent calls are no-ops.
+        """
+        if self._finished:
+            return
+        self._finished = True
+        self.wall = time.time() - self._start
+        for callback in list(_callbacks):
+            callback(self)
+
+    def get_server_timing(self):
+        """
+        Gets the value of a `Server-Timing` HTTP header which describes
+        the wall time of the stages, e.g.
+        `Serialization;dur=1.200, total;dur=3.450`.
+        """
+        entries = ['%s;dur=%.3f' % (name, metrics['wall'] * 1000)
+                   for name, metrics in self.stages]
+        wall = self.wall
+        if wall is None:
+            wall = time.time() - self._start
+        entries.append('total;dur=%.3f' % (wall * 1000))
+        return ', '.join(entries)
+
+
+_INVALID_METRIC_CHARS = re.compile(r'[^A-Za-z0-9_\-]+')
+
+
+class StatsdSink(object):
+    """
+    Callback which sends the metrics of traces to a statsd server over UDP.
+
+    Metrics are keyed by collection and action, e.g.
+    `<prefix>.api_foo.list.Serialization.wall` (timers in milliseconds),
+    `<prefix>.api_foo.list.queries` and `<prefix>.api_foo.list.response_size`
+    (histograms), so that latency distributions are computed per endpoint.
+
+    Args:
+        host (str): Host of the statsd server.
+        port (int): Port of the statsd server.
+        prefix (str): (optional) Prefix of all metric names.
+    """
+    def __init__(self, host='localhost', port=8125, prefix=None):
+        self.address = (host, port)
+        self.prefix = prefix
+        self._socket = None
+
+    def _get_key(self, *parts):
+        parts = [_INVALID_METRIC_CHARS.sub('_', part).strip('_')
+                 for part in parts]
+        if self.prefix:
+            parts.insert(0, self.prefix)
+        return '.'.join(parts)
+
+    def get_metrics(self, trace):
+        """ Gets the lines of statsd metrics which describe a trace. """
+        base = (trace.collection, trace.action)
+        metrics = []
+        for name, stage in trace.stages:
+            metrics.append('%s:%.3f|ms' % (
+                self._get_key(*(base + (name, 'wall'))), stage['wall'] * 1000))
+            metrics.append('%s:%.3f|ms' % (
+                self._get_key(*(base + (name, 'cpu'))), stage['cpu'] * 1000))
+        metrics.append('%s:%.3f|ms' % (
+            self._get_key(*(base + ('total',))), trace.wall * 1000))
+        queries = trace.get_queries()
+        if queries is not None:
+            metrics.append('%s:%d|h' % (
+                self._get_key(*(base + ('queries',))), queries))
+        for name, size in sorted(trace.sizes.iteritems()):
+            metrics.append('%s:%d|h' % (
+                self._get_key(*(base + (name + '_size',))), size))
+        return metrics
+
+    def send(self, data):
+        if self._socket is None:
+            self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            self._socket.sendto(data, self.address)
+        except socket.error:
+            # Metrics are best-effort; never fail the request.
+            pass
+
+    def __call__(self, trace):
+        self.send('\n'.join(self.get_metrics(trace)))
@@ -0,0 +1,76 @@
+import unittest
+import mock
+from apimas.adapters import instrumentation
+from apimas.adapters.actions import ApimasAction, Request
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.traces = []
+        instrumentation.register(self.traces.append)
+
+    def tearDown(self):
+        instrumentation.unregister(self.traces.append)
+
+    def create_action(self, **kwargs):
+        processor = mock.Mock()
+        processor.name = 'apimas.components.processors.Serialization'
+        handler = mock.Mock()
+        handler.name = 'apimas.django.handlers.ListHandler'
+        handler.process.return_value = {'content': [], 'status_code': 200}
+        return ApimasAction('api/foo', 'list', '/', handler,
+                            request_proc=[processor], **kwargs)
+
+    def test_disabled(self):
+        instrumentation.unregister(self.traces.append)
+        self.assertFalse(instrumentation.is_enabled())
+        self.assertIsNone(instrumentation.start_trace('api/foo', 'list'))
+        action = self.create_action()
+        action.process_request(Request())
+        self.assertIsNone(action.trace)
+
+    def test_trace(self):
+        queries = iter([0, 2, 2, 5])
+        action = self.create_action(query_counter=lambda: next(queries))
+        response = action.process_request(Request())
+        action.process_response(response)
+        trace = action.trace
+        self.assertEqual(self.traces, [])
+        trace.record_size('response', 2)
+        trace.finish()
+        trace.finish()
+        self.assertEqual(self.traces, [trace])
+
+        self.assertEqual((trace.collection, trace.action), ('api/foo', 'list'))
+        self.assertEqual([name for name, _ in trace.stages],
+                         ['Serialization', 'ListHandler'])
+        self.assertEqual([metrics['queries'] for _, metrics in trace.stages],
+                         [2, 3])
+        self.assertEqual(trace.get_queries(), 5)
+        for _, metrics in trace.stages:
+            self.assertGreaterEqual(metrics['wall'], 0)
+            self.assertGreaterEqual(metrics['cpu'], 0)
+        server_timing = trace.get_server_timing().split(', ')
+        self.assertEqual([entry.split(';')[0] for entry in server_timing],
+                         ['Serialization', 'ListHandler', 'total'])
+
+    def test_statsd_sink(self):
+        trace = instrumentation.Trace('api/foo', 'list')
+        with trace.stage('Serialization'):
+            pass
+        trace.record_size('response', 10)
+        trace.finish()
+        sink = instrumentation.StatsdSink(prefix='myapi')
+        metrics = [metric.split(':')[0] for metric in sink.get_metrics(trace)]
+        self.assertEqual(metrics, [
+            'myapi.api_foo.list.Serialization.wall',
+            'myapi.api_foo.list.Serialization.cpu',
+            'myapi.api_foo.list.total',
+            'myapi.api_foo.list.response_size',
+        ])
+        self.assertTrue(sink.get_metrics(trace)[-1].endswith(':10|h'))
+
+        with mock.patch('socket.socket') as mock_socket:
+            sink(trace)
+            mock_socket.return_value.sendto.assert_called_once_with(
+                '\n'.join(sink.get_metrics(trace)), ('localhost', 8125))
@@ -4,10 +4,13 @@ from click import types
 from apimas import documents as doc
 from apimas.errors import InvalidSpec, NotFound
 from apimas.cli import (ListCommand, RetrieveCommand, CreateCommand,
-                        UpdateCommand, DeleleCommand, abort_if_false)
+                        UpdateCommand, DeleleCommand, ImportCommand,
+                        ExportCommand, abort_if_false)
+from apimas.cli.records import FORMATS
 from apimas.cli.custom_types import (
     Email, Json, Credentials, Date, DateTime)
-from apimas.adapters.cookbooks import NaiveAdapter, SKIP
+from apimas.adapters.cookbooks import (
+    NaiveAdapter, SKIP, instance_to_node_spec)
 
 
 def to_option(name):
@@ -68,8 +71,20 @@ class ApimasCliAdapter(NaiveAdapter):
         'update': UpdateCommand,
         'delete': DeleleCommand,
         'retrieve': RetrieveCommand,
+        'import': ImportCommand,
+        'export': ExportCommand,
     }
 
+    # Commands which transfer resources from/to files, along with the
+    # actions they require.
+    TRANSFER_ACTIONS = {
+        'import': 'create',
+        'export': 'list',
+    }
+
+    DEFAULT_BATCH_SIZE = 100
+    DEFAULT_CONCURRENCY = 10
+
     OPTION_CONSTRUCTORS = {
         'list': lambda x, y: click.option(
             to_option(x),
@@ -84,7 +99,9 @@ class ApimasCliAdapter(NaiveAdapter):
         'delete': None,
         'retrieve': lambda x, y: click.option(
             to_option(x),
-            **{k: v for k, v in y.iteritems() if k != 'required'})
+            **{k: v for k, v in y.iteritems() if k != 'required'}),
+        'import': None,
+        'export': None,
     }
 
     WRITE_ACTIONS = {
@@ -106,6 +123,12 @@ class ApimasCliAdapter(NaiveAdapter):
 
     CRITICAL_ACTIONS = {'delete'}
 
+    # Output formats of read actions; `json` is the default.
+    OUTPUT_FORMATS = {
+        'list': ['json', 'ndjson', 'table'],
+    }
+    DEFAULT_OUTPUT_FORMATS = ['json', 'table']
+
     EXTRA_PREDICATES = [
         '.cli_option',
         '.cli_commands',
@@ -192,10 +215,28 @@ class ApimasCliAdapter(NaiveAdapter):
         :param action: Action type, e.g. 'list', 'retrieve', etc.
         """
         if action in self.READ_ACTIONS:
+            formats = self.OUTPUT_FORMATS.get(
+                action, self.DEFAULT_OUTPUT_FORMATS)
             return click.option(
-                '--format', type=click.Choice(['json', 'table']),
+                '--format', type=click.Choice(formats),
                 default='json')(command)
 
+    def _add_pagination_options(self, command, action):
+        """
+        Add `--page-size` and `--limit` options to `ListCommand`.
+
+        The page size is sent to the server as a query parameter, whereas
+        the limit is the maximum number of resources printed.
+        """
+        if action != 'list':
+            return command
+        command = click.option(
+            '--page-size', type=types.IntRange(min=1),
+            help='Number of resources requested per page.')(command)
+        return click.option(
+            '--limit', type=types.IntRange(min=0),
+            help='Maximum number of resources to print.')(command)
+
     def construct_cli_auth(self, context):
         """
         Constructor of `.cli_auth` predicate.
@@ -230,6 +271,7 @@ class ApimasCliAdapter(NaiveAdapter):
             credential_option(command)
         return context.instance
 
+    @instance_to_node_spec
     def construct_cli_commands(self, context):
         """
         Constructor for '.cli_commands' predicate.
@@ -240,10 +282,21 @@ class ApimasCliAdapter(NaiveAdapter):
         parent_name = context.parent_name
         instance = self.init_adapter_conf(
             context.instance, initial={'.actions': set()})
-        commands = doc.doc_get(instance, ('.actions', self.ADAPTER_CONF)) or {}
+        # Actions are given by the `.actions=` namespace of the collection.
+        commands = doc.doc_get(
+            instance, ('.actions=', self.ADAPTER_CONF)) or doc.doc_get(
+                instance, ('.actions', self.ADAPTER_CONF)) or {}
         collection_name = context.loc[0] + '/' + parent_name
         self.commands[collection_name] = []
+        page_size_param = (context.spec or {}).get('page_size_param')
+        commands = dict(commands)
+        for action, required in self.TRANSFER_ACTIONS.iteritems():
+            if required in commands:
+                commands[action] = self.construct_transfer_command(
+                    instance, collection_name, action)
         for action, command in commands.iteritems():
+            if action in ('list', 'export') and page_size_param:
+                command.page_size_param = page_size_param
             command = self.construct_command(
                 instance, parent_name, context.spec, context.loc, action,
                 command)
@@ -251,6 +304,55 @@ class ApimasCliAdapter(NaiveAdapter):
             instance[self.ADAPTER_CONF]['.actions'].add(command)
         return instance
 
+    def get_field_types(self, instance):
+        """
+        Get the click types of the writable fields of a collection, keyed by
+        their path, e.g. `cart/id`.
+        """
+        field_types = {}
+        field_schema = doc.doc_get(instance, ('*',)) or {}
+        for field_name, spec in field_schema.iteritems():
+            if spec == SKIP or '.readonly' in spec:
+                continue
+            for option_name, params in (
+                    spec.get(self.ADAPTER_CONF) or {}).iteritems():
+                path = (field_name,) if '.struct=' not in spec\
+                    else self._struct_map[option_name]
+                field_types['/'.join(path)] = params['type']
+        return field_types
+
+    def construct_transfer_command(self, instance, collection_name, action):
+        """
+        Construct the command which imports resources of a collection from
+        a file, or exports them to a file.
+        """
+        command = self.COMMANDS[action](self.clients.get(collection_name))
+        command = click.option(
+            '--format', type=click.Choice(FORMATS), default=FORMATS[0],
+            help='Format of the file.')(command)
+        if action == 'export':
+            command = click.argument(
+                'output_file', type=types.File('wb'), default='-',
+                required=False)(command)
+            return click.option(
+                '--page-size', type=types.IntRange(min=1),
+                help='Number of resources requested per page.')(command)
+        command.field_types = self.get_field_types(instance)
+        command = click.argument(
+            'input_file', type=types.File('rb'))(command)
+        command = click.option(
+            '--batch-size', type=types.IntRange(min=1),
+            default=self.DEFAULT_BATCH_SIZE,
+            help='Number of resources validated and sent at a time.')(command)
+        command = click.option(
+            '--concurrency', type=types.IntRange(min=1),
+            default=self.DEFAULT_CONCURRENCY,
+            help='Maximum number of concurrent requests.')(command)
+        return click.option(
+            '--checkpoint', type=types.Path(dir_okay=False),
+            help='File which keeps the progress of the import, so that it'
+                 ' can be resumed.')(command)
+
     def construct_action(self, context, action):
         """
         Construct a command based on a specific actions, e.g. list,
@@ -269,6 +371,7 @@ class ApimasCliAdapter(NaiveAdapter):
                 prompt='Are you sure you want to perform this action?')
             command = option(command)
         self._add_format_option(command, action)
+        self._add_pagination_options(command, action)
         context.instance[self.ADAPTER_CONF][action] = command
         return context.instance
 
@@ -397,6 +500,10 @@ class ApimasCliAdapter(NaiveAdapter):
         loc = context.loc
         if instance == SKIP:
             return instance
+        if context.parent_spec:
+            # The type of the field may not have been constructed yet.
+            instance.update(doc.doc_merge(
+                instance, context.parent_spec, doc.standard_merge))
         predicate_type = self.extract_type(instance)
         option_name = doc.doc_get(
             spec, ('option_name',)) or parent_name
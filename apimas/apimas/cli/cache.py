@@ -0,0 +1,230 @@
+"""
+A cache of the commands of the CLI, so that the commands of a spec are not
+constructed on every invocation.
+
+The layout of the commands, i.e. their names, options and arguments, is
+stored on disk, keyed by the path, the modification time and the content
+of the configuration file. Commands built from a cached layout construct
+their clients on first use, so that listing the commands or printing their
+help does not load the spec at all.
+
+Layouts are stored as plain data with `marshal`, which (unlike `pickle`)
+cannot execute code when a tampered cache file is loaded. Objects of a
+layout, e.g. the parameters of commands and their types, are described by
+their class and attributes, and only classes and functions of `apimas` and
+`click` are rebuilt from a stored layout; layouts which refer to any other
+module (e.g. custom option types of an extension) are not cached.
+"""
+import hashlib
+import importlib
+import marshal
+import os
+import tempfile
+import types
+from os.path import abspath, getmtime, isdir, join
+import click
+from apimas.config import CACHE_DIR
+
+# Changed whenever the format of the stored layouts changes.
+LAYOUT_VERSION = 3
+
+# Modules whose classes and functions may be referred to by stored layouts.
+TRUSTED_MODULES = ('apimas', 'click')
+
+_PRIMITIVES = (type(None), bool, int, long, float, str, unicode)
+
+
+def get_cache_key(path):
+    """
+    Gets the key of the commands of a configuration file.
+
+    :raises: IOError or OSError if the file cannot be read.
+    """
+    path = abspath(path)
+    with open(path, 'rb') as f:
+        content_hash = hashlib.sha1(f.read()).hexdigest()
+    key = '{}:{}:{!r}:{}'.format(LAYOUT_VERSION, path, getmtime(path),
+                                 content_hash)
+    return hashlib.sha1(key).hexdigest()
+
+
+def get_layout(cli_adapter):
+    """
+    Gets the layout of the commands constructed by an `ApimasCliAdapter`.
+
+    :returns: A list with a dict for every command, which includes its
+    collection, name, class, attributes (e.g. its option mapping),
+    parameters and help.
+    """
+    layout = []
+    for collection, commands in sorted(
+            cli_adapter.get_commands().iteritems()):
+        for command in commands:
+            layout.append({
+                'collection': collection,
+                'name': command.name,
+                'class': type(command.callback),
+                'attributes': {
+                    key: value
+                    for key, value in vars(command.callback).iteritems()
+                    if key != 'client'},
+                'params': command.params,
+                'help': command.help,
+            })
+    return layout
+
+
+class LazyClient(object):
+    """
+    A proxy of the client of a collection, which is constructed when it is
+    first used.
+
+    :param get_client: Function which gets the client of a collection.
+    :param collection: Collection of the client, e.g. `api/foo`.
+    """
+    def __init__(self, get_client, collection):
+        self._get_client = get_client
+        self._collection = collection
+        self._client = None
+
+    def __getattr__(self, name):
+        if self._client is None:
+            self._client = self._get_client(self._collection)
+        return getattr(self._client, name)
+
+
+def build_commands(layout, get_client):
+    """
+    Builds the commands of a layout.
+
+    :param layout: Layout of commands, see `get_layout()`.
+    :param get_client: Function which gets the client of a collection.
+
+    :returns: A dict with the group of commands of every endpoint.
+    """
+    groups = {}
+    for entry in layout:
+        endpoint = entry['collection'].split('/')[0]
+        group = groups.get(endpoint)
+        if group is None:
+            group = groups[endpoint] = click.Group(name=endpoint)
+        callback = entry['class'](LazyClient(get_client, entry['collection']))
+        vars(callback).update(entry['attributes'])
+        group.add_command(click.Command(
+            entry['name'], callback=callback, params=entry['params'],
+            help=entry['help']))
+    return groups
+
+
+def _is_trusted(module):
+    return module.split('.')[0] in TRUSTED_MODULES
+
+
+def _get_reference(value):
+    module, name = value.__module__, value.__name__
+    if not _is_trusted(module) or \
+            getattr(importlib.import_module(module), name, None) is not value:
+        # e.g. nested functions, lambdas or classes of other packages.
+        raise TypeError('Cannot store a reference to {!r}'.format(value))
+    return module + ':' + name
+
+
+def _resolve_reference(reference):
+    module, name = reference.split(':')
+    if not _is_trusted(module):
+        raise ValueError('Untrusted module {!r}'.format(module))
+    return getattr(importlib.import_module(module), name)
+
+
+def encode_layout(value):
+    """
+    Converts a layout (see `get_layout()`) to plain data, which can be
+    stored with `marshal`.
+
+    Tuples of the plain data are tags: `('tuple', items)`, `('ref',
+    'module:name')` for classes and functions, and `('object', class,
+    attributes)` for other objects.
+
+    :raises: TypeError if the layout includes values which cannot be
+    described, e.g. objects of untrusted modules.
+    """
+    if isinstance(value, _PRIMITIVES):
+        return value
+    if isinstance(value, list):
+        return [encode_layout(item) for item in value]
+    if isinstance(value, tuple):
+        return ('tuple', [encode_layout(item) for item in value])
+    if isinstance(value, dict):
+        return {encode_layout(key): encode_layout(item)
+                for key, item in value.iteritems()}
+    if isinstance(value, (type, types.ClassType, types.FunctionType)):
+        return ('ref', _get_reference(value))
+    state = getattr(value, '__dict__', None)
+    if state is None:
+        raise TypeError('Cannot store {!r}'.format(value))
+    return ('object', _get_reference(type(value)), encode_layout(state))
+
+
+def decode_layout(value):
+    """
+    Converts plain data back to a layout, see `encode_layout()`.
+
+    Objects are created without calling their constructor, and only
+    classes and functions of `TRUSTED_MODULES` are resolved.
+
+    :raises: ValueError if the data are malformed or untrusted.
+    """
+    if isinstance(value, list):
+        return [decode_layout(item) for item in value]
+    if isinstance(value, dict):
+        return {decode_layout(key): decode_layout(item)
+                for key, item in value.iteritems()}
+    if not isinstance(value, tuple):
+        return value
+    tag = value[0]
+    if tag == 'tuple':
+        return tuple(decode_layout(item) for item in value[1])
+    if tag == 'ref':
+        return _resolve_reference(value[1])
+    if tag == 'object':
+        cls = _resolve_reference(value[1])
+        instance = cls.__new__(cls)
+        vars(instance).update(decode_layout(value[2]))
+        return instance
+    raise ValueError('Unknown tag {!r}'.format(tag))
+
+
+def _get_cache_path(key, cache_dir=None):
+    return join(cache_dir or CACHE_DIR, 'cli-' + key + '.marshal')
+
+
+def load_layout(key, cache_dir=None):
+    """ Loads a cached layout of commands or returns `None` if missing. """
+    try:
+        with open(_get_cache_path(key, cache_dir), 'rb') as f:
+            return decode_layout(marshal.load(f))
+    except Exception:
+        # A missing, partial or tampered file, or a stale layout, e.g. one
+        # which refers to classes which no longer exist.
+        return None
+
+
+def store_layout(key, layout, cache_dir=None):
+    """
+    Stores a layout of commands in the cache.
+
+    Failures are ignored, as the cache is only an optimization.
+    """
+    cache_dir = cache_dir or CACHE_DIR
+    try:
+        if not isdir(cache_dir):
+            os.makedirs(cache_dir)
+        data = marshal.dumps(encode_layout(layout))
+        # Write to a temporary file first (readable only by the user), so
+        # that concurrent invocations never read a partial layout.
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.rename(tmp_path, _get_cache_path(key, cache_dir))
+    except (IOError, OSError, TypeError, ValueError):
+        pass
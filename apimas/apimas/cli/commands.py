@@ -1,7 +1,10 @@
+import itertools
 import json
+import os
 import click
 from apimas import documents as doc
-from apimas.clients import RequestError
+from apimas.errors import ValidationError
+from apimas.cli import records
 
 
 def is_empty(v):
@@ -10,6 +13,8 @@ def is_empty(v):
 
 def handle_exception(func):
     def wrapper(*args, **kwargs):
+        # Clients (and `requests`) are imported only when a command runs.
+        from apimas.clients import RequestError
         try:
             func(*args, **kwargs)
         except RequestError as e:
@@ -20,6 +25,43 @@ def handle_exception(func):
     return wrapper
 
 
+def _format_cell(value):
+    if value is None:
+        return u''
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return unicode(value)
+
+
+def iter_table_lines(items, sample_size=100):
+    """
+    Formats an iterable of resources as the lines of a table, as they are
+    received.
+
+    The columns and their widths are computed from the first `sample_size`
+    resources, so that the table is printed without holding all resources
+    in memory; longer values of subsequent resources overflow their column.
+    """
+    items = iter(items)
+    sample = list(itertools.islice(items, sample_size))
+    if not sample:
+        return
+    headers = list(sample[0].keys())
+    widths = [max([len(header)] + [len(_format_cell(item.get(header)))
+                                   for item in sample])
+              for header in headers]
+
+    def format_line(cells):
+        return u'  '.join(cell.ljust(width)
+                          for cell, width in zip(cells, widths)).rstrip()
+
+    yield format_line(headers)
+    yield format_line(['-' * width for width in widths])
+    for item in itertools.chain(sample, items):
+        yield format_line([_format_cell(item.get(header))
+                           for header in headers])
+
+
 class BaseCommand(object):
     """ Base class that all commands derive from. """
     def __init__(self, client):
@@ -89,6 +131,30 @@ class BaseCommand(object):
                 table_data = [obj.values() for obj in data]
             click.echo(tabulate(table_data, headers=headers))
 
+    def format_items(self, items, format_type):
+        """
+        Print an iterable of resources in `JSON`, `NDJSON` (one `JSON`
+        document per line) or tabular format.
+
+        Resources are printed as soon as they are received. In `JSON`
+        format, they are printed as the elements of a `JSON` array.
+        """
+        if format_type == 'ndjson':
+            for item in items:
+                click.echo(json.dumps(item))
+        elif format_type == 'table':
+            for line in iter_table_lines(items):
+                click.echo(line)
+        else:
+            empty = True
+            for item in items:
+                lines = json.dumps(item, indent=2).splitlines()
+                click.echo('[' if empty else ',')
+                click.echo('\n'.join('  ' + line for line in lines),
+                           nl=False)
+                empty = False
+            click.echo('[]' if empty else '\n]')
+
     def __call__(self, **kwargs):
         raise NotImplementedError('__call__() must be implemented.')
 
@@ -137,17 +203,33 @@ class RetrieveCommand(BaseCommand):
 
 class ListCommand(BaseCommand):
     """
-    Command to perform a `GET` request for the listing of a collection of
+    Command to perform `GET` requests for the listing of a collection of
     resources.
+
+    All pages of the collection are listed; resources are streamed, so that
+    large collections are exported without being held in memory.
     """
+    # Query parameter of the server for the size of pages.
+    page_size_param = 'page_size'
 
     @handle_exception
     def __call__(self, **kwargs):
         format_type = kwargs.pop('format')
+        page_size = kwargs.pop('page_size', None)
+        limit = kwargs.pop('limit', None)
         self.add_credentials(kwargs)
         data = self.options_to_data(kwargs)
-        response = self.client.list(params=data)
-        self.format_response(response.json(), format_type)
+        if page_size is None and limit is not None:
+            page_size = limit or 1
+        if page_size is not None:
+            data[self.page_size_param] = page_size
+        # The next page is not prefetched if it is not going to be printed.
+        prefetch = limit is None or limit > page_size
+        items = self.client.iter_list(
+            params=data, stream=True, prefetch=prefetch)
+        if limit is not None:
+            items = itertools.islice(items, limit)
+        self.format_items(items, format_type)
 
 
 def abort_if_false(ctx, param, value):
@@ -165,3 +247,103 @@ class DeleleCommand(BaseCommand):
     def __call__(self, resource_id, **kwargs):
         self.add_credentials(kwargs)
         self.client.delete(resource_id)
+
+
+def _format_error(error):
+    if isinstance(error, ValidationError) and isinstance(error.message, dict):
+        return json.dumps(error.message)
+    return str(error)
+
+
+class ImportCommand(BaseCommand):
+    """
+    Command to create the resources of a file (JSON lines or CSV), with
+    concurrent `POST` requests.
+
+    Resources are validated before they are sent; invalid resources and
+    failed requests are reported along with their line. If a checkpoint
+    file is given, the number of processed resources is stored there after
+    every batch, so that an interrupted import is resumed from that point.
+    """
+    def __init__(self, client):
+        super(ImportCommand, self).__init__(client)
+        # Click types of fields keyed by their path, used to convert the
+        # values of CSV files.
+        self.field_types = {}
+
+    def create_batch(self, batch, concurrency):
+        """
+        Creates a batch of resources.
+
+        :returns: The created resource or the error of every record.
+        """
+        if not batch:
+            return []
+        try:
+            return self.client.create_many(batch, concurrency=concurrency)
+        except ValidationError as e:
+            errors = e.message
+        results = [ValidationError(errors[i]) if i in errors else None
+                   for i in xrange(len(batch))]
+        valid = [i for i in xrange(len(batch)) if i not in errors]
+        if valid:
+            created = self.client.create_many(
+                [batch[i] for i in valid], concurrency=concurrency)
+            for i, result in zip(valid, created):
+                results[i] = result
+        return results
+
+    @handle_exception
+    def __call__(self, input_file, **kwargs):
+        format_type = kwargs.pop('format')
+        batch_size = kwargs.pop('batch_size')
+        concurrency = kwargs.pop('concurrency')
+        checkpoint = kwargs.pop('checkpoint', None)
+        self.add_credentials(kwargs)
+        processed = records.read_checkpoint(checkpoint)
+        items = itertools.islice(records.read_records(
+            input_file, format_type, self.field_types), processed, None)
+        failed = 0
+        while True:
+            batch = list(itertools.islice(items, batch_size))
+            if not batch:
+                break
+            # Records which could not be read are errors already.
+            results = [record for _, record in batch]
+            valid = [i for i, result in enumerate(results)
+                     if not isinstance(result, Exception)]
+            created = self.create_batch(
+                [results[i] for i in valid], concurrency)
+            for i, result in zip(valid, created):
+                results[i] = result
+            for (line_num, _), result in zip(batch, results):
+                if isinstance(result, Exception):
+                    failed += 1
+                    click.secho('Line {}: {}'.format(
+                        line_num, _format_error(result)), fg='red', err=True)
+            processed += len(batch)
+            if checkpoint:
+                records.write_checkpoint(checkpoint, processed)
+            click.echo('Processed {} records ({} failed)'.format(
+                processed, failed), err=True)
+        if checkpoint and os.path.isfile(checkpoint):
+            os.remove(checkpoint)
+
+
+class ExportCommand(ListCommand):
+    """
+    Command to write all resources of a collection to a file (JSON lines
+    or CSV), as they are received.
+    """
+
+    @handle_exception
+    def __call__(self, output_file, **kwargs):
+        format_type = kwargs.pop('format')
+        page_size = kwargs.pop('page_size', None)
+        self.add_credentials(kwargs)
+        data = self.options_to_data(kwargs)
+        if page_size is not None:
+            data[self.page_size_param] = page_size
+        items = self.client.iter_list(params=data, stream=True)
+        count = records.write_records(output_file, items, format_type)
+        click.echo('Exported {} records'.format(count), err=True)
@@ -3,7 +3,6 @@ from datetime import datetime
 import re
 import click
 from click.types import StringParamType
-import yaml
 
 
 class Email(StringParamType):
@@ -67,6 +66,7 @@ class Credentials(click.File):
         self.file_type = file_type
 
     def load_yaml(self, f):
+        import yaml
         try:
             return yaml.load(f)
         except yaml.YAMLError as e:
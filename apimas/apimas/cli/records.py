@@ -0,0 +1,121 @@
+"""
+Reading and writing of resources as JSON lines or CSV files, used by the
+import and export commands of the CLI.
+
+In CSV files, every column corresponds to a field; columns of nested
+fields are named by their path, e.g. `cart/id`. Lists and objects which
+are not flattened are written as JSON.
+"""
+import csv
+import itertools
+import json
+import os
+import click
+from apimas import documents as doc
+
+
+FORMATS = ['ndjson', 'csv']
+
+
+def _encode(value):
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    if isinstance(value, unicode):
+        return value.encode('utf-8')
+    return str(value)
+
+
+def _convert_row(row, field_types):
+    data = {}
+    for column, value in row.iteritems():
+        # Empty cells, extra cells (without a column) and columns which are
+        # not writable fields, e.g. the `id` of exported resources, are
+        # ignored.
+        if column is None or value == '' or column not in field_types:
+            continue
+        data[column] = field_types[column].convert(value, None, None)
+    return doc.doc_from_ns(data)
+
+
+def read_records(f, format_type, field_types=None):
+    """
+    Reads the resources of a file lazily.
+
+    :param f: File object opened in binary mode.
+    :param format_type: `ndjson` or `csv`.
+    :param field_types: (optional) Click types of the writable fields keyed
+    by their path, used to convert the (string) values of CSV files. Other
+    columns are ignored.
+
+    :returns: An iterator of `(line number, resource)` tuples. If a line
+    cannot be read, its resource is the raised exception.
+    """
+    if format_type == 'csv':
+        reader = csv.DictReader(f)
+        for row in reader:
+            try:
+                record = _convert_row(row, field_types or {})
+            except click.BadParameter as e:
+                record = e
+            yield reader.line_num, record
+        return
+    for line_num, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            record = e
+        yield line_num, record
+
+
+def write_records(f, records, format_type):
+    """
+    Writes resources to a file, as they are received.
+
+    CSV columns are given by the fields of the first resource.
+
+    :returns: The number of written resources.
+    """
+    count = 0
+    if format_type == 'csv':
+        records = iter(records)
+        first = next(records, None)
+        if first is None:
+            return 0
+        first = doc.doc_to_ns(first)
+        writer = csv.DictWriter(f, sorted(first), extrasaction='ignore')
+        writer.writeheader()
+        for record in itertools.chain([first], records):
+            if record is not first:
+                record = doc.doc_to_ns(record)
+            writer.writerow({key: _encode(value)
+                             for key, value in record.iteritems()})
+            count += 1
+        return count
+    for record in records:
+        f.write(json.dumps(record) + '\n')
+        count += 1
+    return count
+
+
+def read_checkpoint(path):
+    """ Gets the number of records processed so far, according to path. """
+    if not path or not os.path.isfile(path):
+        return 0
+    with open(path) as f:
+        return int(f.read().strip() or 0)
+
+
+def write_checkpoint(path, processed):
+    """
+    Records the number of processed records, so that an interrupted import
+    can be resumed.
+    """
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(str(processed))
+    os.rename(tmp_path, path)
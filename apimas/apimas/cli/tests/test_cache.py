@@ -0,0 +1,153 @@
+import copy
+import marshal
+import os
+import shutil
+import tempfile
+import unittest
+import mock
+import yaml
+from click.testing import CliRunner
+from apimas import cmd
+from apimas.cli import cache
+from apimas.cli.adapter import ApimasCliAdapter
+from apimas.clients.adapter import ApimasClientAdapter
+
+
+SPEC = {
+    'api': {
+        '.endpoint': {},
+        'foo': {
+            '.collection': {},
+            '.cli_commands': {
+                'page_size_param': 'limit',
+            },
+            '*': {
+                'text': {
+                    '.field': {},
+                    '.cli_option': {},
+                    '.string': {},
+                    '.required': {},
+                },
+                'number': {
+                    '.field': {},
+                    '.cli_option': {
+                        'option_name': 'num',
+                    },
+                    '.integer': {},
+                },
+            },
+            '.actions=': {
+                '.list': {},
+                '.create': {},
+                '.delete': {},
+            },
+        },
+    },
+}
+
+
+def construct_cli(spec):
+    client_gen = ApimasClientAdapter('http://localhost/')
+    client_gen.construct(copy.deepcopy(spec))
+    cli = ApimasCliAdapter(client_gen.get_clients())
+    cli.construct(copy.deepcopy(spec))
+    return cli
+
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_layout(self):
+        layout = cache.get_layout(construct_cli(SPEC))
+        self.assertEqual(sorted(entry['name'] for entry in layout),
+                         ['foo-create', 'foo-delete', 'foo-export',
+                          'foo-import', 'foo-list'])
+
+        self.assertIsNone(cache.load_layout('key', self.cache_dir))
+        cache.store_layout('key', layout, self.cache_dir)
+        layout = cache.load_layout('key', self.cache_dir)
+        self.assertEqual(len(layout), 5)
+
+        mock_client = mock.Mock()
+        mock_client.create.return_value.json.return_value = {'id': 1}
+        get_client = mock.Mock(return_value=mock_client)
+        groups = cache.build_commands(layout, get_client)
+        self.assertEqual(groups.keys(), ['api'])
+        get_client.assert_not_called()
+
+        runner = CliRunner()
+        result = runner.invoke(groups['api'], ['foo-create', '--help'])
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn('--num', result.output)
+        result = runner.invoke(groups['api'], ['foo-list', '--help'])
+        self.assertIn('--page-size', result.output)
+        self.assertIn('[json|ndjson|table]', result.output)
+        get_client.assert_not_called()
+
+        mock_client.iter_list.return_value = iter([{'id': 1}])
+        result = runner.invoke(
+            groups['api'], ['foo-list', '--page-size', '5'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        mock_client.iter_list.assert_called_once_with(
+            params={'limit': 5}, stream=True, prefetch=True)
+
+        result = runner.invoke(
+            groups['api'], ['foo-create', '--text', 'foo', '--num', '1'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        get_client.assert_called_with('api/foo')
+        mock_client.create.assert_called_once_with(
+            data={'text': 'foo', 'number': 1})
+
+    def test_encode_layout(self):
+        layout = cache.get_layout(construct_cli(SPEC))
+        cache.store_layout('key', layout, self.cache_dir)
+        path = os.path.join(self.cache_dir, 'cli-key.marshal')
+        self.assertEqual(os.stat(path).st_mode & 0o777, 0o600)
+        self.assertEqual(cache.decode_layout(cache.encode_layout(
+            {'mapping': {'num': ('number',)}})), {'mapping': {'num': (
+                'number',)}})
+
+        # Only classes and functions of trusted modules are stored...
+        self.assertRaises(TypeError, cache.encode_layout, [os.system])
+        self.assertRaises(TypeError, cache.encode_layout, lambda: None)
+        cache.store_layout('other', [{'value': mock.Mock()}], self.cache_dir)
+        self.assertIsNone(cache.load_layout('other', self.cache_dir))
+
+        # ...or loaded.
+        with open(path, 'wb') as f:
+            marshal.dump([('ref', 'os:system')], f)
+        self.assertIsNone(cache.load_layout('key', self.cache_dir))
+        with open(path, 'wb') as f:
+            marshal.dump([('object', 'subprocess:Popen', {})], f)
+        self.assertIsNone(cache.load_layout('key', self.cache_dir))
+
+    def test_get_commands(self):
+        config_file = os.path.join(self.cache_dir, 'config.yaml')
+        with open(config_file, 'w') as f:
+            yaml.safe_dump({'root': 'http://localhost/', 'spec': SPEC}, f)
+
+        with mock.patch.object(cache, 'CACHE_DIR', self.cache_dir), \
+                mock.patch.dict(cmd._commands, clear=True):
+            base_command, groups = cmd.get_commands(config_file)
+            self.assertIn('foo-list', groups['api'].commands)
+            # Commands are constructed once per process.
+            self.assertIs(cmd.get_commands(config_file)[0], base_command)
+
+            cmd._commands.clear()
+            with mock.patch.object(cmd, '_construct_cli') as mock_construct:
+                base_command, groups = cmd.get_commands(config_file)
+                mock_construct.assert_not_called()
+            self.assertEqual(sorted(groups['api'].commands),
+                             ['foo-create', 'foo-delete', 'foo-export',
+                              'foo-import', 'foo-list'])
+            self.assertIs(base_command.commands['api'], groups['api'])
+
+            # A modified configuration file invalidates the cache.
+            os.utime(config_file, (0, 0))
+            with mock.patch.object(cmd, '_construct_cli') as mock_construct:
+                cmd.get_commands(config_file)
+                mock_construct.assert_called_once()
@@ -139,7 +139,8 @@ class TestCliAdapter(unittest.TestCase):
     def test_construct_cli_commands(self):
         mock_loc = ('foo', 'bar', '.cli_commands')
         mock_cli = create_mock_object(
-            ApimasCliAdapter, ['construct_cli_commands', 'ADAPTER_CONF'])
+            ApimasCliAdapter, ['construct_cli_commands', 'ADAPTER_CONF',
+                               'TRANSFER_ACTIONS'])
         mock_cli.commands = {}
         mock_instance = {
             self.adapter_conf: {'.actions': set()}
@@ -1,6 +1,8 @@
+import json
 import unittest
 import mock
-from apimas.cli import BaseCommand
+from apimas.cli import BaseCommand, ListCommand
+from apimas.cli.commands import iter_table_lines
 
 
 class TestCommands(unittest.TestCase):
@@ -53,3 +55,57 @@ class TestCommands(unittest.TestCase):
                                     format_type='table')
             mock_tabulate.assert_called_with(
                 [['bar'], ['bar2']], headers=['foo'])
+
+    def test_format_items(self):
+        command = BaseCommand(client=None)
+        items = [{'foo': 'bar'}, {'foo': 'bar2'}]
+        with mock.patch('click.echo') as mock_echo:
+            command.format_items(iter(items), format_type='json')
+            output = ''.join(
+                args[0] + ('' if kwargs.get('nl') is False else '\n')
+                for args, kwargs in mock_echo.call_args_list)
+            self.assertEqual(json.loads(output), items)
+
+        with mock.patch('click.echo') as mock_echo:
+            command.format_items(iter([]), format_type='json')
+            mock_echo.assert_called_once_with('[]')
+
+        with mock.patch('click.echo') as mock_echo:
+            command.format_items(iter(items), format_type='ndjson')
+            self.assertEqual(mock_echo.call_args_list, [
+                mock.call('{"foo": "bar"}'), mock.call('{"foo": "bar2"}')])
+
+        with mock.patch('click.echo') as mock_echo:
+            command.format_items(iter(items), format_type='table')
+            self.assertEqual(mock_echo.call_count, 4)
+
+    def test_iter_table_lines(self):
+        items = [{'a': 1, 'b': None}, {'a': 'long value', 'b': [1]},
+                 {'a': 'overflowing value', 'b': 'x'}]
+        lines = list(iter_table_lines(iter(items), sample_size=2))
+        self.assertEqual(lines, [
+            'a           b',
+            '----------  ---',
+            '1',
+            'long value  [1]',
+            'overflowing value  x',
+        ])
+        self.assertEqual(list(iter_table_lines(iter([]))), [])
+
+    def test_list_command(self):
+        mock_client = mock.Mock()
+        mock_client.iter_list.return_value = iter(
+            [{'id': i} for i in xrange(10)])
+        command = ListCommand(client=mock_client)
+        with mock.patch('click.echo') as mock_echo:
+            command(format='ndjson', page_size=None, limit=3)
+        mock_client.iter_list.assert_called_once_with(
+            params={'page_size': 3}, stream=True, prefetch=False)
+        self.assertEqual(mock_echo.call_count, 3)
+
+        mock_client.iter_list.reset_mock()
+        command.page_size_param = 'limit'
+        with mock.patch('click.echo'):
+            command(format='ndjson', page_size=5, limit=None)
+        mock_client.iter_list.assert_called_once_with(
+            params={'limit': 5}, stream=True, prefetch=True)
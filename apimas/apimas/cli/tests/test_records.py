@@ -0,0 +1,111 @@
+import copy
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from click.testing import CliRunner
+from apimas.cli import records
+from apimas.cli.adapter import ApimasCliAdapter
+from apimas.clients.adapter import ApimasClientAdapter
+from apimas.testing.server import LocalServer
+
+
+ROOT_URL = 'http://records.test'
+
+SPEC = {
+    'api': {
+        '.endpoint': {},
+        'foo': {
+            '.collection': {},
+            '.cli_commands': {},
+            '*': {
+                'text': {
+                    '.field': {},
+                    '.cli_option': {},
+                    '.string': {},
+                    '.required': {},
+                },
+                'number': {
+                    '.field': {},
+                    '.cli_option': {},
+                    '.integer': {},
+                },
+            },
+            '.actions=': {
+                '.list': {},
+                '.create': {},
+            },
+        },
+    },
+}
+
+
+class TestRecords(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        client_gen = ApimasClientAdapter(ROOT_URL)
+        client_gen.construct(copy.deepcopy(SPEC))
+        self.client = client_gen.get_client('api', 'foo')
+        cli = ApimasCliAdapter(client_gen.get_clients())
+        cli.construct(copy.deepcopy(SPEC))
+        self.group = cli.endpoint_groups['api']
+        self.server = LocalServer(ROOT_URL, ['api/foo'], page_size=2)
+        self.server.mount(self.client.session)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write_file(self, name, content):
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, 'wb') as f:
+            f.write(content)
+        return path
+
+    def invoke(self, *args):
+        result = CliRunner().invoke(self.group, args)
+        self.assertEqual(result.exit_code, 0, result.output)
+        return result.output
+
+    def get_numbers(self):
+        # Resources are created concurrently, in any order.
+        return sorted(resource['number'] for resource in
+                      self.server.collections['api/foo'].itervalues())
+
+    def test_read_records(self):
+        path = self.write_file('records.csv', 'text,number,extra\n'
+                                              'foo,1,x\n'
+                                              'bar,,\n'
+                                              'baz,a,\n')
+        field_types = self.group.commands['foo-import'].callback.field_types
+        self.assertEqual(sorted(field_types), ['number', 'text'])
+        with open(path, 'rb') as f:
+            rows = list(records.read_records(f, 'csv', field_types))
+        self.assertEqual(rows[:2], [(2, {'text': 'foo', 'number': 1}),
+                                    (3, {'text': 'bar'})])
+        self.assertIsInstance(rows[2][1], Exception)
+
+    def test_import_export(self):
+        lines = [json.dumps({'text': str(i), 'number': i}) for i in xrange(5)]
+        lines[1] = '{"text": invalid'
+        lines[3] = json.dumps({'number': 3})
+        path = self.write_file('records.ndjson', '\n'.join(lines) + '\n')
+        output = self.invoke('foo-import', path, '--batch-size', '2')
+        self.assertIn('Line 2', output)
+        self.assertIn('Line 4', output)
+        self.assertIn('Processed 5 records (2 failed)', output)
+        self.assertEqual(self.get_numbers(), [0, 2, 4])
+
+        export_path = os.path.join(self.tmp_dir, 'export.csv')
+        output = self.invoke('foo-export', export_path, '--format', 'csv')
+        self.assertIn('Exported 3 records', output)
+        with open(export_path, 'rb') as f:
+            self.assertEqual(f.readline().strip(), 'id,number,text')
+
+        # Re-import the exported records, resuming after the first one.
+        checkpoint = self.write_file('checkpoint', '1')
+        self.server.collections['api/foo'].clear()
+        self.invoke('foo-import', export_path, '--format', 'csv',
+                    '--checkpoint', checkpoint)
+        self.assertEqual(self.get_numbers(), [2, 4])
+        self.assertFalse(os.path.exists(checkpoint))
@@ -1,8 +1,9 @@
 from requests.compat import urljoin
 from apimas import documents as doc
 from apimas.errors import InvalidSpec, NotFound
-from apimas.adapters.cookbooks import NaiveAdapter
+from apimas.adapters.cookbooks import NaiveAdapter, instance_to_node_spec
 from apimas.clients import ApimasClient, TRAILING_SLASH
+from apimas.clients.sessions import get_session
 from apimas.clients.extensions import (
     RefNormalizer, DateNormalizer, DateTimeNormalizer)
 
@@ -55,10 +56,23 @@ class ApimasClientAdapter(NaiveAdapter):
 
     PREDICATES = list(NaiveAdapter.PREDICATES) + ['.field']
 
-    def __init__(self, root_url):
+    def __init__(self, root_url, session_conf=None, client_class=None):
+        """
+        :param root_url: Root URL of the API.
+        :param session_conf: (optional) Configuration of the sessions of the
+        clients, e.g. `{'pool_size': 10, 'max_retries': 3,
+        'backoff_factor': 0.5, 'timeout': 30}`. Every client has its own
+        session, but all of them share a connection pool. See
+        `apimas.clients.sessions.get_session()`.
+        :param client_class: (optional) Class of the generated clients, e.g.
+        `apimas.clients.parallel.ParallelApimasClient`. Default is
+        `ApimasClient`.
+        """
         self.root_url = root_url
+        self.client_class = client_class or ApimasClient
         self.adapter_spec = None
         self.clients = {}
+        self.session_conf = session_conf or {}
 
     def get_clients(self):
         return self.clients
@@ -83,9 +97,12 @@ class ApimasClientAdapter(NaiveAdapter):
 
         This constructor aims to aggregate the cerberus validation schemas
         for every single field defined by the collection.
+
+        Actions which the server exposes as bulk endpoints are declared
+        with the `bulk` parameter, e.g. `'.collection': {'bulk': ['create']}`.
         """
         instance = super(self.__class__, self).construct_collection(
-            context)
+            context=context)
         self.init_adapter_conf(instance)
         schema = {field_name: schema.get(self.ADAPTER_CONF, {})
                   for field_name, schema in doc.doc_get(
@@ -95,10 +112,14 @@ class ApimasClientAdapter(NaiveAdapter):
             self.root_url, TRAILING_SLASH.join([context.loc[0], collection]))
         endpoint += TRAILING_SLASH
         instance[self.ADAPTER_CONF] = schema
-        client = ApimasClient(endpoint, schema)
+        client = self.client_class(
+            endpoint, schema,
+            session=get_session(self.root_url, **self.session_conf),
+            bulk_actions=context.spec.get('bulk', ()))
         self.clients[context.loc[0] + '/' + collection] = client
         return instance
 
+    @instance_to_node_spec
     def construct_field(self, context):
         """
         Constructor of `.field` predicate.
@@ -164,7 +185,7 @@ class ApimasClientAdapter(NaiveAdapter):
         This normalization is triggered before every cerberus validation.
         """
         instance = super(self.__class__, self).construct_ref(
-            context)
+            context=context)
         many = context.spec.get('many')
         ref = context.spec.get('to')
         normalizer = {'coerce': RefNormalizer(TRAILING_SLASH.join(
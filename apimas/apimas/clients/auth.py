@@ -24,6 +24,9 @@ class ApimasClientAuth(AuthBase):
     """
     Attaches HTTP authentication to the given request object based on the
     auth type.
+
+    The authentication backend is created on the first request and it is
+    reused by the subsequent ones (unless the auth type changes).
     """
     AUTHENTICATION_BACKENDS = {
         'basic': HTTPBasicAuth,
@@ -33,10 +36,12 @@ class ApimasClientAuth(AuthBase):
     def __init__(self, auth_type, **credentials):
         self.credentials = credentials
         self.auth_type = auth_type
+        self._backend = None
 
-    def __call__(self, r):
-        if self.auth_type is None:
-            return r
+    def get_backend(self):
+        """ Gets the authentication backend of the auth type. """
+        if self._backend is not None and self._backend[0] == self.auth_type:
+            return self._backend[1]
         if self.auth_type not in self.AUTHENTICATION_BACKENDS:
             raise ValidationError(
                 '{!r} auth type is not supported'.format(self.auth_type))
@@ -47,4 +52,10 @@ class ApimasClientAuth(AuthBase):
             raise ValidationError(
                 'Given credentials do not match with that of {!r} auth'
                 ' type'.format(self.auth_type))
-        return auth(r)
+        self._backend = (self.auth_type, auth)
+        return auth
+
+    def __call__(self, r):
+        if self.auth_type is None:
+            return r
+        return self.get_backend()(r)
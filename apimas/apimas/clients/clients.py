@@ -1,15 +1,23 @@
-from copy import deepcopy
+import itertools
+import sys
+from multiprocessing.pool import ThreadPool
 import requests
 from requests.exceptions import HTTPError
 from requests.compat import urljoin, quote
 from apimas import documents as doc
 from apimas.errors import ValidationError
 from apimas.clients.auth import ApimasClientAuth
+from apimas.clients.sessions import create_session
 from apimas.clients.extensions import ApimasValidator
+from apimas.clients.streaming import ITEM, META, iter_json_items
 
 
 TRAILING_SLASH = '/'
 
+DEFAULT_CONCURRENCY = 10
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
 
 class RequestError(HTTPError):
     def __init__(self, *args, **kwargs):
@@ -90,6 +98,67 @@ def handle_exception(func):
     return wrapper
 
 
+def run_concurrently(func, calls, concurrency=DEFAULT_CONCURRENCY):
+    """
+    Calls a function for every set of arguments, using a pool of threads.
+
+    :param func: Function to be called.
+    :param calls: Iterable of `(args, kwargs)` tuples of every call.
+    :param concurrency: Maximum number of concurrent calls.
+
+    :returns: A list of `(succeeded, result)` tuples, in the order of
+    `calls`. If a call failed, its result is the `sys.exc_info()` of the
+    raised exception.
+    """
+    def call(args_kwargs):
+        args, kwargs = args_kwargs
+        try:
+            return True, func(*args, **kwargs)
+        except Exception:
+            return False, sys.exc_info()
+
+    pool = ThreadPool(concurrency)
+    try:
+        return list(pool.imap(call, calls))
+    finally:
+        pool.close()
+        pool.join()
+
+
+def get_content(response):
+    """ Gets the decoded JSON content of a response or None if empty. """
+    if not response.content:
+        return None
+    try:
+        return response.json()
+    except ValueError:
+        return response.text
+
+
+def iter_page(response, results_key='results', chunk_size=None):
+    """
+    Iterates over the contents of a page of a list response, i.e. either a
+    list of resources or an object with the list of resources in its
+    `results_key` member (e.g. `{"next": ..., "results": [...]}`).
+
+    :param chunk_size: If given, the body of the response is parsed
+    incrementally, reading chunks of this size, instead of being loaded in
+    memory (the response must have been made with `stream=True`).
+
+    :returns: An iterator of `(ITEM, resource)` and `(META, (key, value))`
+    tuples; see `iter_json_items()`.
+    """
+    if chunk_size is not None:
+        return iter_json_items(response.iter_content(chunk_size),
+                               items_key=results_key)
+    content = response.json()
+    if isinstance(content, list):
+        return ((ITEM, item) for item in content)
+    items = content.pop(results_key, [])
+    return itertools.chain(((META, member) for member in content.iteritems()),
+                           ((ITEM, item) for item in items))
+
+
 class ApimasClient(object):
     """
     A class which defines a client for specific resource.
@@ -99,14 +168,33 @@ class ApimasClient(object):
     location of this resource to the web, resource specification and
     credentials if the resource is protected.
 
+    Requests are made through the given `requests.Session`, which is
+    typically shared by all clients of the same API.
+
+    Batches of resources are handled by the `*_many()` methods, e.g.
+    `create_many()`, which validate all data up front and then send
+    their requests concurrently. If the server exposes a bulk endpoint
+    for an action (see `bulk_actions`), one bulk request is sent instead.
+
     TODO: Support additional actions.
     """
 
-    def __init__(self, endpoint, schema):
+    def __init__(self, endpoint, schema, session=None, bulk_actions=()):
+        """
+        :param bulk_actions: Actions exposed as bulk endpoints by the
+        server. Only `create` is supported, i.e. a POST request to the
+        collection with a list of resources, which responds with the list
+        of the created resources.
+        """
         self.endpoint = endpoint
+        self.bulk_actions = frozenset(bulk_actions)
         self.validation_schema = schema
         self.api_validator = ApimasValidator(self.validation_schema)
+        self._partial_validators = {}
         self.auth = None
+        # Requests are made through a session, so that connections are
+        # reused.
+        self.session = session if session is not None else create_session()
 
     @handle_exception
     def create(self, raise_exception=True, headers=None, data=None):
@@ -120,7 +208,7 @@ class ApimasClient(object):
             'auth': self.auth,
         }
         request_kwargs.update(self.extract_write_data(data, raise_exception))
-        r = requests.post(self.endpoint, **request_kwargs)
+        r = self.session.post(self.endpoint, **request_kwargs)
         return r
 
     @handle_exception
@@ -137,7 +225,8 @@ class ApimasClient(object):
         }
         data = self.validate(data or {}, raise_exception)
         request_kwargs.update(self.extract_write_data(data, raise_exception))
-        r = requests.put(self.format_endpoint(resource_id), **request_kwargs)
+        r = self.session.put(
+            self.format_endpoint(resource_id), **request_kwargs)
         return r
 
     @handle_exception
@@ -155,7 +244,8 @@ class ApimasClient(object):
         }
         request_kwargs.update(self.extract_write_data(
             data, raise_exception, partial=True))
-        r = requests.patch(self.format_endpoint(resource_id), **request_kwargs)
+        r = self.session.patch(
+            self.format_endpoint(resource_id), **request_kwargs)
         return r
 
     @handle_exception
@@ -166,10 +256,79 @@ class ApimasClient(object):
 
         Example: GET endpoint/
         """
-        r = requests.get(self.endpoint, headers=headers, params=params,
-                         auth=self.auth, json=data)
+        r = self.session.get(self.endpoint, headers=headers, params=params,
+                             auth=self.auth, json=data)
         return r
 
+    def iter_list(self, headers=None, params=None, stream=False,
+                  prefetch=True, results_key='results',
+                  chunk_size=STREAM_CHUNK_SIZE):
+        """
+        Iterates over all resources of the collection, following the
+        pagination of the server page by page, e.g.
+
+            >>> for resource in client.iter_list(stream=True):
+            ...     export(resource)
+
+        The next page is given either by the `next` link of the `Link`
+        header or by the `next` member of the response body, so page,
+        limit/offset and cursor pagination are all supported; unpaginated
+        responses are a single page.
+
+        :param params: Query parameters of the first request; subsequent
+        requests follow the URLs given by the server.
+        :param stream: If True, the body of every page is parsed
+        incrementally, so that only a chunk of the page is held in memory
+        at a time.
+        :param prefetch: If True, the next page is requested in the
+        background, as soon as its URL is known, while the items of the
+        current page are consumed.
+        :param results_key: Member of the response body with the resources
+        of the page.
+        :param chunk_size: Number of bytes read at a time in stream mode.
+
+        :raises: RequestError if the request of any page fails.
+        """
+        def fetch(url, params=None):
+            return self._request('get', url, headers=headers, params=params,
+                                 stream=stream)
+
+        pool = ThreadPool(1) if prefetch else None
+        pending = None
+        url = self.endpoint
+        try:
+            while url is not None:
+                if pending is not None:
+                    response = pending.get()
+                    pending = None
+                else:
+                    response = fetch(url, params)
+                url = response.links.get('next', {}).get('url')
+                if url is not None and pool is not None:
+                    pending = pool.apply_async(fetch, (url,))
+                try:
+                    for kind, value in iter_page(
+                            response, results_key,
+                            chunk_size if stream else None):
+                        if kind == ITEM:
+                            yield value
+                        elif value[0] == 'next' and url is None and value[1]:
+                            url = value[1]
+                            if pool is not None:
+                                pending = pool.apply_async(fetch, (url,))
+                finally:
+                    response.close()
+        finally:
+            if pool is not None:
+                if pending is not None:
+                    # The iteration has stopped early; release the connection
+                    # of the prefetched page.
+                    pending.wait()
+                    if pending.successful():
+                        pending.get().close()
+                pool.close()
+                pool.join()
+
     @handle_exception
     def retrieve(self, resource_id, raise_exception=True, headers=None,
                  params=None, data=None):
@@ -179,8 +338,9 @@ class ApimasClient(object):
 
         Example: GET endpoint/<pk>/
         """
-        r = requests.get(self.format_endpoint(resource_id), headers=headers,
-                         params=params, auth=self.auth, json=data)
+        r = self.session.get(
+            self.format_endpoint(resource_id), headers=headers,
+            params=params, auth=self.auth, json=data)
         return r
 
     @handle_exception
@@ -190,7 +350,7 @@ class ApimasClient(object):
 
         Example: DELETE endpoint/<pk>/
         """
-        r = requests.delete(
+        r = self.session.delete(
             self.format_endpoint(resource_id), auth=self.auth,
             headers=headers)
         return r
@@ -202,7 +362,7 @@ class ApimasClient(object):
         """
         endpoint = self.endpoint if resource_id is None else\
             self.format_endpoint(resource_id)
-        r = requests.head(endpoint, headers=headers, auth=self.auth)
+        r = self.session.head(endpoint, headers=headers, auth=self.auth)
         return r
 
     @handle_exception
@@ -210,9 +370,124 @@ class ApimasClient(object):
         """
         Method for making a HTTP OPTIONS request on resource's endpoint.
         """
-        r = requests.options(self.endpoint, headers=headers, auth=self.auth)
+        r = self.session.options(
+            self.endpoint, headers=headers, auth=self.auth)
         return r
 
+    @handle_exception
+    def _request(self, method, url, raise_exception=True, **kwargs):
+        return getattr(self.session, method)(url, auth=self.auth, **kwargs)
+
+    def _validate_many(self, records, partial=False):
+        """
+        Validates the data of all records of a batch and extracts the
+        arguments of their requests.
+
+        :raises: ValidationError with the errors of the invalid records,
+        keyed by their index, if any record is invalid.
+        """
+        request_kwargs = []
+        errors = {}
+        for i, data in enumerate(records):
+            try:
+                request_kwargs.append(self.extract_write_data(
+                    data, raise_exception=True, partial=partial))
+            except ValidationError as e:
+                errors[i] = e.message
+        if errors:
+            raise ValidationError(errors)
+        return request_kwargs
+
+    def _request_many(self, method, calls, concurrency):
+        """
+        Makes a request for every `(url, kwargs)` of calls concurrently.
+
+        :returns: A list with the content of every response, or the
+        exception raised by its request, in the order of calls.
+        """
+        calls = (((method, url), kwargs) for url, kwargs in calls)
+        results = []
+        for succeeded, result in run_concurrently(
+                self._request, calls, concurrency):
+            results.append(get_content(result) if succeeded else result[1])
+        return results
+
+    def _bulk_create(self, request_kwargs, headers=None):
+        data = [kwargs['json'] for kwargs in request_kwargs]
+        try:
+            response = self._request('post', self.endpoint, json=data,
+                                     headers=headers)
+        except requests.RequestException as e:
+            return [e] * len(data)
+        return get_content(response)
+
+    def create_many(self, records, headers=None,
+                    concurrency=DEFAULT_CONCURRENCY):
+        """
+        Creates a resource for every record.
+
+        All records are validated before any request is made.
+
+        :returns: A list with the created resources, or the exception
+        raised by the request of a record, in the order of records.
+        :raises: ValidationError if any record is invalid.
+        """
+        request_kwargs = self._validate_many(records)
+        if 'create' in self.bulk_actions and all(
+                'json' in kwargs for kwargs in request_kwargs):
+            return self._bulk_create(request_kwargs, headers)
+        calls = ((self.endpoint, dict(kwargs, headers=headers))
+                 for kwargs in request_kwargs)
+        return self._request_many('post', calls, concurrency)
+
+    def update_many(self, records, partial=False, headers=None,
+                    concurrency=DEFAULT_CONCURRENCY):
+        """
+        Updates the given resources.
+
+        All data are validated before any request is made.
+
+        :param records: A list of `(resource_id, data)` tuples.
+        :param partial: True if only the given fields are updated (PATCH).
+
+        :returns: A list with the updated resources, or the exception
+        raised by the request of a record, in the order of records.
+        :raises: ValidationError if any record is invalid.
+        """
+        records = list(records)
+        request_kwargs = self._validate_many(
+            [data for _, data in records], partial=partial)
+        calls = ((self.format_endpoint(resource_id),
+                  dict(kwargs, headers=headers))
+                 for (resource_id, _), kwargs in zip(records, request_kwargs))
+        return self._request_many(
+            'patch' if partial else 'put', calls, concurrency)
+
+    def retrieve_many(self, resource_ids, headers=None, params=None,
+                      concurrency=DEFAULT_CONCURRENCY):
+        """
+        Retrieves the given resources.
+
+        :returns: A list with the resources, or the exception raised by
+        the request of a resource, in the order of `resource_ids`.
+        """
+        calls = ((self.format_endpoint(resource_id),
+                  {'headers': headers, 'params': params})
+                 for resource_id in resource_ids)
+        return self._request_many('get', calls, concurrency)
+
+    def delete_many(self, resource_ids, headers=None,
+                    concurrency=DEFAULT_CONCURRENCY):
+        """
+        Deletes the given resources.
+
+        :returns: A list with `None` for every deleted resource, or the
+        exception raised by its request, in the order of `resource_ids`.
+        """
+        calls = ((self.format_endpoint(resource_id), {'headers': headers})
+                 for resource_id in resource_ids)
+        return self._request_many('delete', calls, concurrency)
+
     def format_endpoint(self, resource_id):
         """
         This method concatenates the resource's endpoint with a specified
@@ -248,14 +523,13 @@ class ApimasClient(object):
         """
         subdocs = get_subdocuments(data)
         validated = {}
-        schema = deepcopy(schema)
         for k, v in subdocs.iteritems():
             path = k.split('/')
             cerberus_path = []
             for u in path:
                 cerberus_path.extend([u, 'schema'])
             subdata = doc.doc_pop(data, path)
-            subschema = doc.doc_pop(schema, cerberus_path[:-1]) or {}
+            subschema = doc.doc_get(schema, cerberus_path[:-1]) or {}
             subschema = subschema.get('schema', {}).get('schema', {})
             if not subschema:
                 raise ValidationError(
@@ -282,11 +556,7 @@ class ApimasClient(object):
         cerberus_paths = to_cerberus_paths(data)
         validated_subdocs = self._validate_subdata(
             data, schema, raise_exception)
-        partial_schema_paths = {
-            path: doc.doc_get(schema, path.split('/'))
-            for path in cerberus_paths}
-        partial_schema = doc.doc_from_ns(partial_schema_paths)
-        validator = ApimasValidator(partial_schema)
+        validator = self.get_partial_validator(schema, cerberus_paths)
         is_valid = validator.validate(data)
         if raise_exception and not is_valid:
             raise ValidationError(validator.errors)
@@ -294,6 +564,30 @@ class ApimasClient(object):
             doc.doc_set(validator.document, k, v)
         return validator.document
 
+    def get_partial_validator(self, schema, cerberus_paths):
+        """
+        Gets a cerberus validator of the part of a schema which consists of
+        the given paths.
+
+        Validators are created once per schema and set of paths, so that
+        requests which include the same fields, e.g. PATCH requests of a
+        sync job, or the elements of a list, reuse the same validator.
+        """
+        cache = self.get_validator_cache()
+        key = (id(schema), frozenset(cerberus_paths))
+        cached = cache.get(key)
+        # The schema is kept along with its validator, so that its id is not
+        # reused by another schema.
+        if cached is not None and cached[0] is schema:
+            return cached[1]
+        partial_schema_paths = {
+            path: doc.doc_get(schema, path.split('/'))
+            for path in cerberus_paths}
+        partial_schema = doc.doc_from_ns(partial_schema_paths)
+        validator = ApimasValidator(partial_schema)
+        cache[key] = (schema, validator)
+        return validator
+
     def validate(self, data, raise_exception=True):
         """
         Validates data that are going to be sent using a cerberus validation
@@ -302,10 +596,21 @@ class ApimasClient(object):
         :param raise_exception: True if an exception should be raised when
         validation fails.
         """
-        is_valid = self.api_validator.validate(data)
+        validator = self.get_validator()
+        is_valid = validator.validate(data)
         if raise_exception and not is_valid:
-            raise ValidationError(self.api_validator.errors)
-        return self.api_validator.document
+            raise ValidationError(validator.errors)
+        return validator.document
+
+    def get_validator(self):
+        """
+        Gets the cerberus validator of the validation schema of the client.
+        """
+        return self.api_validator
+
+    def get_validator_cache(self):
+        """ Gets the cache of the partial validators of the client. """
+        return self._partial_validators
 
     def extract_files(self, data):
         """
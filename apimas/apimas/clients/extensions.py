@@ -1,10 +1,94 @@
-import random
 import re
 from datetime import datetime, date
 from cerberus import Validator
 from requests.compat import urljoin
 
 
+EMAIL_REGEX = re.compile(r"(^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\."
+                         r"[a-zA-Z0-9-.]+$)")
+
+# Regular expressions of the numeric directives of date formats; these are
+# the expressions of `_strptime`, so that the same strings are matched.
+_DATE_DIRECTIVES = {
+    'Y': r'(?P<year>\d\d\d\d)',
+    'm': r'(?P<month>1[0-2]|0[1-9]|[1-9])',
+    'd': r'(?P<day>3[0-1]|[1-2]\d|0[1-9]|[1-9]| [1-9])',
+    'H': r'(?P<hour>2[0-3]|[0-1]\d|\d)',
+    'M': r'(?P<minute>[0-5]\d|\d)',
+    'S': r'(?P<second>6[0-1]|[0-5]\d|\d)',
+}
+
+
+def _compile_date_format(string_format):
+    """
+    Compiles a date format into a regular expression which matches the
+    same strings as `strptime()`.
+
+    :returns: The compiled expression, or `None` if the format includes
+    directives other than `%Y`, `%m`, `%d`, `%H`, `%M` and `%S`.
+    """
+    parts = []
+    i = 0
+    while i < len(string_format):
+        char = string_format[i]
+        if char == '%':
+            directive = _DATE_DIRECTIVES.get(string_format[i + 1:i + 2])
+            if directive is None:
+                return None
+            parts.append(directive)
+            i += 2
+            continue
+        if char.isspace():
+            # As in `strptime()`, any whitespace matches any whitespace.
+            parts.append(r'\s+')
+            while i < len(string_format) and string_format[i].isspace():
+                i += 1
+            continue
+        parts.append(re.escape(char))
+        i += 1
+    try:
+        return re.compile(''.join(parts), re.IGNORECASE)
+    except re.error:
+        # e.g. a directive used twice.
+        return None
+
+
+_date_parsers = {}
+
+
+def get_date_parser(string_format):
+    """
+    Gets a function which parses strings of the given format to `datetime`
+    objects, like `datetime.strptime()`.
+
+    Formats which consist of numeric directives are parsed with a compiled
+    regular expression, which is much faster than `strptime()`; any other
+    format falls back to `strptime()`. Parsers are created once per format.
+    """
+    parser = _date_parsers.get(string_format)
+    if parser is not None:
+        return parser
+    regex = _compile_date_format(string_format)
+    if regex is None:
+        def parser(value):
+            return datetime.strptime(value, string_format)
+    else:
+        def parser(value):
+            # Like `strptime()`, the first match must consume the whole
+            # string, i.e. no backtracking to find a longer one.
+            match = regex.match(value)
+            if match is None or match.end() != len(value):
+                raise ValueError('{!r} does not match format {!r}'.format(
+                    value, string_format))
+            fields = match.groupdict()
+            return datetime(
+                int(fields.get('year', 1900)), int(fields.get('month', 1)),
+                int(fields.get('day', 1)), int(fields.get('hour', 0)),
+                int(fields.get('minute', 0)), int(fields.get('second', 0)))
+    _date_parsers[string_format] = parser
+    return parser
+
+
 class RefNormalizer(object):
     """
     Normalizer of a value that implies an id of a referenced collection.
@@ -26,12 +110,20 @@ class DateTimeNormalizer(object):
     Normalize a datetime object to a string value based on the given format.
 
     If value is string, then it is checked if it follows the given format.
+    The format which a string matched is tried first for the next string,
+    as values typically share the same format.
+
+    Date objects are formatted with `date_format`, which is the first of the
+    string formats, if it is not given.
     """
     DEFAULT_FORMAT = '%Y-%m-%dT%H:%M:%S'
 
     def __init__(self, string_formats=None, date_format=None):
         self.string_formats = string_formats or [self.DEFAULT_FORMAT]
-        self.date_format = date_format or random.choice(self.string_formats)
+        self.date_format = date_format or self.string_formats[0]
+        self._parsers = [get_date_parser(string_format)
+                         for string_format in self.string_formats]
+        self._last_parser = self._parsers[0]
 
     def __call__(self, value):
         if isinstance(value, date) and not isinstance(value, datetime):
@@ -40,15 +132,25 @@ class DateTimeNormalizer(object):
         elif isinstance(value, datetime):
             return value.strftime(self.date_format)
         elif isinstance(value, str):
+            # The string is only validated; it is sent as given, so that
+            # its format (which may not be `date_format`) is kept.
             self._to_date(value)
         return value
 
     def _to_date(self, value):
-        for string_format in self.string_formats:
+        try:
+            return self._last_parser(value)
+        except ValueError:
+            pass
+        for parser in self._parsers:
+            if parser is self._last_parser:
+                continue
             try:
-                return datetime.strptime(value, string_format)
+                date_value = parser(value)
             except ValueError:
-                pass
+                continue
+            self._last_parser = parser
+            return date_value
         raise ValueError('Given date formats are invalid')
 
 
@@ -69,7 +171,4 @@ class ApimasValidator(Validator):
     def _validate_type_email(self, value):
         if not isinstance(value, (str, unicode)):
             return False
-
-        regex = re.compile(r"(^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\."
-                           r"[a-zA-Z0-9-.]+$)")
-        return bool(regex.match(value))
+        return EMAIL_REGEX.match(value) is not None
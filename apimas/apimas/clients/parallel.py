@@ -0,0 +1,101 @@
+import threading
+from apimas.clients.clients import (
+    ApimasClient, DEFAULT_CONCURRENCY, run_concurrently)
+from apimas.clients.extensions import ApimasValidator
+
+
+class ParallelApimasClient(ApimasClient):
+    """
+    A client which, in addition to the actions of `ApimasClient`, performs
+    batches of requests concurrently, e.g.
+
+        >>> client.gather_create(records, concurrency=20)
+
+    Requests of a batch are made by a pool of threads which share the
+    session of the client; its pool size should be at least the
+    concurrency of batches, otherwise connections are not reused.
+    """
+    def __init__(self, endpoint, schema, session=None, bulk_actions=(),
+                 concurrency=DEFAULT_CONCURRENCY):
+        super(ParallelApimasClient, self).__init__(
+            endpoint, schema, session=session, bulk_actions=bulk_actions)
+        self.concurrency = concurrency
+        self._local = threading.local()
+
+    def get_validator(self):
+        # Validators keep the state of the last validation, so every thread
+        # uses its own.
+        validator = getattr(self._local, 'validator', None)
+        if validator is None:
+            validator = ApimasValidator(self.validation_schema)
+            self._local.validator = validator
+        return validator
+
+    def get_validator_cache(self):
+        cache = getattr(self._local, 'partial_validators', None)
+        if cache is None:
+            cache = self._local.partial_validators = {}
+        return cache
+
+    def gather(self, method, calls, concurrency=None,
+               return_exceptions=False):
+        """
+        Calls a method of the client concurrently for every set of
+        arguments.
+
+        :param method: Name of the method, e.g. `create`.
+        :param calls: Iterable of `(args, kwargs)` tuples of every call.
+        :param concurrency: (optional) Maximum number of concurrent calls;
+        it defaults to the concurrency of the client.
+        :param return_exceptions: If True, exceptions raised by calls are
+        returned in place of their results. Otherwise, the exception of the
+        first failed call is raised, after all calls are finished.
+
+        :returns: A list with the results of the calls, in order.
+        """
+        outcomes = run_concurrently(getattr(self, method), calls,
+                                    concurrency or self.concurrency)
+        results = []
+        for succeeded, result in outcomes:
+            if not succeeded:
+                if not return_exceptions:
+                    raise result[0], result[1], result[2]
+                result = result[1]
+            results.append(result)
+        return results
+
+    def gather_create(self, records, concurrency=None,
+                      return_exceptions=False, **kwargs):
+        """
+        Creates a resource for every record concurrently.
+
+        Extra keyword arguments (e.g. `headers`) are passed to every
+        `create()` call.
+        """
+        calls = (((), dict(kwargs, data=record)) for record in records)
+        return self.gather('create', calls, concurrency, return_exceptions)
+
+    def gather_update(self, records, concurrency=None,
+                      return_exceptions=False, partial=False, **kwargs):
+        """
+        Updates resources concurrently.
+
+        :param records: Iterable of `(resource_id, data)` tuples.
+        :param partial: True for partial updates.
+        """
+        method = 'partial_update' if partial else 'update'
+        calls = (((resource_id,), dict(kwargs, data=data))
+                 for resource_id, data in records)
+        return self.gather(method, calls, concurrency, return_exceptions)
+
+    def gather_retrieve(self, resource_ids, concurrency=None,
+                        return_exceptions=False, **kwargs):
+        """ Retrieves the given resources concurrently. """
+        calls = (((resource_id,), kwargs) for resource_id in resource_ids)
+        return self.gather('retrieve', calls, concurrency, return_exceptions)
+
+    def gather_delete(self, resource_ids, concurrency=None,
+                      return_exceptions=False, **kwargs):
+        """ Deletes the given resources concurrently. """
+        calls = (((resource_id,), kwargs) for resource_id in resource_ids)
+        return self.gather('delete', calls, concurrency, return_exceptions)
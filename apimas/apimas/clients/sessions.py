@@ -0,0 +1,83 @@
+import requests
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.util.retry import Retry
+
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_RETRY_STATUSES = (502, 503, 504)
+
+
+class ApimasSession(requests.Session):
+    """
+    A `requests.Session` which applies a default timeout to every request
+    that does not specify one.
+    """
+    def __init__(self, timeout=None):
+        super(ApimasSession, self).__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super(ApimasSession, self).request(method, url, **kwargs)
+
+
+def create_adapter(pool_size=DEFAULT_POOL_SIZE, max_retries=0,
+                   backoff_factor=0, retry_statuses=DEFAULT_RETRY_STATUSES):
+    """
+    Creates a transport adapter which keeps its connections alive, so that
+    they are reused by subsequent requests to the same host.
+
+    :param pool_size: Maximum number of connections kept per host.
+    :param max_retries: Number of retries of failed idempotent requests
+    (connection errors and `retry_statuses`).
+    :param backoff_factor: Factor of the exponential delay between retries,
+    i.e. retries sleep for `backoff_factor * 2 ^ (retry - 1)` seconds.
+    :param retry_statuses: Status codes of responses which are retried.
+    """
+    retry = Retry(total=max_retries, backoff_factor=backoff_factor,
+                  status_forcelist=retry_statuses, raise_on_status=False)
+    return HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                       max_retries=retry)
+
+
+def create_session(timeout=None, adapter=None, **conf):
+    """
+    Creates a session which keeps its connections alive, so that they are
+    reused by subsequent requests to the same host.
+
+    :param timeout: Default timeout of requests in seconds; it is either a
+    number or a `(connect, read)` tuple.
+    :param adapter: (optional) Transport adapter of the session, e.g. one
+    shared with other sessions. By default, a new one is created with the
+    rest of the options (see `create_adapter()`).
+    """
+    session = ApimasSession(timeout=timeout)
+    if adapter is None:
+        adapter = create_adapter(**conf)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+_adapters = {}
+
+
+def get_session(root_url, **conf):
+    """
+    Creates a session for the requests to the given root URL.
+
+    Every call returns a new session, i.e. with its own cookies and
+    headers, so that the state of one client (e.g. a login) never leaks to
+    another. Transport adapters are created once per root URL and
+    configuration (see `create_adapter()`), so that all sessions of an API
+    share the same connection pool.
+    """
+    timeout = conf.pop('timeout', None)
+    key = (root_url, tuple(sorted(
+        (k, tuple(v) if isinstance(v, list) else v)
+        for k, v in conf.iteritems())))
+    adapter = _adapters.get(key)
+    if adapter is None:
+        adapter = _adapters.setdefault(key, create_adapter(**conf))
+    return create_session(timeout=timeout, adapter=adapter)
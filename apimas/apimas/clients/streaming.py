@@ -0,0 +1,117 @@
+"""
+Incremental parsing of JSON lists, so that large responses are processed
+item by item, without holding the whole body in memory.
+"""
+import codecs
+import json
+import re
+
+
+ITEM = 'item'
+META = 'meta'
+
+_WHITESPACE = re.compile(r'\s*')
+_NUMBER_CHARS = frozenset('0123456789+-.eE')
+
+_decoder = json.JSONDecoder()
+
+
+class _Buffer(object):
+    """ A buffer of text which is filled from chunks on demand. """
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.text = u''
+        self.pos = 0
+        # Multi-byte characters may be split among chunks.
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+
+    def fill(self):
+        """ Appends the next chunk; returns False if there is none. """
+        for chunk in self.chunks:
+            if not chunk:
+                continue
+            if isinstance(chunk, bytes):
+                chunk = self._decoder.decode(chunk)
+            # Drop consumed text, so that memory stays flat.
+            self.text = self.text[self.pos:] + chunk
+            self.pos = 0
+            return True
+        return False
+
+    def peek(self):
+        """ Gets the next non-whitespace character or `None` at the end. """
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return None
+
+    def expect(self, chars):
+        char = self.peek()
+        if char is None or char not in chars:
+            raise ValueError('Expected one of {!r} at position {}, got {!r}'
+                             .format(chars, self.pos, char))
+        self.pos += 1
+        return char
+
+    def decode(self):
+        """ Decodes the next JSON value. """
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+            except ValueError:
+                value, end = None, None
+            # A number may continue in the next chunk.
+            if end is not None and (self.text[self.pos] in '"{[ntf' or (
+                    end < len(self.text) and
+                    self.text[end] not in _NUMBER_CHARS)):
+                self.pos = end
+                return value
+            if not self.fill():
+                if end is None:
+                    raise ValueError('Truncated JSON document')
+                self.pos = end
+                return value
+
+
+def _iter_array(buf):
+    buf.expect('[')
+    if buf.peek() == ']':
+        buf.pos += 1
+        return
+    while True:
+        yield buf.decode()
+        if buf.expect(',]') == ']':
+            return
+
+
+def iter_json_items(chunks, items_key='results'):
+    """
+    Parses a JSON document incrementally from the given chunks of text.
+
+    The document is either a list, or an object whose `items_key` member
+    is a list (e.g. a paginated response). It yields `(ITEM, item)` for
+    every element of the list and `(META, (key, value))` for every other
+    member of the object, as soon as they are parsed.
+    """
+    buf = _Buffer(chunks)
+    char = buf.peek()
+    if char == '[':
+        for item in _iter_array(buf):
+            yield ITEM, item
+        return
+    buf.expect('{')
+    if buf.peek() == '}':
+        return
+    while True:
+        key = buf.decode()
+        buf.expect(':')
+        if key == items_key and buf.peek() == '[':
+            for item in _iter_array(buf):
+                yield ITEM, item
+        else:
+            yield META, (key, buf.decode())
+        if buf.expect(',}') == '}':
+            return
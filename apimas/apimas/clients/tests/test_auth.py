@@ -28,5 +28,10 @@ class TestAuth(unittest.TestCase):
         auth(mock_request)
         self.assertEqual(mock_auth.call_count, 1)
 
+        # Backend is created once.
+        auth(mock_request)
+        self.assertEqual(mock_auth.call_count, 1)
+        self.assertEqual(mock_auth.return_value.call_count, 2)
+
         auth.auth_type = 'invalid'
         self.assertRaises(ValidationError, auth, mock_request)
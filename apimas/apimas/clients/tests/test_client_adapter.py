@@ -33,6 +33,8 @@ class TestClientAdapter(unittest.TestCase):
         mock_client.clients = {}
         mock_client.__class__.__bases__ = (NaiveAdapter,)
         mock_client.root_url = 'http://example.com'
+        mock_client.session_conf = {'timeout': 10}
+        mock_client.client_class = ApimasClient
         mock_instance = {
             '*': {
                 'field1': {
@@ -62,11 +64,31 @@ class TestClientAdapter(unittest.TestCase):
         client = mock_client.clients.get('api/foo')
         self.assertTrue(isinstance(client, ApimasClient))
         self.assertEqual(client.endpoint, 'http://example.com/api/foo/')
+        self.assertEqual(client.session.timeout, 10)
 
         self.assertTrue(isinstance(client.api_validator, mock.Mock))
         mock_validator.assert_called_once_with({'field1': {'foo': 'bar'},
                                                 'field2': {'bar': 'foo'}})
 
+    def test_session(self):
+        spec = {
+            'api': {
+                '.endpoint': {},
+                'foo': {'.collection': {}, '*': {'id': {'.serial': {}}}},
+                'bar': {'.collection': {}, '*': {'id': {'.serial': {}}}},
+            },
+        }
+        adapter = ApimasClientAdapter('http://example.com',
+                                      session_conf={'timeout': 10})
+        adapter.construct(spec)
+        foo = adapter.get_client('api', 'foo').session
+        bar = adapter.get_client('api', 'bar').session
+        # Clients have their own sessions over a shared connection pool.
+        self.assertIsNot(foo, bar)
+        self.assertEqual(foo.timeout, 10)
+        self.assertIs(foo.get_adapter('http://example.com/'),
+                      bar.get_adapter('http://example.com/'))
+
     def test_construct_field(self):
         mock_instance = {'foo': {'bar': {}}, self.adapter_conf: {}}
         mock_loc = ('foo', 'bar')
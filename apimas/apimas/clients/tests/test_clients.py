@@ -1,12 +1,14 @@
 # -*- coding: utf-8 -*-
 
 import unittest
+from copy import deepcopy
 import mock
 from requests.exceptions import HTTPError
 from apimas.clients import (
-    ApimasClient, requests, get_subdocuments, to_cerberus_paths, RequestError)
+    ApimasClient, get_subdocuments, to_cerberus_paths, RequestError)
 from apimas.errors import ValidationError
 from apimas.testing.helpers import create_mock_object
+from apimas.testing.server import LocalServer
 
 
 class TestClients(unittest.TestCase):
@@ -27,7 +29,8 @@ class TestClients(unittest.TestCase):
         mock_response_ex.raise_for_status.side_effect = HTTPError()
         mock_response = mock.MagicMock()
         for action, methods in actions.iteritems():
-            with mock.patch.object(requests, action) as mock_action:
+            with mock.patch.object(self.client.session, action) as\
+                    mock_action:
                 for m, args in methods:
                     mock_action.return_value = mock_response_ex
                     self.assertRaises(RequestError, m, args)
@@ -70,6 +73,33 @@ class TestClients(unittest.TestCase):
         self.assertRaises(ValidationError, self.client.partial_validate,
                           raise_exception=True, data=data)
 
+    def test_partial_validators_cache(self):
+        item_schema = {'field2': {'type': 'integer', 'required': True}}
+        validation_schema = {
+            'field1': {'type': 'string'},
+            'field2': {
+                'type': 'list',
+                'schema': {'type': 'dict', 'schema': item_schema},
+            },
+        }
+        original = deepcopy(validation_schema)
+        client = ApimasClient('http://endpoint/', validation_schema)
+        validator = client.get_partial_validator(
+            validation_schema, ['field1'])
+        self.assertIs(client.get_partial_validator(
+            validation_schema, ['field1']), validator)
+        self.assertIsNot(client.get_partial_validator(
+            validation_schema, ['field1', 'field2']), validator)
+
+        data = {'field1': 'foo', 'field2': [{'field2': i} for i in xrange(5)]}
+        validated = client.partial_validate(data)
+        self.assertEqual([d['field2'] for d in validated['field2']],
+                         range(5))
+        # All elements of the list are validated by the same validator.
+        self.assertEqual(len([key for key in client.get_validator_cache()
+                              if key[0] == id(item_schema)]), 1)
+        self.assertEqual(validation_schema, original)
+
     def test_partial_validate_sub(self):
         mock_client = create_mock_object(
             ApimasClient, ['_validate_subdata'])
@@ -175,3 +205,52 @@ class TestClients(unittest.TestCase):
     def test_unicode(self):
         endpoint = self.client.format_endpoint(u"ύνικοδε")
         self.assertIsInstance(endpoint, str)
+
+
+class TestBatches(unittest.TestCase):
+    def setUp(self):
+        schema = {
+            'name': {'type': 'string', 'required': True},
+            'number': {'type': 'integer'},
+        }
+        self.client = ApimasClient('http://batches.test/api/foo/', schema)
+        self.server = LocalServer('http://batches.test', ['api/foo'])
+        self.server.mount(self.client.session)
+
+    def test_many(self):
+        records = [{'name': str(i), 'number': i} for i in xrange(20)]
+        created = self.client.create_many(records, concurrency=4)
+        self.assertEqual([r['number'] for r in created], range(20))
+        self.assertEqual(len(self.server.requests), 20)
+
+        ids = [r['id'] for r in created]
+        updated = self.client.update_many(
+            [(i, {'number': 0}) for i in ids], partial=True)
+        self.assertEqual([r['number'] for r in updated], [0] * 20)
+        self.assertEqual([r['name'] for r in updated],
+                         [r['name'] for r in created])
+
+        retrieved = self.client.retrieve_many(ids + ['missing'])
+        self.assertEqual([r['id'] for r in retrieved[:-1]], ids)
+        self.assertIsInstance(retrieved[-1], RequestError)
+        self.assertEqual(retrieved[-1].response.status_code, 404)
+
+        self.assertEqual(self.client.delete_many(ids), [None] * 20)
+        self.assertEqual(self.server.collections['api/foo'], {})
+
+    def test_validation(self):
+        records = [{'name': 'foo'}, {'number': 1}, {'name': 1}]
+        with self.assertRaises(ValidationError) as context:
+            self.client.create_many(records)
+        self.assertEqual(sorted(context.exception.message.keys()), [1, 2])
+        # Nothing is sent if any record is invalid.
+        self.assertEqual(self.server.requests, [])
+
+    def test_bulk(self):
+        self.client.bulk_actions = frozenset(['create'])
+        records = [{'name': str(i)} for i in xrange(5)]
+        created = self.client.create_many(records)
+        self.assertEqual([r['name'] for r in created],
+                         [r['name'] for r in records])
+        self.assertEqual(self.server.requests,
+                         [('POST', 'http://batches.test/api/foo/')])
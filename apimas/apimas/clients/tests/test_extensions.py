@@ -33,6 +33,39 @@ class TestExtensions(unittest.TestCase):
 
         self.assertRaises(ValueError, normalizer, 'invalid str')
 
+        # Dates are formatted with the first format by default.
+        normalizer = ext.DateTimeNormalizer(
+            string_formats=['%Y-%m-%d %H:%M', '%Y-%m'])
+        self.assertEqual(normalizer(now), now_str)
+
+    def test_date_parser(self):
+        formats = ['%Y-%m-%d', '%Y-%m-%dT%H:%M:%S', '%d/%m/%Y %H:%M',
+                   '%Y-%m-%d %Z', '%Y%m%d', '%d/%m/%Y', '%H%M%S']
+        values = ['2017-01-05', '2017-1-5', '2017-13-01', '2017-02-30',
+                  '2017-01-05T10:11:12', '2017-01-05t10:11:12',
+                  '05/01/2017  10:11', '2017-01-05 UTC', '2017-01-05x',
+                  'invalid str', '2017131', '20171231', '2017123',
+                  ' 1/02/2017', '1/2/2017', '01/02/2017 ', '123',
+                  '235960', '99', '2017-01-05T24:00:00']
+        # Parsers behave like `strptime()`.
+        for string_format in formats:
+            parser = ext.get_date_parser(string_format)
+            self.assertIs(ext.get_date_parser(string_format), parser)
+            for value in values:
+                try:
+                    expected = datetime.datetime.strptime(
+                        value, string_format)
+                except ValueError:
+                    self.assertRaises(ValueError, parser, value)
+                else:
+                    self.assertEqual(parser(value), expected)
+
+        normalizer = ext.DateNormalizer(string_formats=['%Y-%m', '%Y-%m-%d'])
+        self.assertEqual(normalizer('2017-01-05'), '2017-01-05')
+        self.assertIs(normalizer._last_parser, normalizer._parsers[1])
+        self.assertEqual(normalizer('2017-01'), '2017-01')
+        self.assertIs(normalizer._last_parser, normalizer._parsers[0])
+
 
 class TestApimasValidator(unittest.TestCase):
     def setUp(self):
@@ -0,0 +1,79 @@
+import unittest
+from apimas.errors import ValidationError
+from apimas.clients import RequestError
+from apimas.clients.adapter import ApimasClientAdapter
+from apimas.clients.parallel import ParallelApimasClient
+from apimas.testing.server import LocalServer
+
+
+ROOT_URL = 'http://parallel.test'
+
+SPEC = {
+    'api': {
+        '.endpoint': {},
+        'foo': {
+            '.collection': {},
+            '*': {
+                'name': {
+                    '.field': {},
+                    '.string': {},
+                    '.required': {},
+                },
+                'number': {
+                    '.field': {},
+                    '.integer': {},
+                },
+            },
+            '.actions=': {
+                '.list': {},
+                '.create': {},
+            },
+        },
+    },
+}
+
+
+class TestParallelClient(unittest.TestCase):
+    def setUp(self):
+        adapter = ApimasClientAdapter(
+            ROOT_URL, session_conf={'pool_size': 4},
+            client_class=ParallelApimasClient)
+        adapter.construct(SPEC)
+        self.client = adapter.get_client('api', 'foo')
+        self.server = LocalServer(ROOT_URL, ['api/foo'])
+        self.server.mount(self.client.session)
+
+    def test_gather_create(self):
+        self.assertIsInstance(self.client, ParallelApimasClient)
+        records = [{'name': str(i), 'number': i} for i in xrange(50)]
+        responses = self.client.gather_create(records, concurrency=4)
+        self.assertEqual([r.status_code for r in responses], [201] * 50)
+        self.assertEqual(
+            [r.json()['number'] for r in responses], range(50))
+        self.assertEqual(len(self.server.collections['api/foo']), 50)
+        self.assertEqual(len(self.client.list().json()), 50)
+
+        ids = [r.json()['id'] for r in responses]
+        responses = self.client.gather_update(
+            [(i, {'name': 'updated'}) for i in ids[:10]], partial=True)
+        self.assertEqual([r.json()['name'] for r in responses],
+                         ['updated'] * 10)
+        responses = self.client.gather_retrieve(ids[:10])
+        self.assertEqual([r.json()['id'] for r in responses], ids[:10])
+        self.client.gather_delete(ids)
+        self.assertEqual(self.server.collections['api/foo'], {})
+
+    def test_gather_errors(self):
+        records = [{'name': 'foo'}, {'number': 1}, {'name': 'bar'}]
+        self.assertRaises(ValidationError, self.client.gather_create,
+                          records)
+        results = self.client.gather_create(records, return_exceptions=True)
+        self.assertEqual(results[0].status_code, 201)
+        self.assertIsInstance(results[1], ValidationError)
+        self.assertEqual(results[2].status_code, 201)
+
+        results = self.client.gather_retrieve(
+            [results[0].json()['id'], 'missing'], return_exceptions=True)
+        self.assertEqual(results[0].status_code, 200)
+        self.assertIsInstance(results[1], RequestError)
+        self.assertEqual(results[1].response.status_code, 404)
@@ -0,0 +1,56 @@
+import unittest
+import mock
+from requests import Session
+from apimas.clients.sessions import ApimasSession, create_session, get_session
+
+
+class TestSessions(unittest.TestCase):
+    def test_create_session(self):
+        session = create_session(pool_size=4, max_retries=3,
+                                 backoff_factor=0.5, timeout=10)
+        self.assertEqual(session.timeout, 10)
+        adapter = session.get_adapter('http://example.com/api/')
+        self.assertIs(adapter, session.get_adapter('https://example.com/'))
+        self.assertEqual(adapter._pool_maxsize, 4)
+        self.assertEqual(adapter.max_retries.total, 3)
+        self.assertEqual(adapter.max_retries.backoff_factor, 0.5)
+        self.assertEqual(adapter.max_retries.status_forcelist,
+                         (502, 503, 504))
+        self.assertIs(create_session(adapter=adapter).get_adapter(
+            'http://example.com/'), adapter)
+
+    def test_get_session(self):
+        def get_adapter(session):
+            return session.get_adapter('http://example.com/')
+        session = get_session('http://example.com')
+        other = get_session('http://example.com')
+        # Sessions share their connection pool, but not their cookies.
+        self.assertIsNot(session, other)
+        self.assertIs(get_adapter(session), get_adapter(other))
+        session.cookies.set('sessionid', 'secret')
+        self.assertEqual(len(other.cookies), 0)
+
+        self.assertIsNot(get_adapter(session),
+                         get_adapter(get_session('http://example.org')))
+        other = get_session('http://example.com', timeout=5)
+        self.assertEqual(other.timeout, 5)
+        self.assertIs(get_adapter(session), get_adapter(other))
+        self.assertIsNot(
+            get_adapter(session),
+            get_adapter(get_session('http://example.com', pool_size=2)))
+        self.assertIs(
+            get_adapter(get_session('http://example.com',
+                                    retry_statuses=[503])),
+            get_adapter(get_session('http://example.com',
+                                    retry_statuses=[503])))
+
+    @mock.patch.object(Session, 'request')
+    def test_timeout(self, mock_request):
+        session = ApimasSession(timeout=10)
+        session.get('http://example.com')
+        mock_request.assert_called_once_with(
+            'GET', 'http://example.com', allow_redirects=True, timeout=10)
+        mock_request.reset_mock()
+        session.get('http://example.com', timeout=1)
+        mock_request.assert_called_once_with(
+            'GET', 'http://example.com', allow_redirects=True, timeout=1)
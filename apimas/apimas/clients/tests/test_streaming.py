@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+import json
+import unittest
+from apimas.clients import ApimasClient, RequestError
+from apimas.clients.streaming import ITEM, META, iter_json_items
+from apimas.testing.server import LocalServer
+
+
+def split(text, size):
+    return [text[i:i + size] for i in xrange(0, len(text), size)]
+
+
+class TestIterJsonItems(unittest.TestCase):
+    def test_object(self):
+        document = {
+            'count': 5,
+            'next': 'http://streaming.test/?page=2',
+            'previous': None,
+            'results': [{'name': u'αβγ', 'tags': ['a', 'b']},
+                        12345, 1.5e3, [1, {'foo': None}], True],
+        }
+        body = json.dumps(document, indent=2).encode('utf-8')
+        # Chunks split tokens, numbers and multi-byte characters.
+        for size in (1, 2, 3, 7, len(body)):
+            parsed = list(iter_json_items(split(body, size)))
+            self.assertEqual(
+                [value for kind, value in parsed if kind == ITEM],
+                document['results'])
+            self.assertEqual(
+                dict(value for kind, value in parsed if kind == META),
+                {'count': 5, 'next': document['next'], 'previous': None})
+
+    def test_list(self):
+        body = json.dumps([1, 22, 333, {'foo': 'bar'}])
+        for size in (1, 2, 5):
+            self.assertEqual(
+                [value for _, value in iter_json_items(split(body, size))],
+                [1, 22, 333, {'foo': 'bar'}])
+        self.assertEqual(list(iter_json_items(['[ ]'])), [])
+        self.assertEqual(list(iter_json_items(['{}'])), [])
+
+    def test_invalid(self):
+        for body in ('[1, 2', '{"results": [1}', '"foo"'):
+            self.assertRaises(ValueError, list,
+                              iter_json_items(split(body, 2)))
+
+
+class TestIterList(unittest.TestCase):
+    def setUp(self):
+        self.client = ApimasClient('http://streaming.test/api/foo/',
+                                   {'number': {'type': 'integer'}})
+        self.server = LocalServer('http://streaming.test', ['api/foo'],
+                                  page_size=3)
+        self.server.mount(self.client.session)
+        self.client.create_many([{'number': i} for i in xrange(10)],
+                                concurrency=1)
+        del self.server.requests[:]
+
+    def test_iter_list(self):
+        for stream in (False, True):
+            for prefetch in (False, True):
+                resources = self.client.iter_list(
+                    stream=stream, prefetch=prefetch, chunk_size=8)
+                self.assertEqual([r['number'] for r in resources], range(10))
+        # Every iteration requests the 4 pages once.
+        self.assertEqual(len(self.server.requests), 16)
+
+    def test_unpaginated(self):
+        self.server.page_size = None
+        self.assertEqual(
+            [r['number'] for r in self.client.iter_list(stream=True)],
+            range(10))
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_stop_early(self):
+        resources = self.client.iter_list()
+        self.assertEqual(next(resources)['number'], 0)
+        resources.close()
+        # The second page has been prefetched.
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_error(self):
+        resources = self.client.iter_list(params={'page': 5})
+        self.assertRaises(RequestError, list, resources)
@@ -3,31 +3,86 @@ from os.path import abspath, dirname, join
 from click import types
 from apimas import config
 from apimas.errors import GenericInputError
-from apimas.cli.adapter import ApimasCliAdapter
-from apimas.clients.adapter import ApimasClientAdapter
+from apimas.cli import cache
 
 
-def _construct_cli(root_url, spec):
-    client_gen = ApimasClientAdapter(root_url)
-    client_gen.construct(spec)
-    cli = ApimasCliAdapter(client_gen.get_clients())
-    cli.construct(spec)
+def _configure(path):
+    try:
+        return config.configure(path=path)
+    except GenericInputError as e:
+        raise click.BadOptionUsage(str(e))
+
+
+def _construct_clients(conf):
+    # Adapters are imported on demand, as they are not needed when commands
+    # are built from the cache.
+    from apimas.clients.adapter import ApimasClientAdapter
+    client_gen = ApimasClientAdapter(
+        conf['root'], session_conf=conf.get('session'))
+    client_gen.construct(conf['spec'])
+    return client_gen.get_clients()
+
+
+def _construct_cli(conf):
+    from apimas.cli.adapter import ApimasCliAdapter
+    cli = ApimasCliAdapter(_construct_clients(conf))
+    cli.construct(conf['spec'])
     return cli
 
 
+_clients = {}
+
+
+def _get_client(path, collection):
+    clients = _clients.get(path)
+    if clients is None:
+        clients = _clients[path] = _construct_clients(_configure(path))
+    return clients.get(collection)
+
+
+_commands = {}
+
+
+def get_commands(config_file):
+    """
+    Gets the base command and the groups of commands of every endpoint
+    defined in the given configuration file.
+
+    Commands are constructed once per process. Their layout is also cached
+    on disk (see `apimas.cli.cache`), so that subsequent invocations do not
+    load the configuration file, unless a command is actually executed.
+    """
+    path = config.get_path(config_file)
+    try:
+        key = cache.get_cache_key(path)
+    except (IOError, OSError):
+        # Configuration reports the error.
+        key = None
+    commands = _commands.get(key)
+    if commands is not None:
+        return commands
+    layout = cache.load_layout(key) if key else None
+    if layout is None:
+        cli = _construct_cli(_configure(path))
+        if key:
+            cache.store_layout(key, cache.get_layout(cli))
+        commands = (cli.get_base_command(), cli.endpoint_groups)
+    else:
+        groups = cache.build_commands(
+            layout, lambda collection: _get_client(path, collection))
+        commands = (click.Group(name='group', commands=groups), groups)
+    _commands[key] = commands
+    return commands
+
+
 class ApimasCLI(click.MultiCommand):
 
     def get_command(self, ctx, name):
-        config_file = ctx.params.get('config')
-        try:
-            conf = config.configure(path=config_file)
-        except GenericInputError as e:
-            raise click.BadOptionUsage(str(e))
-        root_url, spec = conf['root'], conf['spec']
-        cli = _construct_cli(root_url, spec)
+        base_command, endpoint_groups = get_commands(
+            ctx.params.get('config'))
         if name is None:
-            return cli.get_base_command()
-        return cli.endpoint_groups.get(name)
+            return base_command
+        return endpoint_groups.get(name)
 
 
 def print_version():
@@ -55,6 +55,11 @@ class BaseProcessor(object):
         """
         Saves a value to the context.
 
+        The value replaces any existing value of the key; it is never merged
+        into it, e.g. saving a dict to `foo/bar` does not keep the keys of a
+        dict already saved there. Other keys of the parent are kept, and
+        missing parents are created as dicts.
+
         Args:
             context: Context to which processor writes.
             key (str|tuple): Key where desired value is located, either
@@ -65,20 +70,20 @@ class BaseProcessor(object):
             raise InvalidInput(
                 'Cannot save to context. Context is `NoneType`')
         key = _normalize_keys(key)
-        attr = key[-1]
+        attr, key = key[-1], key[:-1]
         while True:
             inst = context if not key else self.extract(context, key)
             if isinstance(inst, dict):
-                inst.update(value)
+                inst[attr] = value
                 break
             else:
                 try:
                     setattr(inst, attr, value)
                     break
                 except AttributeError:
-                    attr = key[-1]
-                    value = {key[-1]: value}
-                    key = key[:-1]
+                    # Parent does not exist yet, so we create it.
+                    value = {attr: value}
+                    attr, key = key[-1], key[:-1]
 
     def read(self, context):
         """
@@ -1,12 +1,106 @@
+import hashlib
+import json
 from copy import deepcopy
 from collections import Iterable, Mapping
+from email.utils import mktime_tz, parsedate_tz
 from apimas import documents as doc
 from apimas import serializers as srs
 from apimas.components import BaseProcessor
-from apimas.errors import InvalidSpec
+from apimas.errors import InvalidSpec, ValidationError
 from apimas.decorators import last
 
 
+def _parse_field_names(value):
+    if not value:
+        return []
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+def get_projection(params, field_names, fields_param='fields',
+                   exclude_param='exclude'):
+    """
+    Gets the fields to which a response must be restricted, according to
+    the query parameters of a request.
+
+    Fields are given as a comma separated list of names, either via the
+    `fields` parameter (fields to be included) or the `exclude` parameter
+    (fields to be excluded).
+
+    Args:
+        params (dict): Query parameters of request.
+        field_names (frozenset): Names of the fields which can be projected.
+        fields_param (str): (optional) Name of the parameter of the included
+            fields.
+        exclude_param (str): (optional) Name of the parameter of the excluded
+            fields.
+
+    Returns:
+        frozenset: Names of the projected fields, or `None` if no projection
+            is requested.
+
+    Raises:
+        ValidationError: Both parameters are given or unknown fields are
+            requested.
+    """
+    fields = _parse_field_names(params.get(fields_param))
+    exclude = _parse_field_names(params.get(exclude_param))
+    if fields and exclude:
+        msg = 'Parameters {fields!r} and {exclude!r} are mutually exclusive'
+        raise ValidationError(msg.format(
+            fields=fields_param, exclude=exclude_param))
+    unknown = set(fields or exclude) - field_names
+    if unknown:
+        msg = 'Unknown fields requested: {fields!s}'
+        raise ValidationError(msg.format(fields=', '.join(sorted(unknown))))
+    if fields:
+        return frozenset(fields)
+    if exclude:
+        return field_names - frozenset(exclude)
+    return None
+
+
+class Projection(BaseProcessor):
+    """
+    Processor responsible for the projection of the fields of a response.
+
+    It is enabled if the `.collection` predicate of a collection specifies
+    `projection: true`. Then, clients may restrict the fields of the response
+    via the `fields` or `exclude` query parameters, e.g. `?fields=id,name`.
+
+    Requested fields are validated against node `*` of the collection and
+    they are written to the context, so that handlers fetch and serializers
+    represent only these fields. `None` is written if there is no
+    projection.
+    """
+    name = 'apimas.components.processors.Projection'
+
+    FIELDS_PARAM = 'fields'
+    EXCLUDE_PARAM = 'exclude'
+
+    READ_KEYS = {
+        'params': 'request/kwargs/params',
+    }
+
+    WRITE_KEYS = {
+        'fields': 'store/' + name + '/fields',
+    }
+
+    def __init__(self, spec):
+        super(Projection, self).__init__(spec)
+        self.enabled = bool(doc.doc_get(spec, ('.collection', 'projection')))
+        self.field_names = frozenset(
+            k for k in spec.get('*', {}) if not k.startswith('.'))
+
+    def process(self, collection, url, action, context):
+        fields = None
+        if self.enabled:
+            params = self.read(context)['params'] or {}
+            fields = get_projection(
+                params, self.field_names, fields_param=self.FIELDS_PARAM,
+                exclude_param=self.EXCLUDE_PARAM)
+        self.write({'fields': fields}, context)
+
+
 class BaseSerialization(BaseProcessor):
     """
     Base processor used for serialization purposes.
@@ -140,10 +234,18 @@ class BaseSerialization(BaseProcessor):
             construct_spec=True)
         return instance
 
-    def get_serializer(self, data):
+    def get_serializer(self, data, fields=None):
+        """
+        Gets the serializer of the given data.
+
+        If `fields` are given, the serializer is restricted to them.
+        """
+        schema = self.serializers
+        if fields is not None:
+            schema = {k: v for k, v in schema.iteritems() if k in fields}
         if isinstance(data, Iterable) and not isinstance(data, Mapping):
-            return srs.List(srs.Struct(self.serializers))
-        return srs.Struct(self.serializers)
+            return srs.List(srs.Struct(schema))
+        return srs.Struct(schema)
 
     def perform_serialization(self, context_data):
         raise NotImplementedError(
@@ -190,6 +292,7 @@ class Serialization(BaseSerialization):
 
     READ_KEYS = {
         'data': 'response/content',
+        'fields': Projection.WRITE_KEYS['fields'],
     }
     WRITE_KEYS = {
         'data': 'response/content',
@@ -199,5 +302,114 @@ class Serialization(BaseSerialization):
         data = context_data['data']
         if data is None:
             return None
-        serializer = self.get_serializer(data)
+        serializer = self.get_serializer(data, context_data.get('fields'))
         return {'data': serializer.serialize(data)}
+
+
+def get_header(headers, name):
+    """
+    Gets the value of a request header.
+
+    Headers may be given either by their name (e.g. `If-None-Match`) or by
+    their CGI name (e.g. `HTTP_IF_NONE_MATCH`).
+    """
+    if not headers:
+        return None
+    value = headers.get(name)
+    if value is None:
+        value = headers.get('HTTP_' + name.upper().replace('-', '_'))
+    return value
+
+
+def compute_etag(content):
+    """ Computes a strong ETag of the given serialized content. """
+    dumped = json.dumps(content, sort_keys=True, separators=(',', ':'),
+                        default=str)
+    return '"' + hashlib.sha1(dumped).hexdigest() + '"'
+
+
+def _parse_http_date(value):
+    parsed = parsedate_tz(value) if value else None
+    return None if parsed is None else mktime_tz(parsed)
+
+
+def is_not_modified(headers, etag, last_modified=None):
+    """
+    Checks whether the client already has the current representation of a
+    resource, according to the `If-None-Match` and `If-Modified-Since`
+    request headers.
+
+    As per RFC 7232, `If-Modified-Since` is ignored when `If-None-Match` is
+    given.
+
+    Args:
+        headers (dict): Headers of request.
+        etag (str): ETag of the current representation.
+        last_modified (str): (optional) HTTP date of the last modification
+            of the resource.
+    """
+    if_none_match = get_header(headers, 'If-None-Match')
+    if if_none_match is not None:
+        etags = [tag.strip() for tag in if_none_match.split(',')]
+        return '*' in etags or etag in etags or 'W/' + etag in etags
+    if_modified_since = _parse_http_date(
+        get_header(headers, 'If-Modified-Since'))
+    modified = _parse_http_date(last_modified)
+    if if_modified_since is None or modified is None:
+        return False
+    return modified <= if_modified_since
+
+
+class ConditionalResponse(BaseProcessor):
+    """
+    Processor responsible for conditional requests.
+
+    It is enabled if the `.collection` predicate of a collection specifies
+    `conditional`. It must follow the serialization of the response.
+
+    It sets the `ETag` header of successful responses and answers with
+    `304 Not Modified` and no content, if the `ETag` matches the
+    `If-None-Match` header of request (or the resource is not modified since
+    `If-Modified-Since`).
+
+    The `ETag` is computed from the serialized content, unless a previous
+    processor has computed a cheaper one, e.g. based on a version column,
+    and has written it to the context, along with `Last-Modified`.
+    """
+    name = 'apimas.components.processors.ConditionalResponse'
+
+    READ_KEYS = {
+        'request_headers': 'request/kwargs/headers',
+        'content': 'response/content',
+        'status_code': 'response/kwargs/status_code',
+        'headers': 'response/kwargs/headers',
+        'etag': 'store/' + name + '/etag',
+        'last_modified': 'store/' + name + '/last_modified',
+    }
+
+    WRITE_KEYS = {
+        'content': 'response/content',
+        'status_code': 'response/kwargs/status_code',
+        'headers': 'response/kwargs/headers',
+    }
+
+    def __init__(self, spec):
+        super(ConditionalResponse, self).__init__(spec)
+        self.enabled = bool(doc.doc_get(spec, ('.collection', 'conditional')))
+
+    def process(self, collection, url, action, context):
+        if not self.enabled:
+            return
+        context_data = self.read(context)
+        if context_data['status_code'] != 200:
+            return
+        etag = context_data['etag'] or compute_etag(context_data['content'])
+        last_modified = context_data['last_modified']
+        headers = dict(context_data['headers'] or {}, ETag=etag)
+        if last_modified:
+            headers['Last-Modified'] = last_modified
+        self.save(context, self.WRITE_KEYS['headers'], headers)
+        if is_not_modified(context_data['request_headers'], etag,
+                           last_modified):
+            self.save(context, self.WRITE_KEYS['content'], None)
+            self.save(context, self.WRITE_KEYS['status_code'], 304)
@@ -1,12 +1,21 @@
-from os.path import expanduser, join, isfile
-import yaml
-from cerberus import Validator
+import hashlib
+import marshal
+import os
+import tempfile
+from os.path import abspath, expanduser, getmtime, isdir, join, isfile
 from apimas.errors import ValidationError, FormatError
 
 
 HOME_DIR = expanduser("~")
 DEFAULT_FILENAME = join(HOME_DIR, '.apimas')
 
+# Directory of the caches of APIMAS, e.g. of parsed configuration files.
+CACHE_DIR = os.environ.get(
+    'APIMAS_CACHE_DIR', join(HOME_DIR, '.cache', 'apimas'))
+
+# Changed whenever the format of cached documents changes.
+DOCUMENT_CACHE_VERSION = 2
+
 
 VALIDATION_SCHEMA = {
     'root': {
@@ -14,35 +23,124 @@ VALIDATION_SCHEMA = {
     },
     'spec': {
         'type': 'dict'
+    },
+    'session': {
+        'type': 'dict',
+        'schema': {
+            'pool_size': {'type': 'integer', 'min': 1},
+            'max_retries': {'type': 'integer', 'min': 0},
+            'backoff_factor': {'type': 'number', 'min': 0},
+            'retry_statuses': {'type': 'list', 'schema': {'type': 'integer'}},
+            'timeout': {'type': 'number', 'min': 0},
+        }
     }
 }
 
 
+def _get_cache_path(path):
+    path = abspath(path)
+    if isinstance(path, unicode):
+        path = path.encode('utf-8')
+    key = hashlib.sha1(path).hexdigest()
+    return join(CACHE_DIR, 'config-' + key + '.marshal')
+
+
+def _load_cached_document(path, mtime, content_hash):
+    # Documents are stored with `marshal`, which (unlike `pickle`) cannot
+    # execute code when a tampered cache file is loaded.
+    try:
+        with open(_get_cache_path(path), 'rb') as f:
+            cached_path, version, cached_mtime, cached_hash, document = \
+                marshal.load(f)
+    except Exception:
+        # A missing, partial or stale cache file.
+        return None
+    if (cached_path, version, cached_mtime, cached_hash) != (
+            path, DOCUMENT_CACHE_VERSION, mtime, content_hash):
+        return None
+    return document
+
+
+def _store_cached_document(path, mtime, content_hash, document):
+    # Failures are ignored (e.g. a read-only directory or a document with
+    # values that marshal does not support, such as dates), as the cache is
+    # only an optimization.
+    try:
+        data = marshal.dumps(
+            (path, DOCUMENT_CACHE_VERSION, mtime, content_hash, document))
+        if not isdir(CACHE_DIR):
+            os.makedirs(CACHE_DIR)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.rename(tmp_path, _get_cache_path(path))
+    except (IOError, OSError, ValueError):
+        pass
+
+
+def _parse_document(content):
+    import yaml
+    # The C loader (libyaml) is much faster on large specs, if available.
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    try:
+        return yaml.load(content, Loader=loader)
+    except yaml.YAMLError as e:
+        msg = 'File cannot be understood: {!s}.'.format(str(e))
+        raise FormatError(message=msg)
+
+
 def _load_document(path):
+    """
+    Loads a YAML (or JSON) document.
+
+    The parsed document is cached in `CACHE_DIR`, keyed by the absolute path
+    of the file, and the cached document is used as long as the
+    modification time and the content of the file are the same.
+    """
     if not isfile(path):
         msg = 'Given path {!r} is not a file'.format(path)
         raise ValidationError(message=msg)
 
-    with open(path) as data_file:
-        try:
-            return yaml.safe_load(data_file)
-        except yaml.YAMLError as e:
-            msg = 'File cannot be understood: {!s}.'.format(str(e))
-            raise FormatError(message=msg)
+    path = abspath(path)
+    mtime = getmtime(path)
+    with open(path, 'rb') as data_file:
+        content = data_file.read()
+    content_hash = hashlib.sha1(content).hexdigest()
+    document = _load_cached_document(path, mtime, content_hash)
+    if document is None:
+        document = _parse_document(content)
+        _store_cached_document(path, mtime, content_hash, document)
+    return document
+
+
+_validator = None
+
+
+def _get_validator():
+    global _validator
+    if _validator is None:
+        from cerberus import Validator
+        _validator = Validator(VALIDATION_SCHEMA)
+    return _validator
 
 
 def _validate_document(document):
     if not isinstance(document, dict):
         raise FormatError('File cannot be understood. It seems not to be'
                           ' a document.')
-    validator = Validator(VALIDATION_SCHEMA)
+    validator = _get_validator()
     is_valid = validator.validate(document)
     if not is_valid:
         raise ValidationError(validator.errors)
     return document
 
 
+def get_path(path):
+    """ Gets the path of the configuration file, given by the user or not. """
+    return DEFAULT_FILENAME if not path else expanduser(path)
+
+
 def configure(path):
-    path = DEFAULT_FILENAME if not path else expanduser(path)
+    path = get_path(path)
     document = _load_document(path)
     return _validate_document(document)
@@ -6,7 +6,7 @@ Optionally, constructors can create random conforming values.
 
 """
 import sys
-from random import choice, randint
+import random
 import re
 
 from documents import (
@@ -19,6 +19,12 @@ MAXINT = sys.maxint
 MININT = -sys.maxint - 1
 
 
+def _get_random(context):
+    # The random generator of '.randomize', given by the context of
+    # `doc_construct()`, which constructors find under the 'context' key.
+    return ((context or {}).get('context') or {}).get('random') or random
+
+
 def construct_integer(instance, spec, loc, context):
     """Construct and validate a python int/long.
 
@@ -57,6 +63,11 @@ def construct_integer(instance, spec, loc, context):
               their dependencies.
             - sep
               The separator used for constructor names, '.' by default.
+            - context
+              The context given to `doc_construct()`. Its 'random' key
+              holds the random generator used by '.randomize', e.g. a
+              seeded `random.Random`, so that random values can be
+              reproduced. The `random` module by default.
 
     Returns:
         integer:
@@ -70,7 +81,7 @@ def construct_integer(instance, spec, loc, context):
     if val is None and '.randomize' in spec:
         _min = MININT if min is None else min
         _max = MAXINT if max is None else max
-        val = randint(_min, _max)
+        val = _get_random(context).randint(_min, _max)
 
     if isinstance(instance, basestring):
         if not instance.isdigit():
@@ -139,6 +150,11 @@ def construct_text(instance, spec, loc, context):
               their dependencies.
             - sep
               The separator used for constructor names, '.' by default.
+            - context
+              The context given to `doc_construct()`. Its 'random' key
+              holds the random generator used by '.randomize', e.g. a
+              seeded `random.Random`, so that random values can be
+              reproduced. The `random` module by default.
 
     Returns:
         text:
@@ -164,8 +180,9 @@ def construct_text(instance, spec, loc, context):
             "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
             "0123456789_-")
 
-        text = ''.join(choice(alphabet)
-                       for _ in xrange(randint(minlen, maxlen)))
+        rng = _get_random(context)
+        text = ''.join(rng.choice(alphabet)
+                       for _ in xrange(rng.randint(minlen, maxlen)))
 
     if isinstance(text, str):
         text = text.decode(encoding)
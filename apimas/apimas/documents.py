@@ -545,7 +545,7 @@ def _doc_construct_init_instance(
             constructors, autoconstruct,
             construct_spec,
             allow_constructor_input,
-            sep, data_keys, prefixes):
+            sep, data_keys, prefixes, context=None):
 
     instance = {}
 
@@ -559,7 +559,7 @@ def _doc_construct_init_instance(
             autoconstruct=autoconstruct,
             construct_spec=construct_spec,
             allow_constructor_input=allow_constructor_input,
-            sep=sep)
+            sep=sep, context=context)
 
     for key in doc:
         if key in data_keys:
@@ -580,7 +580,7 @@ def _doc_construct_init_instance(
             autoconstruct=autoconstruct,
             construct_spec=construct_spec,
             allow_constructor_input=allow_constructor_input,
-            sep=sep)
+            sep=sep, context=context)
 
     return instance
 
@@ -589,7 +589,7 @@ def _construct_doc_call_constructors(
         instance, spec, loc, top_spec,
         constructors, autoconstruct,
         allow_constructor_input,
-        sep, constructor_names):
+        sep, constructor_names, context=None):
 
     old_deferred_constructor_names = None
     cons_round = 0
@@ -626,7 +626,7 @@ def _construct_doc_call_constructors(
                 constructor_index=constructors,
                 cons_siblings=constructor_names,
                 constructed=constructed,
-                context=None,
+                context=context,
             )
 
             try:
@@ -655,7 +655,7 @@ def doc_construct(doc, spec, loc=(), top_spec=None,
                   autoconstruct=False,
                   allow_constructor_input=False,
                   construct_spec=False,
-                  sep='.'):
+                  sep='.', context=None):
 
     doc_is_basic = type(doc) is not dict
     spec_is_basic = type(spec) is not dict
@@ -694,7 +694,7 @@ def doc_construct(doc, spec, loc=(), top_spec=None,
                     autoconstruct=autoconstruct,
                     construct_spec=construct_spec,
                     allow_constructor_input=allow_constructor_input,
-                    sep=sep)
+                    sep=sep, context=context)
 
     prefixes.sort()
 
@@ -712,13 +712,13 @@ def doc_construct(doc, spec, loc=(), top_spec=None,
                                                constructors, autoconstruct,
                                                construct_spec,
                                                allow_constructor_input, sep,
-                                               data_keys, prefixes)
+                                               data_keys, prefixes, context)
 
     instance = _construct_doc_call_constructors(
             instance, spec, loc, top_spec,
             constructors, autoconstruct,
             allow_constructor_input,
-            sep, constructor_names)
+            sep, constructor_names, context)
 
     return instance
 
@@ -924,7 +924,14 @@ def construct_patterns(instance, spec, loc, context):
 register_constructor(construct_patterns, 'patterns')
 
 
-def random_doc(nr_nodes=32, max_depth=7):
+def random_doc(nr_nodes=32, max_depth=7, min_depth=1, rng=None):
+    """Generate a random document of `nr_nodes` random paths.
+
+    Paths consist of `min_depth` to `max_depth` segments. The document is
+    generated with the global `random` module, unless a random generator
+    (e.g. a seeded `random.Random`) is given as `rng`; then, the same
+    generator state always yields the same document.
+    """
     words = (
         'alpha',
         'beta',
@@ -960,13 +967,14 @@ def random_doc(nr_nodes=32, max_depth=7):
         'nine',
     )
 
-    import random
+    if rng is None:
+        import random as rng
 
     doc = {}
 
     for i in xrange(nr_nodes):
-        depth = random.randint(1, max_depth)
-        path = tuple(random.choice(words) for _ in xrange(depth))
-        doc_set(doc, path, random.choice(words))
+        depth = rng.randint(min_depth, max_depth)
+        path = tuple(rng.choice(words) for _ in xrange(depth))
+        doc_set(doc, path, rng.choice(words))
 
     return doc
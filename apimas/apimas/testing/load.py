@@ -0,0 +1,455 @@
+"""
+A load generator, which sends a weighted mix of requests to the actions of
+the collections of a spec, with request bodies generated from the spec
+(see `RequestGenerator`), and reports the throughput and the latency
+percentiles of every collection and action.
+
+Requests are sent with a transport, i.e. a callable
+`transport(method, path, data)` which returns the status code and the
+parsed content of the response:
+
+* `RequestsTransport` sends requests to a running API.
+* `DjangoTransport` sends requests with the test client of django, i.e.
+  in-process.
+
+Example:
+    >>> transport = RequestsTransport('http://localhost:8000/')
+    >>> generator = LoadGenerator(spec, transport,
+    ...                           mix={'create': 1, 'retrieve': 4})
+    >>> generator.load_resource_ids()
+    >>> report = generator.run(duration=60, concurrency=10, rate=200)
+    >>> report.summary()
+    [{'collection': 'api/foo', 'action': 'create', 'count': 2391, ...}, ...]
+"""
+import bisect
+import copy
+import json
+import threading
+import time
+from requests.compat import urljoin
+from apimas.errors import InvalidInput
+from apimas.utils.generators import RequestGenerator, get_gen_context
+
+
+# HTTP method of every action and whether it refers to a single resource.
+ACTIONS = {
+    'create': ('POST', False),
+    'list': ('GET', False),
+    'retrieve': ('GET', True),
+    'update': ('PUT', True),
+    'partial_update': ('PATCH', True),
+    'delete': ('DELETE', True),
+}
+
+DEFAULT_MIX = {
+    'create': 2,
+    'list': 2,
+    'retrieve': 10,
+    'update': 2,
+    'partial_update': 2,
+    'delete': 1,
+}
+
+
+def _parse_content(content):
+    try:
+        return json.loads(content) if content else None
+    except ValueError:
+        return None
+
+
+class RequestsTransport(object):
+    """
+    Sends requests to a running API with a `requests` session.
+
+    :param root_url: Root URL of the API.
+    :param session: (optional) Session used for requests, see
+    `create_session()`. Its connection pool should be as large as the
+    concurrency of the load.
+    :param headers: (optional) Headers of every request, e.g. credentials.
+    :param timeout: (optional) Timeout of every request in seconds.
+    """
+    def __init__(self, root_url, session=None, headers=None, timeout=None):
+        from apimas.clients.sessions import create_session
+        self.root_url = root_url.rstrip('/') + '/'
+        self.session = session or create_session()
+        self.headers = headers
+        self.timeout = timeout
+
+    def __call__(self, method, path, data=None):
+        response = self.session.request(
+            method, urljoin(self.root_url, path), json=data,
+            headers=self.headers, timeout=self.timeout)
+        return response.status_code, _parse_content(response.content)
+
+
+class DjangoTransport(object):
+    """
+    Sends requests in-process, with the test client of django.
+
+    As the test client is not thread-safe, requests are sent one at a time.
+    Note that django connects to the database once per thread, i.e. with
+    an in-memory SQLite database, a concurrency of 1 is required.
+
+    :param client: (optional) A `django.test.Client`, e.g. an authenticated
+    one.
+    """
+    def __init__(self, client=None):
+        if client is None:
+            from django.test import Client
+            client = Client()
+        self.client = client
+        self._lock = threading.Lock()
+
+    def __call__(self, method, path, data=None):
+        request = getattr(self.client, method.lower())
+        kwargs = {}
+        if data is not None:
+            kwargs = {'data': json.dumps(data),
+                      'content_type': 'application/json'}
+        with self._lock:
+            response = request('/' + path.lstrip('/'), **kwargs)
+        return response.status_code, _parse_content(response.content)
+
+
+def _percentile(ordered, pct):
+    index = int(round((pct / 100.0) * (len(ordered) - 1)))
+    return ordered[index]
+
+
+class LoadReport(object):
+    """
+    Results of a load run.
+
+    :param elapsed: Duration of the run in seconds.
+    :param stats: A dict with the latencies (in seconds), the number of
+    errors and the number of responses of every status code, keyed by
+    `(collection, action)`.
+    """
+    def __init__(self, elapsed, stats):
+        self.elapsed = elapsed
+        self.stats = stats
+
+    def _summarize(self, latencies, errors):
+        count = len(latencies)
+        ordered = sorted(latencies)
+        summary = {
+            'count': count,
+            'errors': errors,
+            'throughput': count / self.elapsed if self.elapsed else None,
+        }
+        for key, pct in [('p50_ms', 50), ('p90_ms', 90), ('p99_ms', 99)]:
+            summary[key] = _percentile(ordered, pct) * 1000 if count\
+                else None
+        summary['mean_ms'] = sum(ordered) / count * 1000 if count else None
+        summary['max_ms'] = ordered[-1] * 1000 if count else None
+        return summary
+
+    def summary(self):
+        """
+        Gets the throughput (requests per second), the number of errors and
+        the latency percentiles (in milliseconds) of every collection and
+        action.
+
+        :returns: A list of dicts, sorted by collection and action.
+        """
+        results = []
+        for (collection, action), stats in sorted(self.stats.iteritems()):
+            summary = self._summarize(stats['latencies'], stats['errors'])
+            summary.update(collection=collection, action=action,
+                           statuses=dict(stats['statuses']))
+            results.append(summary)
+        return results
+
+    def total(self):
+        """ Gets the summary of all requests of the run. """
+        latencies = []
+        errors = 0
+        for stats in self.stats.itervalues():
+            latencies.extend(stats['latencies'])
+            errors += stats['errors']
+        return self._summarize(latencies, errors)
+
+
+class LoadGenerator(object):
+    """
+    Generator of a mix of requests to the collections of a spec.
+
+    Every collection action, e.g. `create` of `api/foo`, is chosen with
+    probability proportional to the weight of its action in the mix.
+    Actions on single resources (e.g. `retrieve`) target the resources
+    created during the run or found by `load_resource_ids()`; if there are
+    none yet, a `create` request is sent instead. Under concurrency, such
+    a request may refer to a resource which is being deleted by another
+    one, i.e. a few `404` responses are expected if the mix has `delete`.
+
+    Request bodies are sent as JSON; collections with file fields are not
+    supported.
+
+    :param spec: Specification of the API.
+    :param transport: Callable which sends a request, see
+    `RequestsTransport`.
+    :param mix: (optional) Weight of every action, see `DEFAULT_MIX`.
+    Actions which are not in the mix are not requested.
+    :param collections: (optional) Paths of the collections to request,
+    e.g. `['api/foo']`. Defaults to all collections of the spec.
+    :param generator_class: (optional) Class (or any factory callable) of
+    the generators of request bodies, called as
+    `generator_class(spec, gen_context=gen_context)`, e.g. `PayloadFactory`
+    or `functools.partial(DjangoRequestGenerator, instances=instances)`.
+    Generators are not thread-safe, so the bodies of concurrent requests
+    are constructed one at a time.
+    :param id_field: (optional) Field which identifies resources.
+    :param gen_context: (optional) Source of random data of the requests and
+    their bodies, see `GeneratorContext`. With a seeded context, a run with
+    a single concurrent request sends the same requests every time.
+
+    Actions on single resources of a collection without `create` are
+    dropped from the mix of a run once the collection has no known
+    resources, as they cannot be requested anymore.
+
+    :raises: InvalidInput if no action of the mix is supported by the
+    requested collections.
+    """
+    def __init__(self, spec, transport, mix=None, collections=None,
+                 generator_class=RequestGenerator, id_field='id',
+                 gen_context=None):
+        self.transport = transport
+        self.gen_context = get_gen_context(gen_context)
+        self.mix = DEFAULT_MIX if mix is None else mix
+        self.id_field = id_field
+        self.operations = []
+        self.generators = {}
+        self.resource_ids = {}
+        for path, collection_spec in self._iter_collections(spec):
+            if collections is not None and path not in collections:
+                continue
+            actions = self._get_actions(collection_spec)
+            for action in sorted(actions):
+                weight = self.mix.get(action, 0)
+                if action in ACTIONS and weight > 0:
+                    self.operations.append((path, action, weight))
+            if 'create' in actions:
+                # Generators modify their spec when they construct data.
+                self.generators[path] = generator_class(
+                    copy.deepcopy(collection_spec),
+                    gen_context=self.gen_context)
+            self.resource_ids[path] = []
+        if not self.operations:
+            raise InvalidInput('There are no actions to request')
+        self._lock = threading.Lock()
+        self._construct_lock = threading.Lock()
+
+    @staticmethod
+    def _get_choices(operations):
+        cumulative_weights = []
+        total = 0
+        for _, _, weight in operations:
+            total += weight
+            cumulative_weights.append(total)
+        return operations, cumulative_weights
+
+    @staticmethod
+    def _iter_collections(spec):
+        for endpoint, endpoint_spec in sorted(spec.iteritems()):
+            if endpoint.startswith('.'):
+                continue
+            for collection, collection_spec in sorted(
+                    endpoint_spec.iteritems()):
+                if not collection.startswith('.'):
+                    yield endpoint + '/' + collection, collection_spec
+
+    @staticmethod
+    def _get_actions(collection_spec):
+        actions = set()
+        for spec in (collection_spec, collection_spec.get('*', {})):
+            actions.update(spec.get('.actions=') or spec.get('.actions')
+                           or {})
+        return {action[1:] for action in actions}
+
+    def load_resource_ids(self):
+        """
+        Lists every collection (its first page) to find existing resources
+        for the actions on single resources.
+        """
+        for path, action, _ in self.operations:
+            if action != 'list':
+                continue
+            status, content = self.transport('GET', path + '/')
+            if isinstance(content, dict):
+                # A page of a paginated list.
+                content = content.get('results')
+            if status != 200 or not isinstance(content, list):
+                continue
+            ids = [item[self.id_field] for item in content
+                   if isinstance(item, dict) and self.id_field in item]
+            with self._lock:
+                self.resource_ids[path] = list(
+                    set(self.resource_ids[path]).union(ids))
+
+    def _choose(self, state):
+        # Choices are replaced (never modified) when operations are
+        # dropped, so that they are read consistently without the lock.
+        operations, cumulative_weights = state['choices']
+        if not operations:
+            return None
+        point = self.gen_context.random.random() * cumulative_weights[-1]
+        index = bisect.bisect_right(cumulative_weights, point)
+        path, action, _ = operations[min(index, len(operations) - 1)]
+        return path, action
+
+    def _drop(self, state, path, action):
+        """ Drops an operation which cannot be requested from the run. """
+        with self._lock:
+            operations = [operation for operation in state['choices'][0]
+                          if operation[:2] != (path, action)]
+            state['choices'] = self._get_choices(operations)
+
+    def _prepare(self, path, action):
+        """
+        Gets the action (which may be replaced by `create`), the method, the
+        URL path and the body of a request, or `None` if the action cannot
+        be requested.
+        """
+        resource_id = None
+        if ACTIONS[action][1]:
+            with self._lock:
+                ids = self.resource_ids[path]
+                if ids:
+                    index = self.gen_context.random.randrange(len(ids))
+                    resource_id = ids[index]
+                    if action == 'delete':
+                        # Deleted resources are not requested again.
+                        ids[index] = ids[-1]
+                        ids.pop()
+            if resource_id is None:
+                if path not in self.generators:
+                    return None
+                action = 'create'
+        method = ACTIONS[action][0]
+        url = path + '/'
+        if resource_id is not None:
+            url += str(resource_id) + '/'
+        data = None
+        if action in ('create', 'update', 'partial_update'):
+            generator = self.generators.get(path)
+            if generator is None:
+                data = {}
+            else:
+                with self._construct_lock:
+                    data = generator.construct()
+            if action == 'partial_update' and data:
+                rng = self.gen_context.random
+                keys = rng.sample(sorted(data), rng.randint(1, len(data)))
+                data = {key: data[key] for key in keys}
+        return action, method, url, data
+
+    def _next_request(self, state):
+        """
+        Gets the collection and the request of the next operation, or `None`
+        if no operation can be requested anymore.
+        """
+        while True:
+            choice = self._choose(state)
+            if choice is None:
+                return None
+            path, action = choice
+            request = self._prepare(path, action)
+            if request is not None:
+                return path, request
+            # Its collection has no resources and none can be created.
+            self._drop(state, path, action)
+
+    def _run_worker(self, state):
+        timer = time.time
+        while self._acquire(state):
+            next_request = self._next_request(state)
+            if next_request is None:
+                break
+            path, (action, method, url, data) = next_request
+            start = timer()
+            try:
+                status, content = self.transport(method, url, data)
+            except Exception:
+                # e.g. connection errors and timeouts.
+                status, content = None, None
+            latency = timer() - start
+            self._record(state, path, action, status, content, latency)
+
+    def _acquire(self, state):
+        """ Waits for the slot of the next request, if any. """
+        with self._lock:
+            now = time.time()
+            if state['deadline'] is not None and now >= state['deadline']:
+                return False
+            if state['remaining'] is not None:
+                if state['remaining'] <= 0:
+                    return False
+                state['remaining'] -= 1
+            if state['interval'] is None:
+                return True
+            slot = max(now, state['next_slot'])
+            state['next_slot'] = slot + state['interval']
+        delay = slot - time.time()
+        if delay > 0:
+            time.sleep(delay)
+        return True
+
+    def _record(self, state, path, action, status, content, latency):
+        with self._lock:
+            stats = state['stats'].get((path, action))
+            if stats is None:
+                stats = state['stats'][(path, action)] = {
+                    'latencies': [], 'errors': 0, 'statuses': {}}
+            stats['latencies'].append(latency)
+            stats['statuses'][status] = stats['statuses'].get(status, 0) + 1
+            if status is None or status >= 400:
+                stats['errors'] += 1
+            elif action == 'create' and isinstance(content, dict) and \
+                    self.id_field in content:
+                self.resource_ids[path].append(content[self.id_field])
+
+    def run(self, duration=None, requests=None, concurrency=1, rate=None):
+        """
+        Sends requests until the given duration passes or the given number
+        of requests is sent.
+
+        :param duration: (optional) Duration of the run in seconds.
+        :param requests: (optional) Total number of requests.
+        :param concurrency: (optional) Number of concurrent requests.
+        :param rate: (optional) Maximum number of requests per second of
+        all workers. Requests are sent as fast as possible if it is not
+        given.
+
+        The run stops early if no operation of the mix can be requested
+        anymore, e.g. when all operations are on single resources of a
+        collection without `create`, and it has no resources.
+
+        :returns: A `LoadReport`.
+        :raises: InvalidInput if neither duration nor requests is given.
+        """
+        if duration is None and requests is None:
+            raise InvalidInput('A duration or a number of requests is'
+                               ' required')
+        start = time.time()
+        state = {
+            'deadline': start + duration if duration is not None else None,
+            'remaining': requests,
+            'interval': 1.0 / rate if rate else None,
+            'next_slot': start,
+            'stats': {},
+            'choices': self._get_choices(list(self.operations)),
+        }
+        if concurrency == 1:
+            # Requests are sent from the calling thread, e.g. so that
+            # in-process requests share its database connection.
+            self._run_worker(state)
+            return LoadReport(time.time() - start, state['stats'])
+        workers = [threading.Thread(target=self._run_worker, args=(state,))
+                   for _ in xrange(concurrency)]
+        for worker in workers:
+            worker.daemon = True
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return LoadReport(time.time() - start, state['stats'])
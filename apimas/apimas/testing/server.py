@@ -0,0 +1,153 @@
+"""
+An in-memory stand-in of an APIMAS server, used to test clients offline.
+"""
+import json
+import threading
+from collections import OrderedDict
+from urlparse import parse_qs
+from requests import Response
+from requests.adapters import BaseAdapter
+from requests.compat import urlencode, urlparse
+from requests.structures import CaseInsensitiveDict
+
+
+class LocalServer(BaseAdapter):
+    """
+    A `requests` transport adapter which serves the CRUD actions of the
+    given collections from memory, instead of sending requests over the
+    network.
+
+    Resources are stored as dicts with an auto-incremented `id`. Only JSON
+    request bodies are supported. A POST request with a list of resources
+    creates all of them (bulk create).
+
+    If `page_size` is given, collections are listed in pages, selected by
+    the `page` query parameter, in the format of the page number pagination
+    of Django REST Framework, i.e. `{"count": ..., "next": ...,
+    "previous": ..., "results": [...]}`.
+
+    Example:
+        >>> server = LocalServer('http://localhost', ['api/foo'])
+        >>> server.mount(client.session)
+        >>> client.create(data={'text': 'foo'}).json()
+        {u'id': 1, u'text': u'foo'}
+
+    :param root_url: Root URL of the served API.
+    :param collections: Paths of the collections relative to the root URL,
+    e.g. `api/foo`.
+    :param page_size: (optional) Number of resources per page of lists.
+    """
+    def __init__(self, root_url, collections, page_size=None):
+        super(LocalServer, self).__init__()
+        self.root_url = root_url.rstrip('/') + '/'
+        self.collections = {
+            collection.strip('/'): OrderedDict()
+            for collection in collections}
+        self.page_size = page_size
+        self.requests = []
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def mount(self, session):
+        """ Routes the requests of a session to the root URL to the server. """
+        session.mount(self.root_url, self)
+
+    def _resolve(self, url):
+        path = urlparse(url).path.strip('/')
+        root_path = urlparse(self.root_url).path.strip('/')
+        if root_path:
+            path = path[len(root_path):].strip('/')
+        if path in self.collections:
+            return path, None
+        collection, _, resource_id = path.rpartition('/')
+        if collection in self.collections:
+            return collection, resource_id
+        return None, None
+
+    def _create(self, resources, data):
+        resource = dict(data, id=self._next_id)
+        resources[str(self._next_id)] = resource
+        self._next_id += 1
+        return 201, resource
+
+    def _paginate(self, url, resources):
+        if self.page_size is None:
+            return 200, resources
+        query = parse_qs(urlparse(url).query)
+        try:
+            page = int(query.get('page', ['1'])[0])
+        except ValueError:
+            page = 0
+        start = (page - 1) * self.page_size
+        if page < 1 or (start and start >= len(resources)):
+            return 404, {'detail': 'Invalid page.'}
+
+        def page_url(number):
+            parts = urlparse(url)
+            return parts._replace(query=urlencode({'page': number})).geturl()
+
+        end = start + self.page_size
+        return 200, OrderedDict([
+            ('count', len(resources)),
+            ('next', page_url(page + 1) if end < len(resources) else None),
+            ('previous', page_url(page - 1) if page > 1 else None),
+            ('results', resources[start:end]),
+        ])
+
+    def _handle(self, method, url, data):
+        collection, resource_id = self._resolve(url)
+        if collection is None:
+            return 404, {'detail': 'Not found.'}
+        resources = self.collections[collection]
+        if method in ('HEAD', 'OPTIONS'):
+            return 200, None
+        if resource_id is None:
+            if method == 'POST' and isinstance(data, list):
+                return 201, [self._create(resources, item)[1]
+                             for item in data]
+            if method == 'POST':
+                return self._create(resources, data)
+            if method == 'GET':
+                return self._paginate(url, resources.values())
+            return 405, {'detail': 'Method not allowed.'}
+        if resource_id not in resources:
+            return 404, {'detail': 'Not found.'}
+        if method == 'GET':
+            return 200, resources[resource_id]
+        if method in ('PUT', 'PATCH'):
+            resource = dict(data, id=resources[resource_id]['id'])
+            if method == 'PATCH':
+                resource = dict(resources[resource_id], **resource)
+            resources[resource_id] = resource
+            return 200, resource
+        if method == 'DELETE':
+            del resources[resource_id]
+            return 204, None
+        return 405, {'detail': 'Method not allowed.'}
+
+    def send(self, request, **kwargs):
+        body = request.body
+        try:
+            data = json.loads(body) if body else {}
+        except (TypeError, ValueError):
+            status, content = 415, {'detail': 'Unsupported media type.'}
+        else:
+            with self._lock:
+                self.requests.append((request.method, request.url))
+                status, content = self._handle(request.method, request.url,
+                                               data)
+        response = Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(
+            {'Content-Type': 'application/json'})
+        response._content = json.dumps(content) if content is not None\
+            else ''
+        response.encoding = 'utf-8'
+        # There is no raw stream; streamed responses are read from content.
+        response._content_consumed = True
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
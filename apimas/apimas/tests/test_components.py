@@ -0,0 +1,36 @@
+import unittest
+from apimas.adapters.actions import Response
+from apimas.components import BaseProcessor
+from apimas.errors import InvalidInput
+
+
+class TestBaseProcessor(unittest.TestCase):
+    def setUp(self):
+        self.processor = BaseProcessor(spec={})
+
+    def test_save(self):
+        context = {'store': {'foo': {'bar': {'a': 1}, 'baz': 2}}}
+        self.processor.save(context, 'store/foo/bar', {'b': 2})
+        # Values are replaced, not merged; sibling keys are kept.
+        self.assertEqual(context,
+                         {'store': {'foo': {'bar': {'b': 2}, 'baz': 2}}})
+        self.processor.save(context, ('store', 'foo', 'bar'), 3)
+        self.assertEqual(context['store']['foo'], {'bar': 3, 'baz': 2})
+
+        # Missing parents are created.
+        self.processor.save(context, 'store/new/key', 'value')
+        self.assertEqual(context['store']['new'], {'key': 'value'})
+        self.processor.save(context, 'store/new/other', None)
+        self.assertEqual(context['store']['new'],
+                         {'key': 'value', 'other': None})
+
+        # Attributes of objects are replaced too.
+        context['response'] = Response(content=[1, 2], status_code=200)
+        self.processor.save(context, 'response/content', [3])
+        self.assertEqual(context['response'].content, [3])
+        self.processor.save(context, 'response/kwargs/headers', {'A': 'b'})
+        self.assertEqual(context['response'].kwargs,
+                         {'status_code': 200, 'headers': {'A': 'b'}})
+
+        self.assertRaises(InvalidInput, self.processor.save, None,
+                          'foo', 1)
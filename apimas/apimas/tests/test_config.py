@@ -0,0 +1,75 @@
+import datetime
+import os
+import shutil
+import tempfile
+import unittest
+import mock
+from apimas import config
+from apimas.errors import FormatError, ValidationError
+
+
+class TestConfig(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'config.yaml')
+        self.cache_dir = os.path.join(self.tmp_dir, 'cache')
+        patcher = mock.patch.object(config, 'CACHE_DIR', self.cache_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write_config(self, content):
+        with open(self.path, 'w') as f:
+            f.write(content)
+
+    def test_configure(self):
+        self.write_config('root: http://localhost/\nspec: {api: {}}\n')
+        expected = {'root': 'http://localhost/', 'spec': {'api': {}}}
+        self.assertEqual(config.configure(self.path), expected)
+        self.assertTrue(os.path.isfile(config._get_cache_path(self.path)))
+        # Nothing is written next to the configuration file.
+        self.assertEqual(sorted(os.listdir(self.tmp_dir)),
+                         ['cache', 'config.yaml'])
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+        # The cached document is used, without parsing the file.
+        with mock.patch.object(config, '_parse_document') as mock_parse:
+            self.assertEqual(config.configure(self.path), expected)
+            mock_parse.assert_not_called()
+        self.assertIs(config._get_validator(), config._get_validator())
+
+        # A modified file invalidates the cache.
+        self.write_config('root: http://example.com/\n')
+        os.utime(self.path, (0, 0))
+        self.assertEqual(config.configure(self.path),
+                         {'root': 'http://example.com/'})
+
+        # So does a file of the same modification time with other content.
+        self.write_config('root: http://example.org/\n')
+        os.utime(self.path, (0, 0))
+        self.assertEqual(config.configure(self.path),
+                         {'root': 'http://example.org/'})
+
+    def test_configure_invalid(self):
+        self.write_config('root: [foo\n')
+        self.assertRaises(FormatError, config.configure, self.path)
+        self.write_config('root: 1\n')
+        self.assertRaises(ValidationError, config.configure, self.path)
+        self.assertRaises(ValidationError, config.configure,
+                          os.path.join(self.tmp_dir, 'missing'))
+
+        # Documents which cannot be stored with marshal are not cached.
+        self.write_config('root: http://localhost/\nspec: {day: 2017-01-05}\n')
+        os.remove(config._get_cache_path(self.path))
+        self.assertEqual(config.configure(self.path)['spec']['day'],
+                         datetime.date(2017, 1, 5))
+        self.assertFalse(os.path.exists(config._get_cache_path(self.path)))
+
+        # A corrupt cache is ignored.
+        self.write_config('root: http://localhost/\n')
+        with open(config._get_cache_path(self.path), 'w') as f:
+            f.write('foo')
+        self.assertEqual(config.configure(self.path),
+                         {'root': 'http://localhost/'})
@@ -232,3 +232,20 @@ pprint(randomized_spec, indent=2)
 
 randomized_instance = doc_construct({}, simple_spec)
 pprint(randomized_instance, indent=2)
+
+
+def test_randomize_seed():
+    import random
+    spec = {
+        'number': {'.integer': {'.randomize': {}, 'min': 0, 'max': 10 ** 9}},
+        'name': {'.text': {'.randomize': {}, 'minlen': 6, 'maxlen': 32}},
+    }
+
+    def construct(seed):
+        return doc_construct({}, spec, autoconstruct=True,
+                             context={'random': random.Random(seed)})
+    instance = construct(1)
+    assert isinstance(instance['number'], (int, long))
+    assert 6 <= len(instance['name']) <= 32
+    assert construct(1) == instance
+    assert construct(2) != instance
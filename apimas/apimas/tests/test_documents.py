@@ -1,6 +1,7 @@
+import random
 from apimas.documents import (
     random_doc, doc_pop, doc_match_levels, doc_iter, doc_construct,
-    doc_set, doc_get, Prefix)
+    doc_set, doc_get, doc_to_ns, Prefix)
 
 
 def test():
@@ -101,5 +102,17 @@ def test():
         pass
 
 
+def test_random_doc_depth():
+    doc = random_doc(nr_nodes=64, max_depth=4, min_depth=4)
+    paths = [key.split('/') for key in doc_to_ns(doc)]
+    assert paths
+    assert all(len(path) == 4 for path in paths)
+
+
+def test_random_doc_rng():
+    assert random_doc(rng=random.Random(1)) == \
+        random_doc(rng=random.Random(1))
+
+
 if __name__ == '__main__':
     test()
@@ -0,0 +1,113 @@
+import copy
+import unittest
+from datetime import date, datetime
+import pytz
+from apimas.utils import generators as gen
+
+
+class TestGenerators(unittest.TestCase):
+    def test_batch_generators(self):
+        values = gen.generate_strings(100, max_length=5)
+        self.assertEqual(len(values), 100)
+        for value in values:
+            self.assertTrue(value.isalpha())
+            self.assertTrue(1 <= len(value) <= 5)
+        self.assertEqual(gen.generate_strings(0), [])
+
+        values = gen.generate_integers(100, upper=3, lower=1)
+        self.assertEqual(set(values), {1, 2, 3})
+        for value in gen.generate_floats(100, upper=3, lower=1):
+            self.assertTrue(1 <= value <= 3)
+        self.assertEqual(set(gen.generate_booleans(100)), {True, False})
+
+        emails = gen.generate_emails(100)
+        self.assertEqual(len(set(emails)), 100)
+        self.assertTrue(all('@' in email for email in emails))
+
+        for value in gen.generate_dates(100):
+            self.assertTrue(date(1970, 1, 1) <= value <= date.today())
+        for value in gen.generate_dates(10, native=False):
+            datetime.strptime(value, '%Y-%m-%d')
+        for value in gen.generate_datetimes(100):
+            self.assertEqual(value.tzinfo, pytz.utc)
+        for value in gen.generate_datetimes(10, native=False,
+                                            date_formats=['%Y%m%d%H%M']):
+            datetime.strptime(value, '%Y%m%d%H%M')
+
+    def test_payload_factory(self):
+        spec = {
+            '*': {
+                'id': {'.serial': {}, '.readonly': {}},
+                'text': {'.string': {'max_length': 5}},
+                'number': {'.integer': {'upper': 3}},
+                'kind': {'.choices': {'choices': ['a', 'b']}},
+                'ref': {'.ref': {'to': 'api/bar'}},
+                'nested': {'.struct=': {'flag': {'.boolean': {}}}},
+                'items': {'.array of=': {'.struct=': {
+                    'date': {'.date': {'date_formats': ['%d/%m/%Y']}}}}},
+                'other': {'.identity': {}},
+                '.actions=': {'.retrieve': {}},
+            },
+            '.actions=': {'.create': {}},
+        }
+        factory = gen.PayloadFactory(spec, pool_size=50)
+        payload = factory.construct()
+        self.assertEqual(sorted(payload), ['id', 'items', 'kind', 'nested',
+                                           'number', 'other', 'ref', 'text'])
+        self.assertIsNone(payload['id'])
+        self.assertIsNone(payload['other'])
+
+        payloads = factory.construct_many(1000)
+        self.assertEqual(len(payloads), 1000)
+        # Values are drawn from the pools.
+        self.assertLessEqual(
+            len({payload['text'] for payload in payloads}), 50)
+        for payload in payloads:
+            self.assertTrue(1 <= len(payload['text']) <= 5)
+            self.assertIn(payload['number'], range(4))
+            self.assertIn(payload['kind'], ['a', 'b'])
+            self.assertTrue(payload['ref'].startswith('api/bar/'))
+            self.assertIsInstance(payload['nested']['flag'], bool)
+            self.assertEqual(len(payload['items']), 1)
+            datetime.strptime(payload['items'][0]['date'], '%d/%m/%Y')
+        # Payloads are distinct objects.
+        self.assertIsNot(payloads[0]['nested'], payloads[1]['nested'])
+        self.assertEqual(factory.construct_many(0), [])
+
+    def test_gen_context(self):
+        spec = {
+            '*': {
+                'text': {'.string': {}},
+                'email': {'.email': {}},
+                'created': {'.datetime': {'timezone': True}},
+                'nested': {'.struct=': {'number': {'.integer': {}}}},
+                'file': {'.file': {}},
+            },
+        }
+
+        def generate(seed):
+            gen_context = gen.GeneratorContext(seed)
+            generator = gen.RequestGenerator(copy.deepcopy(spec),
+                                             gen_context=gen_context)
+            payloads = [generator.construct() for _ in xrange(5)]
+            for payload in payloads:
+                payload['file'] = payload['file'].getvalue()
+            factory = gen.PayloadFactory(spec, pool_size=10,
+                                         gen_context=gen_context)
+            payloads.extend(factory.construct_many(5))
+            for payload in payloads[5:]:
+                payload['file'] = payload['file'].getvalue()
+            return payloads
+        self.assertEqual(generate(1), generate(1))
+        self.assertNotEqual(generate(1), generate(2))
+
+        # Dates of seeded contexts do not depend on the current time.
+        gen_context = gen.GeneratorContext(1)
+        self.assertEqual(gen_context.now, gen.GeneratorContext.REFERENCE_TIME)
+        for value in gen.generate_dates(100, gen_context=gen_context):
+            self.assertLessEqual(value, gen_context.now.date())
+        gen_context = gen.GeneratorContext(1, now=datetime(1970, 1, 2))
+        self.assertEqual(
+            set(gen.generate_dates(100, gen_context=gen_context)),
+            {date(1970, 1, 1), date(1970, 1, 2)})
+        self.assertIs(gen.get_gen_context(), gen.DEFAULT_GEN_CONTEXT)
@@ -0,0 +1,156 @@
+import copy
+import threading
+import time
+import unittest
+import requests
+from apimas.errors import InvalidInput
+from apimas.testing.load import LoadGenerator, RequestsTransport
+from apimas.testing.server import LocalServer
+from apimas.utils.generators import RequestGenerator
+
+
+ROOT_URL = 'http://load.test/'
+
+SPEC = {
+    'api': {
+        '.endpoint': {},
+        'foo': {
+            '.collection': {},
+            '*': {
+                'id': {'.serial': {}, '.readonly': {}},
+                'text': {'.string': {'max_length': 10}},
+                'number': {'.integer': {}},
+                '.actions=': {
+                    '.retrieve': {},
+                    '.partial_update': {},
+                    '.delete': {},
+                },
+            },
+            '.actions=': {'.list': {}, '.create': {}},
+        },
+        'bar': {
+            '.collection': {},
+            '*': {'text': {'.string': {}}},
+            '.actions=': {'.list': {}},
+        },
+    },
+}
+
+
+class TestLoadGenerator(unittest.TestCase):
+    def setUp(self):
+        self.session = requests.Session()
+        self.server = LocalServer(ROOT_URL, ['api/foo', 'api/bar'])
+        self.server.mount(self.session)
+        self.transport = RequestsTransport(ROOT_URL, session=self.session)
+
+    def test_run(self):
+        generator = LoadGenerator(SPEC, self.transport)
+        self.assertEqual(
+            [(path, action) for path, action, _ in generator.operations],
+            [('api/bar', 'list'), ('api/foo', 'create'),
+             ('api/foo', 'delete'), ('api/foo', 'list'),
+             ('api/foo', 'partial_update'), ('api/foo', 'retrieve')])
+
+        report = generator.run(requests=200, concurrency=4)
+        self.assertEqual(len(self.server.requests), 200)
+        summary = report.summary()
+        self.assertEqual(sum(row['count'] for row in summary), 200)
+        self.assertEqual(report.total()['count'], 200)
+        for row in summary:
+            # Concurrent requests may refer to a resource which is deleted
+            # in the meantime.
+            self.assertEqual(set(row['statuses']) - {200, 201, 204}, {404}
+                             if row['errors'] else set())
+            self.assertLessEqual(row['p50_ms'], row['p99_ms'])
+            self.assertLessEqual(row['p99_ms'], row['max_ms'])
+
+        # Known resources are those created and not deleted.
+        self.assertEqual(sorted(generator.resource_ids['api/foo']),
+                         sorted(map(int, self.server.collections['api/foo'])))
+
+        generator = LoadGenerator(SPEC, self.transport, mix={'retrieve': 1})
+        self.assertEqual(generator.resource_ids['api/foo'], [])
+        generator.load_resource_ids()
+        self.assertEqual(len(generator.resource_ids['api/foo']), 0)
+        generator = LoadGenerator(SPEC, self.transport,
+                                  mix={'retrieve': 1, 'list': 1},
+                                  collections=['api/foo'])
+        generator.load_resource_ids()
+        self.assertEqual(sorted(generator.resource_ids['api/foo']),
+                         sorted(map(int, self.server.collections['api/foo'])))
+
+    def test_rate(self):
+        generator = LoadGenerator(SPEC, self.transport, mix={'list': 1})
+        start = time.time()
+        report = generator.run(requests=10, concurrency=2, rate=100)
+        # The first request is sent immediately.
+        self.assertGreaterEqual(time.time() - start, 0.09)
+        self.assertEqual(report.total()['count'], 10)
+
+        report = generator.run(duration=0.1, rate=50)
+        self.assertLessEqual(report.total()['count'], 6)
+
+    def test_invalid(self):
+        self.assertRaises(InvalidInput, LoadGenerator, SPEC, self.transport,
+                          mix={'update': 1})
+        generator = LoadGenerator(SPEC, self.transport, mix={'list': 1})
+        self.assertRaises(InvalidInput, generator.run)
+
+        def failing_transport(method, path, data=None):
+            raise requests.ConnectionError()
+        generator = LoadGenerator(SPEC, failing_transport, mix={'list': 1})
+        report = generator.run(requests=5)
+        self.assertEqual(report.total()['errors'], 5)
+        self.assertEqual(
+            sum(row['statuses'][None] for row in report.summary()), 5)
+
+    def test_no_resources(self):
+        spec = copy.deepcopy(SPEC)
+        spec['api']['foo']['.actions='] = {'.list': {}}
+        generator = LoadGenerator(spec, self.transport, mix={'retrieve': 1})
+        start = time.time()
+        # There are no resources to retrieve and none can be created.
+        report = generator.run(duration=5)
+        self.assertLess(time.time() - start, 1)
+        self.assertEqual(report.total()['count'], 0)
+
+        generator = LoadGenerator(spec, self.transport,
+                                  mix={'retrieve': 1, 'list': 1})
+        report = generator.run(requests=10)
+        self.assertEqual(report.total()['count'], 10)
+        self.assertEqual(
+            [(row['collection'], row['action']) for row in report.summary()],
+            [('api/bar', 'list'), ('api/foo', 'list')])
+
+    def test_generator_class(self):
+        active = []
+        overlapping = []
+
+        class SlowGenerator(RequestGenerator):
+            def __init__(self, spec, prefix, gen_context=None):
+                super(SlowGenerator, self).__init__(
+                    spec, gen_context=gen_context)
+                self.prefix = prefix
+
+            def construct(self):
+                if active:
+                    overlapping.append(True)
+                active.append(threading.current_thread())
+                time.sleep(0.001)
+                data = super(SlowGenerator, self).construct()
+                active.pop()
+                data['text'] = self.prefix
+                return data
+
+        def factory(spec, gen_context=None):
+            return SlowGenerator(spec, 'slow', gen_context=gen_context)
+
+        generator = LoadGenerator(SPEC, self.transport, mix={'create': 1},
+                                  generator_class=factory)
+        report = generator.run(requests=20, concurrency=4)
+        self.assertEqual(report.total()['count'], 20)
+        self.assertEqual(overlapping, [])
+        self.assertEqual(
+            set(item['text'] for item in
+                self.server.collections['api/foo'].itervalues()), {'slow'})
@@ -0,0 +1,85 @@
+import unittest
+from apimas.errors import ValidationError
+from apimas.components import processors
+
+
+class TestProcessors(unittest.TestCase):
+    def setUp(self):
+        self.spec = {
+            '.collection': {'projection': True},
+            '*': {
+                'foo': {'.string': {}},
+                'bar': {'.integer': {}},
+                'baz': {'.boolean': {}},
+            },
+        }
+
+    def test_get_projection(self):
+        field_names = frozenset(['foo', 'bar', 'baz'])
+        self.assertIsNone(processors.get_projection({}, field_names))
+        self.assertIsNone(processors.get_projection({'fields': ''},
+                                                    field_names))
+        self.assertEqual(
+            processors.get_projection({'fields': 'foo, bar'}, field_names),
+            {'foo', 'bar'})
+        self.assertEqual(
+            processors.get_projection({'exclude': 'foo'}, field_names),
+            {'bar', 'baz'})
+        self.assertRaises(ValidationError, processors.get_projection,
+                          {'fields': 'foo,unknown'}, field_names)
+        self.assertRaises(ValidationError, processors.get_projection,
+                          {'fields': 'foo', 'exclude': 'bar'}, field_names)
+
+    def test_projection(self):
+        processor = processors.Projection(self.spec)
+        context = {'request': {'kwargs': {'params': {'fields': 'foo'}}}}
+        processor.process('api/foo', '/', 'list', context)
+        self.assertEqual(processor.extract(
+            context, processors.Projection.WRITE_KEYS['fields']), {'foo'})
+
+        # Projection is not declared on spec, so parameters are ignored.
+        del self.spec['.collection']
+        processor = processors.Projection(self.spec)
+        processor.process('api/foo', '/', 'list', context)
+        self.assertIsNone(processor.extract(
+            context, processors.Projection.WRITE_KEYS['fields']))
+
+    def test_serialization_projection(self):
+        processor = processors.Serialization(self.spec)
+        data = {'foo': 'foo', 'bar': 1, 'baz': True}
+        context = {'response': {'content': [data]}}
+        processor.process('api/foo', '/', 'list', context)
+        self.assertEqual(context['response']['content'], [data])
+
+        context = {
+            'response': {'content': [data]},
+            'store': {processors.Projection.name: {
+                'fields': frozenset(['foo', 'baz'])}},
+        }
+        processor.process('api/foo', '/', 'list', context)
+        self.assertEqual(context['response']['content'],
+                         [{'foo': 'foo', 'baz': True}])
+
+    def test_is_not_modified(self):
+        etag = processors.compute_etag({'foo': 'bar'})
+        self.assertEqual(etag, processors.compute_etag({'foo': 'bar'}))
+        self.assertNotEqual(etag, processors.compute_etag({'foo': 'baz'}))
+
+        self.assertFalse(processors.is_not_modified({}, etag))
+        self.assertTrue(processors.is_not_modified(
+            {'HTTP_IF_NONE_MATCH': '"other", ' + etag}, etag))
+        self.assertTrue(processors.is_not_modified(
+            {'If-None-Match': '*'}, etag))
+        self.assertFalse(processors.is_not_modified(
+            {'If-None-Match': '"other"'}, etag))
+
+        last_modified = 'Wed, 21 Oct 2015 07:28:00 GMT'
+        headers = {'If-Modified-Since': last_modified}
+        self.assertTrue(processors.is_not_modified(
+            headers, etag, last_modified))
+        self.assertFalse(processors.is_not_modified(
+            headers, etag, 'Wed, 21 Oct 2015 07:29:00 GMT'))
+        # `If-None-Match` takes precedence.
+        headers['If-None-Match'] = '"other"'
+        self.assertFalse(processors.is_not_modified(
+            headers, etag, last_modified))
@@ -1,7 +1,9 @@
 from cStringIO import StringIO
-from datetime import datetime
-import os
+from datetime import date, datetime, timedelta
+import gc
+from itertools import imap, izip, repeat
 import random
+import string
 from urlparse import urljoin
 import zipfile
 from faker import Factory
@@ -13,28 +15,76 @@ from apimas.decorators import after
 fake = Factory.create()
 
 
-def generate_integer(upper=10, lower=0):
-    return random.randint(lower, upper)
+class GeneratorContext(object):
+    """
+    The source of random data of generators.
+
+    By default, generators use the global `random` module and `fake`, and
+    generate dates up to the current time. A context with a `seed` carries
+    its own random generator and faker, seeded, and a fixed current time,
+    so that the data generated with it, in the same order, are the same
+    every time.
+
+    Args:
+        seed: (optional) Seed of the random generator and faker.
+        now (datetime): (optional) The latest datetime generated. If it is
+            not given, it is `REFERENCE_TIME` for seeded contexts, and the
+            current time otherwise.
+
+    Examples:
+        >>> gen_context = GeneratorContext(seed=42)
+        >>> generator = RequestGenerator(SPEC, gen_context=gen_context)
+    """
+    REFERENCE_TIME = datetime(2020, 1, 1)
+
+    def __init__(self, seed=None, now=None):
+        self.seed = seed
+        if seed is None:
+            self.random = random
+            self.fake = fake
+        else:
+            self.random = random.Random(seed)
+            self.fake = Factory.create()
+            self.fake.seed_instance(seed)
+            now = now or self.REFERENCE_TIME
+        self._now = now
+
+    @property
+    def now(self):
+        return self._now or datetime.now()
 
 
-def generate_float(upper=10, lower=0):
-    return random.uniform(lower, upper)
+DEFAULT_GEN_CONTEXT = GeneratorContext()
 
 
-def generate_string(max_length=255):
-    size = random.randint(1, max_length)
-    return fake.pystr(max_chars=size)
+def get_gen_context(gen_context=None):
+    """ Gets the given generator context, or the default one. """
+    return gen_context or DEFAULT_GEN_CONTEXT
 
 
-generate_email = fake.email
+def generate_integer(upper=10, lower=0, gen_context=None):
+    return get_gen_context(gen_context).random.randint(lower, upper)
 
 
-def generate_choices(choices=None):
-    return random.choice(choices or [])
+def generate_float(upper=10, lower=0, gen_context=None):
+    return get_gen_context(gen_context).random.uniform(lower, upper)
 
 
-def generate_boolean():
-    return random.choice([True, False])
+def generate_string(max_length=255, gen_context=None):
+    return generate_strings(1, max_length=max_length,
+                            gen_context=gen_context)[0]
+
+
+def generate_email(gen_context=None):
+    return get_gen_context(gen_context).fake.email()
+
+
+def generate_choices(choices=None, gen_context=None):
+    return get_gen_context(gen_context).random.choice(choices or [])
+
+
+def generate_boolean(gen_context=None):
+    return get_gen_context(gen_context).random.choice([True, False])
 
 
 class DateGenerator(object):
@@ -50,7 +100,7 @@ class DateGenerator(object):
     def __init__(self, native):
         self.native = native
 
-    def __call__(self, date_formats=None):
+    def __call__(self, date_formats=None, gen_context=None):
         """
         Generates a random python date object or a string representing a date
         based on the allowed date formats.
@@ -58,19 +108,16 @@ class DateGenerator(object):
         Args:
             date_formats (list): (optional) List of allowed string formats
                 which are used to represent date.
+            gen_context (GeneratorContext): (optional) Source of random data.
         """
-        date_obj = fake.date_object()
-        if self.native:
-            return date_obj
-        date_formats = date_formats or self.DEFAULT_FORMATS
-        return datetime.strftime(date_obj, random.choice(date_formats))
-        return date_obj
+        return generate_dates(1, native=self.native, date_formats=date_formats,
+                              gen_context=gen_context)[0]
 
 
 class DateTimeGenerator(DateGenerator):
     DEFAULT_FORMATS = ['%Y-%m-%dT%H:%M:%S']
 
-    def __call__(self, date_formats=None, timezone='UTC'):
+    def __call__(self, date_formats=None, timezone='UTC', gen_context=None):
         """
         Generates a random python datetime object or a string representing a
         datetime based on the allowed date formats and the timezone.
@@ -78,21 +125,17 @@ class DateTimeGenerator(DateGenerator):
         Args:
             date_formats (list): (optional) List of allowed string formats
                 which are used to represent date.
-            timezone (str): (optional) Timezone info.
+            timezone (str): (optional) Timezone info, or `True` for a random
+                timezone.
+            gen_context (GeneratorContext): (optional) Source of random data.
         """
-        tzinfo = None
-        if timezone:
-            tzinfo = py_timezone(fake.timezone()) if timezone is True\
-                else py_timezone(timezone)
-        date_obj = fake.date_time(tzinfo=tzinfo)
-        if self.native:
-            return date_obj
-        date_formats = date_formats or self.DEFAULT_FORMATS
-        return datetime.strftime(date_obj, random.choice(date_formats))
-        return date_obj
+        return generate_datetimes(
+            1, native=self.native, date_formats=date_formats,
+            timezone=timezone, gen_context=gen_context)[0]
 
 
-def generate_fake_file(file_name=None, size=8, archived=False):
+def generate_fake_file(file_name=None, size=8, archived=False,
+                       gen_context=None):
     """
     Generates a file-like object using `cStringIO` library.
 
@@ -101,11 +144,13 @@ def generate_fake_file(file_name=None, size=8, archived=False):
             random name is generated.
         size (int):  (optional) Size of the generated file in bytes.
         archived (bool): `True` if generated file should be archived.
+        gen_context (GeneratorContext): (optional) Source of random data.
     """
-    content = os.urandom(size)
+    gen_context = get_gen_context(gen_context)
+    content = _random_bytes(size, gen_context)
     buff = StringIO()
     buff.write(content)
-    file_name = file_name or fake.file_name()
+    file_name = file_name or gen_context.fake.file_name()
     if not archived:
         return buff
     with zipfile.ZipFile(buff, mode='w',
@@ -114,12 +159,116 @@ def generate_fake_file(file_name=None, size=8, archived=False):
     return buff
 
 
-def generate_ref(to):
-    random_pk = random.randint(1, 10)
+def generate_ref(to, gen_context=None):
+    random_pk = get_gen_context(gen_context).random.randint(1, 10)
     ref = to.strip('/') + '/'
     return urljoin(ref, str(random_pk) + '/')
 
 
+# Generators of many values at once, e.g. of the columns of bulk inserts.
+# They produce values similar to the ones of the generators above, much
+# faster.
+
+# Maps every byte to a letter.
+_LETTERS_TABLE = ''.join(
+    string.ascii_letters[i % len(string.ascii_letters)] for i in xrange(256))
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _random_bytes(size, gen_context=None):
+    if not size:
+        return ''
+    getrandbits = get_gen_context(gen_context).random.getrandbits
+    return ('%0*x' % (2 * size, getrandbits(8 * size))).decode('hex')
+
+
+def generate_strings(count, max_length=255, gen_context=None):
+    """ Generates `count` random strings of letters. """
+    gen_context = get_gen_context(gen_context)
+    randint = gen_context.random.randint
+    lengths = [randint(1, max_length) for _ in xrange(count)]
+    letters = _random_bytes(sum(lengths), gen_context).translate(
+        _LETTERS_TABLE)
+    values = []
+    start = 0
+    for length in lengths:
+        values.append(letters[start:start + length])
+        start += length
+    return values
+
+
+def generate_integers(count, upper=10, lower=0, gen_context=None):
+    randint = get_gen_context(gen_context).random.randint
+    return [randint(lower, upper) for _ in xrange(count)]
+
+
+def generate_floats(count, upper=10, lower=0, gen_context=None):
+    rand = get_gen_context(gen_context).random.random
+    scale = upper - lower
+    return [lower + scale * rand() for _ in xrange(count)]
+
+
+def generate_booleans(count, gen_context=None):
+    rand = get_gen_context(gen_context).random.random
+    return [rand() < 0.5 for _ in xrange(count)]
+
+
+def generate_emails(count, gen_context=None):
+    """
+    Generates `count` random email addresses, from a small pool of names and
+    domains.
+    """
+    gen_context = get_gen_context(gen_context)
+    names = [gen_context.fake.user_name() for _ in xrange(min(count, 32))]
+    domains = [gen_context.fake.free_email_domain()
+               for _ in xrange(min(count, 8))]
+    choice = gen_context.random.choice
+    return ['%s%d@%s' % (choice(names), i, choice(domains))
+            for i in xrange(count)]
+
+
+def generate_dates(count, native=True, date_formats=None, gen_context=None):
+    """
+    Generates `count` random dates since 1970, either as python date objects
+    or as strings of the given formats.
+    """
+    gen_context = get_gen_context(gen_context)
+    randint = gen_context.random.randint
+    start = _EPOCH.toordinal()
+    end = gen_context.now.toordinal()
+    values = [date.fromordinal(randint(start, end)) for _ in xrange(count)]
+    if native:
+        return values
+    date_formats = date_formats or DateGenerator.DEFAULT_FORMATS
+    choice = gen_context.random.choice
+    return [value.strftime(choice(date_formats)) for value in values]
+
+
+def generate_datetimes(count, native=True, date_formats=None,
+                       timezone='UTC', gen_context=None):
+    """
+    Generates `count` random datetimes since 1970, either as python datetime
+    objects (of the given timezone, or a random one if `timezone` is
+    `True`) or as strings of the given formats.
+    """
+    gen_context = get_gen_context(gen_context)
+    randint = gen_context.random.randint
+    end = int((gen_context.now - _EPOCH).total_seconds())
+    if timezone is True:
+        timezone = gen_context.fake.timezone()
+    tzinfo = py_timezone(timezone) if timezone else None
+    values = [_EPOCH + timedelta(seconds=randint(0, end))
+              for _ in xrange(count)]
+    if tzinfo is not None:
+        values = [tzinfo.localize(value) for value in values]
+    if native:
+        return values
+    date_formats = date_formats or DateTimeGenerator.DEFAULT_FORMATS
+    choice = gen_context.random.choice
+    return [value.strftime(choice(date_formats)) for value in values]
+
+
 class RequestGenerator(object):
     """
     Generator of random Request data.
@@ -129,6 +278,7 @@ class RequestGenerator(object):
 
     Args:
         spec (dict): Specification of a collection.
+        gen_context (GeneratorContext): (optional) Source of random data.
 
     Examples:
         >>> SPEC = {
@@ -181,8 +331,9 @@ class RequestGenerator(object):
 
     _SKIP = object()
 
-    def __init__(self, spec):
+    def __init__(self, spec, gen_context=None):
         self.spec = spec.get('*')
+        self.gen_context = get_gen_context(gen_context)
         self._constructors = {
             'struct': self._struct,
             'readonly': self._readonly,
@@ -201,7 +352,8 @@ class RequestGenerator(object):
         def generate(context):
             if context.instance is self._SKIP:
                 return None
-            return self.RANDOM_GENERATORS[field_type](**context.spec)
+            return self.RANDOM_GENERATORS[field_type](
+                gen_context=self.gen_context, **context.spec)
         return generate
 
     @after(['.readonly'])
@@ -237,3 +389,141 @@ class RequestGenerator(object):
             allow_constructor_input=False, autoconstruct='default',
             construct_spec=True)
         return instance
+
+
+def _generate_batch(generator):
+    # Batch generator which calls the generator of single values.
+    def generate(count, **kwargs):
+        return [generator(**kwargs) for _ in xrange(count)]
+    return generate
+
+
+def _generate_choices(count, choices=None, gen_context=None):
+    choice = get_gen_context(gen_context).random.choice
+    return [choice(choices or [None]) for _ in xrange(count)]
+
+
+class PayloadFactory(object):
+    """
+    A fast alternative of `RequestGenerator`, for large numbers of requests,
+    e.g. in load tests.
+
+    The spec is compiled once into a function per field, which generates
+    the values of the field for many payloads at once. Values are taken, in
+    short runs from random positions, from a pool of `pool_size` values per
+    field, generated when the factory is created; thus, values repeat, but
+    their combinations rarely do. Files are generated for every payload.
+
+    Args:
+        spec (dict): Specification of a collection.
+        pool_size (int): (optional) Number of values generated per field.
+        gen_context (GeneratorContext): (optional) Source of random data.
+
+    Examples:
+        >>> factory = PayloadFactory(SPEC)
+        >>> factory.construct()
+        {'bar': 7, 'foo': 'PtkvOypcrcxaWfqouPWVbxFZzvaHMJrVSlJ'}
+        >>> payloads = factory.construct_many(1000000)
+    """
+
+    BATCH_GENERATORS = {
+        '.string': generate_strings,
+        '.text': generate_strings,
+        '.email': generate_emails,
+        '.integer': generate_integers,
+        '.float': generate_floats,
+        '.datetime': lambda count, **kwargs: generate_datetimes(
+            count, native=False, **kwargs),
+        '.date': lambda count, **kwargs: generate_dates(
+            count, native=False, **kwargs),
+        '.boolean': generate_booleans,
+        '.choices': _generate_choices,
+        '.ref': _generate_batch(generate_ref),
+    }
+
+    DEFAULT_POOL_SIZE = 10000
+    RUN_LENGTH = 64
+
+    def __init__(self, spec, pool_size=DEFAULT_POOL_SIZE, gen_context=None):
+        self.pool_size = pool_size
+        self.gen_context = get_gen_context(gen_context)
+        self._construct_many = self._compile_struct(spec.get('*', {}))
+
+    def _compile_struct(self, spec):
+        fields = [(name, self._compile_field(field_spec))
+                  for name, field_spec in sorted(spec.iteritems())
+                  if not name.startswith('.')]
+        names = [name for name, _ in fields]
+
+        def construct_many(count):
+            if not fields:
+                return [{} for _ in xrange(count)]
+            columns = [generate(count) for _, generate in fields]
+            return map(dict, imap(izip, repeat(names), izip(*columns)))
+        return construct_many
+
+    def _compile_field(self, spec):
+        if '.readonly' in spec or '.serial' in spec:
+            return lambda count: [None] * count
+        for key in ('.struct=', '.struct'):
+            if key in spec:
+                return self._compile_struct(spec[key])
+        for key in ('.array of=', '.array of'):
+            if key in spec:
+                generate = self._compile_field(spec[key])
+                return lambda count: [[value] for value in generate(count)]
+        if '.file' in spec:
+            return lambda count: _generate_batch(generate_fake_file)(
+                count, gen_context=self.gen_context, **(spec['.file'] or {}))
+        for predicate, generator in self.BATCH_GENERATORS.iteritems():
+            if predicate in spec:
+                pool = generator(self.pool_size, gen_context=self.gen_context,
+                                 **(spec[predicate] or {}))
+                break
+        else:
+            return lambda count: [None] * count
+        size = len(pool)
+        if not size:
+            return lambda count: [None] * count
+        # Values are taken in runs from random positions of the pool, which is
+        # much faster than drawing each one of them.
+        cycle = pool + pool[:self.RUN_LENGTH]
+
+        def draw(count):
+            rand = self.gen_context.random.random
+            values = []
+            while len(values) < count:
+                start = int(rand() * size)
+                values.extend(cycle[start:start + min(
+                    self.RUN_LENGTH, count - len(values))])
+            return values
+        return draw
+
+    def construct(self):
+        """
+        Generates random data based on specification.
+
+        Returns:
+            dict: A dictionary of random data per field.
+        """
+        return self._construct_many(1)[0]
+
+    def construct_many(self, count):
+        """
+        Generates many payloads at once.
+
+        Args:
+            count (int): Number of payloads.
+
+        Returns:
+            list: A list of `count` dictionaries of random data per field.
+        """
+        # The garbage collector would be triggered repeatedly, in vain, by
+        # the allocation of the payloads.
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return self._construct_many(count)
+        finally:
+            if enabled:
+                gc.enable()
@@ -0,0 +1,134 @@
+"""
+Micro-benchmarks of the primitives of the documents engine
+(`apimas.documents`), on random documents and specs of controllable size and
+depth, generated with `random_doc`.
+
+For every size (number of generated nodes), the following primitives are
+timed: `doc_construct` (plain, and with a constructor on every leaf),
+`doc_iter`, `doc_merge`, `doc_match`, `doc_match_levels`, `doc_to_ns` and
+`doc_from_ns`. The memory held by the result of each primitive is reported
+as well (and the allocations of the call, if `tracemalloc` is available).
+
+Usage:
+    $ python benchmarks/bench_documents.py --sizes 32,256,2048 --depth 7
+"""
+import copy
+import random
+import common
+
+
+common.setup_paths()
+
+
+def leaf_constructor(context):
+    return context.instance or context.loc[-1]
+
+
+def get_constructor_spec(doc):
+    """
+    Get a spec whose leaves are constructors, i.e. leaf `alpha` becomes
+    `{'.alpha': {}}`.
+    """
+    if type(doc) is not dict:
+        return {'.' + doc: {}}
+    return {key: get_constructor_spec(value)
+            for key, value in doc.iteritems()}
+
+
+def get_pattern_sets(doc):
+    """ Get the sets of path segments per level of a document. """
+    from apimas import documents
+    pattern_sets = []
+    for path, _ in documents.doc_iter(doc):
+        for level, segment in enumerate(path):
+            if level >= len(pattern_sets):
+                pattern_sets.append(set())
+            pattern_sets[level].add(segment)
+    return pattern_sets
+
+
+def get_primitives(doc, other_doc, depth):
+    """
+    Get the functions which call every primitive of the documents engine
+    with the given documents.
+    """
+    from apimas import documents
+
+    spec = get_constructor_spec(doc)
+    constructors = {leaf: leaf_constructor
+                    for leaf in set(documents.doc_to_ns(doc).itervalues())}
+    aggregators = [documents.AnyOfAggregator() for _ in xrange(depth + 2)]
+    pattern_sets = get_pattern_sets(doc)
+    ns = documents.doc_to_ns(doc)
+
+    return {
+        'doc_construct': lambda: documents.doc_construct(
+            {}, doc, autoconstruct=True),
+        'doc_construct_constructors': lambda: documents.doc_construct(
+            {}, spec, constructors=constructors),
+        'doc_iter': lambda: list(documents.doc_iter(doc)),
+        'doc_merge': lambda: documents.doc_merge(
+            doc, other_doc, documents.standard_merge),
+        'doc_match': lambda: documents.doc_match(
+            doc, doc, aggregators, automerge=True),
+        'doc_match_levels': lambda: list(documents.doc_match_levels(
+            doc, pattern_sets, expand_pattern_levels=())),
+        'doc_to_ns': lambda: documents.doc_to_ns(doc),
+        'doc_from_ns': lambda: documents.doc_from_ns(ns),
+    }
+
+
+def get_doc_stats(doc):
+    from apimas import documents
+    paths = [path for path, _ in documents.doc_iter(doc)]
+    return {
+        'nodes': len(paths),
+        'leaves': len(documents.doc_to_ns(doc)),
+        'depth': max(len(path) for path in paths) if paths else 0,
+    }
+
+
+def main():
+    parser = common.get_argparser(
+        'Primitives of the documents engine', sizes='32,256,2048',
+        repeat=20)
+    parser.add_argument('--depth', type=int, default=7,
+                        help='Depth of the generated documents.')
+    parser.add_argument(
+        '--primitives', default=None, type=lambda x: x.split(','),
+        help='Comma-separated list of primitives to measure (default: all).')
+    args = parser.parse_args()
+
+    from apimas import documents
+
+    # Documents are generated from their own random generator, so that
+    # they are the same for the same seed.
+    rng = random.Random(args.seed)
+    results = []
+    for size in sorted(args.sizes):
+        # All leaves are at the same depth, so that documents grow linearly
+        # with the number of nodes.
+        doc = documents.random_doc(
+            nr_nodes=size, max_depth=args.depth, min_depth=args.depth,
+            rng=rng)
+        other_doc = documents.random_doc(
+            nr_nodes=size, max_depth=args.depth, min_depth=args.depth,
+            rng=rng)
+        stats = get_doc_stats(doc)
+        primitives = get_primitives(doc, other_doc, args.depth)
+        for name, func in sorted(primitives.iteritems()):
+            if args.primitives and name not in args.primitives:
+                continue
+            # Primitives must not modify their input.
+            original = copy.deepcopy(doc)
+            durations = common.measure(func, repeat=args.repeat, warmup=1)
+            assert doc == original, name
+            result = dict(common.summarize(durations), primitive=name,
+                          size=size, **stats)
+            result.update(common.measure_allocations(func))
+            results.append(result)
+    common.write_report('documents', results, output=args.output)
+
+
+if __name__ == '__main__':
+    main()
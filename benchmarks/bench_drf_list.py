@@ -0,0 +1,120 @@
+"""
+Benchmark of a list endpoint made by the DRF adapter, whose collection mixes
+model fields and computed (non-model) fields.
+
+Usage:
+    $ python benchmarks/bench_drf_list.py --sizes 10,100,1000 --repeat 50
+"""
+import common
+
+
+common.setup_paths(common.join(common.ROOT_DIR, 'apimas-drf'))
+
+
+def get_title(instance):
+    return instance.text.title()
+
+
+def get_length(value):
+    return len(value)
+
+
+def get_spec():
+    source = __name__ + '.get_title'
+    return {
+        'api': {
+            '.endpoint': {
+                'permissions': [('*',) * 6],
+            },
+            'mymodel': {
+                '.collection': {},
+                '.drf_collection': {
+                    'model': 'tests.models.MyModel',
+                },
+                '*': {
+                    'id': {
+                        '.drf_field': {},
+                        '.serial': {},
+                        '.readonly': {},
+                    },
+                    'text': {
+                        '.drf_field': {},
+                        '.text': {},
+                    },
+                    'number': {
+                        '.drf_field': {},
+                        '.integer': {},
+                    },
+                    'float_number': {
+                        '.drf_field': {},
+                        '.float': {},
+                    },
+                    'datetime_field': {
+                        '.drf_field': {},
+                        '.datetime': {},
+                    },
+                    'title': {
+                        '.drf_field': {
+                            'onmodel': False,
+                            'instance_source': source,
+                        },
+                        '.string': {},
+                        '.readonly': {},
+                    },
+                    'title_length': {
+                        '.drf_field': {
+                            'onmodel': False,
+                            'instance_source': (
+                                source + ',' + __name__ + '.get_length'),
+                        },
+                        '.integer': {},
+                        '.readonly': {},
+                    },
+                },
+                '.actions=': {
+                    '.list': {},
+                },
+            },
+        },
+    }
+
+
+urlpatterns = []
+
+
+def main():
+    parser = common.get_argparser(
+        'List endpoint with computed fields (DRF adapter)')
+    args = parser.parse_args()
+    common.setup_django(installed_apps=('tests.apps.TestApp',),
+                        root_urlconf=__name__)
+
+    from django.test import Client
+    from apimas.django import model_utils
+    from apimas.drf.django_rest import DjangoRestAdapter
+    from tests.models import MyModel
+
+    adapter = DjangoRestAdapter()
+    adapter.construct(get_spec())
+    urlpatterns.extend(adapter.urls.values())
+    common.create_tables([MyModel])
+
+    client = Client()
+    results = []
+    for size in sorted(args.sizes):
+        # Datasets are populated incrementally.
+        for _ in xrange(size - MyModel.objects.count()):
+            model_utils.populate_model(MyModel, instances={})
+
+        def request():
+            response = client.get('/api/mymodel/')
+            assert response.status_code == 200, response.content
+
+        durations = common.measure(request, repeat=args.repeat)
+        results.append(dict(common.summarize(durations), size=size,
+                            action='list'))
+    common.write_report('drf_list', results, output=args.output)
+
+
+if __name__ == '__main__':
+    main()
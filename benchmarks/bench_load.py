@@ -0,0 +1,165 @@
+"""
+Load test of an APIMAS API with a mix of `create`, `list`, `retrieve`,
+`update`, `partial_update` and `delete` requests, generated from its spec
+(see `apimas.testing.load`).
+
+Two kinds of targets are supported:
+
+  * A running API, given by an APIMAS configuration file (`--config`), i.e.
+    the file used by the `apimas` CLI with the root URL and the spec of the
+    API.
+  * The django adapter with a spec generated from the models of the
+    `apimas-django` tests, served in-process by the django test client (the
+    default). Requests are sent one at a time (`--concurrency` is ignored);
+    this target is meant to catch regressions, not for capacity planning.
+
+The report includes the throughput, the errors and the latency percentiles
+of every collection and action, and of all requests (`total`).
+
+Usage:
+    $ python benchmarks/bench_load.py --duration 10
+    $ python benchmarks/bench_load.py --config ~/.apimas --duration 60 \\
+        --concurrency 20 --rate 500 --mix create=1,list=1,retrieve=8 \\
+        --header 'Authorization: Token 1234'
+"""
+import argparse
+import common
+
+
+common.setup_paths(common.join(common.ROOT_DIR, 'apimas-django'))
+
+urlpatterns = []
+
+
+def parse_mix(value):
+    mix = {}
+    for item in value.split(','):
+        action, _, weight = item.partition('=')
+        mix[action.strip()] = float(weight or 1)
+    return mix
+
+
+def parse_header(value):
+    name, _, header_value = value.partition(':')
+    return name.strip(), header_value.strip()
+
+
+def get_remote_target(args):
+    from apimas import config
+    from apimas.clients.sessions import create_session
+    from apimas.testing.load import RequestsTransport
+
+    conf = config.configure(args.config)
+    session_conf = dict(conf.get('session') or {})
+    session_conf['pool_size'] = max(
+        session_conf.get('pool_size', 0), args.concurrency)
+    transport = RequestsTransport(
+        conf['root'], session=create_session(**session_conf),
+        headers=dict(args.header))
+    return conf['spec'], transport
+
+
+def get_django_target(args, gen_context):
+    import copy
+    import bench_pipeline
+    common.setup_django(installed_apps=('tests.apps.TestApp',),
+                        root_urlconf=__name__)
+
+    from django.core.management import call_command
+    from apimas.django.adapter import DjangoAdapter
+    from apimas.testing.load import DjangoTransport
+
+    call_command('migrate', verbosity=0, interactive=False)
+    spec = bench_pipeline.get_django_spec(gen_context)
+    for key, collection_spec in spec['bench'].iteritems():
+        if not key.startswith('.'):
+            collection_spec['*']['.actions=']['.delete'] = {}
+    adapter = DjangoAdapter()
+    # Adapters consume the specs they construct.
+    adapter.construct(copy.deepcopy(spec))
+    urlpatterns.extend(adapter.get_urlpatterns())
+
+    instances = {}
+    for key, collection_spec in spec['bench'].iteritems():
+        if not key.startswith('.'):
+            model = bench_pipeline.get_model(collection_spec)
+            bench_pipeline.populate(model, args.size, instances,
+                                    gen_context)
+    return spec, DjangoTransport()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Load test of an APIMAS API')
+    parser.add_argument(
+        '--config', default=None,
+        help='APIMAS configuration file of a running API. If it is not'
+             ' given, the in-process django target is used.')
+    parser.add_argument('--duration', type=float, default=None,
+                        help='Duration of the run in seconds.')
+    parser.add_argument('--requests', type=int, default=None,
+                        help='Total number of requests.')
+    parser.add_argument('--concurrency', type=int, default=1,
+                        help='Number of concurrent requests.')
+    parser.add_argument('--rate', type=float, default=None,
+                        help='Maximum number of requests per second.')
+    parser.add_argument(
+        '--mix', type=parse_mix, default=None,
+        help='Comma-separated weights of actions, e.g.'
+             ' create=1,list=2,retrieve=8.')
+    parser.add_argument(
+        '--collections', default=None, type=lambda x: x.split(','),
+        help='Comma-separated paths of collections, e.g. api/foo.')
+    parser.add_argument('--header', type=parse_header, action='append',
+                        default=[], help='Header of every request.')
+    parser.add_argument(
+        '--size', type=int, default=100,
+        help='Number of resources of every collection (django target).')
+    parser.add_argument(
+        '--payload-factory', action='store_true',
+        help='Generate request bodies with `PayloadFactory`, i.e. from pools'
+             ' of pre-generated values.')
+    parser.add_argument(
+        '--seed', type=int, default=0,
+        help='Seed of the random data. Runs of the django target with the'
+             ' same seed send the same requests.')
+    parser.add_argument('--output', default=None,
+                        help='File to write the JSON report to.')
+    args = parser.parse_args()
+    if args.duration is None and args.requests is None:
+        args.duration = 10
+
+    from apimas.testing.load import LoadGenerator
+    from apimas.utils.generators import (
+        GeneratorContext, PayloadFactory, RequestGenerator)
+
+    gen_context = GeneratorContext(seed=args.seed)
+    if args.config:
+        target, (spec, transport) = 'remote', get_remote_target(args)
+    else:
+        # The in-memory database is bound to the connection of this thread.
+        args.concurrency = 1
+        target, (spec, transport) = 'django', get_django_target(
+            args, gen_context)
+    generator_class = PayloadFactory if args.payload_factory \
+        else RequestGenerator
+    generator = LoadGenerator(spec, transport, mix=args.mix,
+                              collections=args.collections,
+                              generator_class=generator_class,
+                              gen_context=gen_context)
+    generator.load_resource_ids()
+    report = generator.run(duration=args.duration, requests=args.requests,
+                           concurrency=args.concurrency, rate=args.rate)
+    results = []
+    for result in report.summary():
+        # JSON keys are strings; `None` stands for failed requests.
+        result['statuses'] = {str(status): count for status, count
+                              in result['statuses'].iteritems()}
+        results.append(dict(result, target=target))
+    results.append(dict(report.total(), target=target, collection='total',
+                        action=None))
+    common.write_report('load', results, output=args.output)
+
+
+if __name__ == '__main__':
+    main()
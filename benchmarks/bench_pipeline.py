@@ -0,0 +1,203 @@
+"""
+Benchmark of the request pipeline (`create`, `list`, `retrieve` and `update`)
+of the APIMAS adapters under the django test client.
+
+Two targets are measured:
+
+  * `eshop`: The DRF adapter with the spec of the eshop example
+    (`apimas-drf/examples/eshop_project`), for its collections which do not
+    require authentication.
+  * `django`: The django adapter with a spec generated from the models of the
+    `apimas-django` tests.
+
+Every collection is populated with random data at each dataset size, and
+request bodies are generated from the spec with `RequestGenerator`. Random
+data are generated from `--seed`, i.e. they are the same for the same seed.
+
+Usage:
+    $ python benchmarks/bench_pipeline.py --sizes 10,100,1000 --repeat 50
+    $ python benchmarks/bench_pipeline.py --targets django --actions list
+"""
+import copy
+import json
+import common
+
+
+ESHOP_DIR = common.join(
+    common.ROOT_DIR, 'apimas-drf', 'examples', 'eshop_project')
+common.setup_paths(common.join(common.ROOT_DIR, 'apimas-django'), ESHOP_DIR)
+
+ACTIONS = ('create', 'list', 'retrieve', 'update')
+
+# Collections of the eshop example which can be accessed anonymously.
+ESHOP_COLLECTIONS = ('manufacturers', 'products', 'users')
+
+DJANGO_MODELS = ('tests.models.MyModel', 'tests.models.MyModel2')
+
+urlpatterns = []
+
+
+def get_eshop_spec():
+    from eshop.api_spec import API_SPEC
+    spec = {'api': {
+        key: value for key, value in API_SPEC['api'].iteritems()
+        if key.startswith('.') or key in ESHOP_COLLECTIONS}}
+    return spec
+
+
+def get_django_spec(gen_context=None):
+    from apimas.django.generators import SpecGenerator
+    spec = SpecGenerator(endpoint='bench', gen_context=gen_context).generate(
+        list(DJANGO_MODELS))
+    for key, collection_spec in spec['bench'].iteritems():
+        if key.startswith('.'):
+            continue
+        # Actions of generated specs are random.
+        collection_spec['.actions='] = {'.list': {}, '.create': {}}
+        collection_spec['*']['.actions='] = {'.retrieve': {}, '.update': {}}
+    return spec
+
+
+def get_actions(collection_spec):
+    """ Get the names of the actions of a collection and its resources. """
+    actions = set(collection_spec.get('.actions=', {}))
+    actions.update(collection_spec.get('*', {}).get('.actions=', {}))
+    return {action[1:] for action in actions}
+
+
+def get_model(collection_spec):
+    from apimas import utils
+    params = (collection_spec.get('.drf_collection') or
+              collection_spec.get('.collection'))
+    return utils.import_object(params['model'])
+
+
+def populate(model, size, instances, gen_context=None):
+    """
+    Populate the table of a model incrementally up to `size` rows, in bulk.
+
+    `instances` holds an instance per model, i.e. the one whose URL is
+    requested by `retrieve` and `update`.
+    """
+    from apimas.django import model_utils
+    missing = size - model.objects.count()
+    if missing > 0:
+        model_utils.populate_models({model: missing},
+                                    gen_context=gen_context)
+    instances[model] = model.objects.order_by('pk').first()
+
+
+def get_request(action, url, pk, generator):
+    """
+    Get a function which makes a request to an action and checks that it
+    succeeded.
+    """
+    from django.test import Client
+    client = Client()
+    resource_url = url + str(pk) + '/'
+
+    def create():
+        data = json.dumps(generator.construct())
+        response = client.post(url, data, content_type='application/json')
+        assert response.status_code == 201, response.content
+
+    def list_():
+        response = client.get(url)
+        assert response.status_code == 200, response.content
+
+    def retrieve():
+        response = client.get(resource_url)
+        assert response.status_code == 200, response.content
+
+    def update():
+        data = json.dumps(generator.construct())
+        response = client.put(resource_url, data,
+                              content_type='application/json')
+        assert response.status_code == 200, response.content
+
+    return {
+        'create': create,
+        'list': list_,
+        'retrieve': retrieve,
+        'update': update,
+    }[action]
+
+
+def run_target(target, spec, args, instances, gen_context):
+    from apimas.utils.generators import RequestGenerator
+
+    results = []
+    for endpoint, endpoint_spec in sorted(spec.iteritems()):
+        if endpoint.startswith('.'):
+            continue
+        for collection, collection_spec in sorted(endpoint_spec.iteritems()):
+            if collection.startswith('.'):
+                continue
+            model = get_model(collection_spec)
+            url = '/%s/%s/' % (endpoint, collection)
+            actions = [action for action in ACTIONS
+                       if action in get_actions(collection_spec) and
+                       action in args.actions]
+            generator = RequestGenerator(collection_spec,
+                                         gen_context=gen_context)
+            for size in sorted(args.sizes):
+                populate(model, size, instances, gen_context)
+                pk = instances[model].pk
+                for action in actions:
+                    request = get_request(action, url, pk, generator)
+                    durations = common.measure(request, repeat=args.repeat)
+                    results.append(dict(
+                        common.summarize(durations), target=target,
+                        collection=collection, action=action, size=size))
+                # `create` adds rows; reset the table to its nominal size.
+                if 'create' in actions:
+                    model.objects.exclude(pk__in=model.objects.order_by(
+                        'pk').values_list('pk', flat=True)[:size]).delete()
+    return results
+
+
+def main():
+    parser = common.get_argparser(
+        'Request pipeline of the DRF and django adapters')
+    parser.add_argument(
+        '--targets', default='eshop,django', type=lambda x: x.split(','),
+        help='Comma-separated list of targets (eshop, django).')
+    parser.add_argument(
+        '--actions', default=','.join(ACTIONS), type=lambda x: x.split(','),
+        help='Comma-separated list of actions to measure.')
+    args = parser.parse_args()
+    common.setup_django(
+        installed_apps=('eshop', 'tests.apps.TestApp'),
+        root_urlconf=__name__, AUTH_USER_MODEL='eshop.UserProfile')
+
+    from django.core.management import call_command
+    from apimas.django.adapter import DjangoAdapter
+    from apimas.drf.django_rest import DjangoRestAdapter
+    from apimas.utils.generators import GeneratorContext
+
+    call_command('migrate', verbosity=0, interactive=False)
+    gen_context = GeneratorContext(seed=args.seed)
+    # Adapters consume the specs they construct, so they are given copies.
+    targets = {}
+    if 'eshop' in args.targets:
+        adapter = DjangoRestAdapter()
+        targets['eshop'] = get_eshop_spec()
+        adapter.construct(copy.deepcopy(targets['eshop']))
+        urlpatterns.extend(adapter.urls.values())
+    if 'django' in args.targets:
+        adapter = DjangoAdapter()
+        targets['django'] = get_django_spec(gen_context)
+        adapter.construct(copy.deepcopy(targets['django']))
+        urlpatterns.extend(adapter.get_urlpatterns())
+
+    # Instances used for the relations of populated models.
+    instances = {}
+    results = []
+    for target in args.targets:
+        results.extend(run_target(target, targets[target], args, instances,
+                                  gen_context))
+    common.write_report('pipeline', results, output=args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark of the client-side validation of records with date, datetime and
+email fields, i.e. the validation done by `ApimasClient` before sending
+data, e.g. in data ingestion and sync jobs.
+
+For every size (number of records), the following are timed:
+
+* `validate`: Validation of all records with the validator of a client.
+* `partial_validate`: Partial validation of all records (as in PATCH
+  requests).
+* `date_normalizer`: The date normalizers of the client on all values.
+* `strptime`: Parsing all date values with `datetime.strptime()`, as a
+  reference for the date normalizers.
+
+Usage:
+    $ python benchmarks/bench_validators.py --sizes 1000,100000
+"""
+import random
+from datetime import datetime, timedelta
+import common
+
+
+common.setup_paths()
+
+
+DATE_FORMAT = '%Y-%m-%d'
+DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+
+def get_schema():
+    """ Get a validation schema, as generated by `ApimasClientAdapter`. """
+    from apimas.clients.extensions import DateNormalizer, DateTimeNormalizer
+    return {
+        'name': {'type': 'string', 'required': True},
+        'email': {'type': 'email', 'required': True},
+        'birth_date': {
+            'type': 'string',
+            'coerce': DateNormalizer(string_formats=[DATE_FORMAT]),
+        },
+        'created': {
+            'type': 'string',
+            'coerce': DateTimeNormalizer(
+                string_formats=[DATETIME_FORMAT, DATE_FORMAT]),
+        },
+    }
+
+
+def get_records(size):
+    start = datetime(2000, 1, 1)
+    records = []
+    for i in xrange(size):
+        created = start + timedelta(seconds=random.randint(0, 10 ** 9))
+        records.append({
+            'name': 'user%d' % i,
+            'email': 'user%d@example.com' % i,
+            'birth_date': created.date().strftime(DATE_FORMAT),
+            'created': created.strftime(DATETIME_FORMAT),
+        })
+    return records
+
+
+def get_targets(records):
+    from apimas.clients import ApimasClient
+
+    schema = get_schema()
+    client = ApimasClient('http://bench.test/api/users/', schema)
+    date_normalizer = schema['birth_date']['coerce']
+    datetime_normalizer = schema['created']['coerce']
+
+    def validate():
+        for record in records:
+            client.validate(record)
+
+    def partial_validate():
+        for record in records:
+            client.partial_validate(dict(record))
+
+    def normalize_dates():
+        for record in records:
+            date_normalizer(record['birth_date'])
+            datetime_normalizer(record['created'])
+
+    def strptime():
+        for record in records:
+            datetime.strptime(record['birth_date'], DATE_FORMAT)
+            datetime.strptime(record['created'], DATETIME_FORMAT)
+
+    return {
+        'validate': validate,
+        'partial_validate': partial_validate,
+        'date_normalizer': normalize_dates,
+        'strptime': strptime,
+    }
+
+
+def main():
+    parser = common.get_argparser(
+        'Client-side validation of records', sizes='1000,10000,100000',
+        repeat=3)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    results = []
+    for size in sorted(args.sizes):
+        records = get_records(size)
+        for name, func in sorted(get_targets(records).iteritems()):
+            durations = common.measure(func, repeat=args.repeat, warmup=1)
+            result = dict(common.summarize(durations), target=name,
+                          size=size)
+            result['records_per_sec'] = size / (
+                sum(durations) / len(durations))
+            results.append(result)
+    common.write_report('validators', results, output=args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,243 @@
+"""
+Common utilities used by the APIMAS benchmarks.
+
+Benchmarks are plain scripts which can be run from the root of the
+repository, e.g.
+
+    $ python benchmarks/bench_drf_list.py --sizes 10,100,1000
+
+Every benchmark writes a machine-readable JSON report (to the standard output
+or to the file given by `--output`), so that results can be compared across
+commits.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+from os.path import abspath, dirname, join
+
+try:
+    import tracemalloc
+except ImportError:
+    # Python 2 has no tracemalloc.
+    tracemalloc = None
+
+ROOT_DIR = dirname(dirname(abspath(__file__)))
+
+# Directories of the APIMAS packages which live in this repository.
+PACKAGE_DIRS = [
+    join(ROOT_DIR, 'apimas'),
+    join(ROOT_DIR, 'apimas-django'),
+    join(ROOT_DIR, 'apimas-drf'),
+]
+
+
+def setup_paths(*extra_dirs):
+    """
+    Make the in-tree APIMAS packages (and any extra directories) importable.
+
+    Extra directories take precedence over the package directories, e.g. to
+    select which `tests` package is imported.
+    """
+    paths = []
+    for path in list(extra_dirs) + PACKAGE_DIRS:
+        if path not in paths:
+            paths.append(path)
+    for path in reversed(paths):
+        if path in sys.path:
+            sys.path.remove(path)
+        sys.path.insert(0, path)
+
+
+def setup_django(installed_apps=(), root_urlconf=None, **kwargs):
+    """
+    Configure django with an in-memory SQLite database.
+
+    Args:
+        installed_apps (tuple): Applications to be installed in addition to
+            the standard django and rest framework ones.
+        root_urlconf (str): (optional) Module path of the URL configuration.
+        **kwargs: Any additional django settings.
+    """
+    from django.conf import settings
+
+    middleware = (
+        'django.middleware.common.CommonMiddleware',
+        'django.contrib.sessions.middleware.SessionMiddleware',
+        'django.contrib.auth.middleware.AuthenticationMiddleware',
+    )
+    conf = {
+        'DEBUG': False,
+        'DATABASES': {
+            'default': {
+                'ENGINE': 'django.db.backends.sqlite3',
+                'NAME': ':memory:'
+            }
+        },
+        'SECRET_KEY': 'not very secret in benchmarks',
+        'USE_TZ': True,
+        'MIDDLEWARE': middleware,
+        'MIDDLEWARE_CLASSES': middleware,
+        'ALLOWED_HOSTS': ['*'],
+        'INSTALLED_APPS': (
+            'django.contrib.auth',
+            'django.contrib.contenttypes',
+            'django.contrib.sessions',
+            'rest_framework',
+        ) + tuple(installed_apps),
+        'ROOT_URLCONF': root_urlconf,
+        'PASSWORD_HASHERS': (
+            'django.contrib.auth.hashers.MD5PasswordHasher',
+        ),
+    }
+    conf.update(kwargs)
+    settings.configure(**conf)
+    import django
+    django.setup()
+
+
+def create_tables(models):
+    """ Create the database tables of the given django models. """
+    from django.db import connection
+    with connection.schema_editor() as editor:
+        for model in models:
+            editor.create_model(model)
+
+
+def measure(func, repeat=100, warmup=5):
+    """
+    Call the given function multiple times and measure the wall time of each
+    call.
+
+    Returns:
+        list: Durations of every call in seconds.
+    """
+    for _ in xrange(warmup):
+        func()
+    durations = []
+    timer = time.time
+    for _ in xrange(repeat):
+        start = timer()
+        func()
+        durations.append(timer() - start)
+    return durations
+
+
+def get_deep_size(obj):
+    """
+    Get the size in bytes of an object, including the size of the objects
+    which it contains (for dicts, lists, tuples and sets).
+    """
+    seen = set()
+    stack = [obj]
+    size = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.iterkeys())
+            stack.extend(obj.itervalues())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+    return size
+
+
+def measure_allocations(func):
+    """
+    Call the given function once and measure its memory allocations.
+
+    Returns:
+        dict: `result_kb`, i.e. the deep size of the result of the call. If
+        `tracemalloc` is available, the memory `allocated_kb` by the call
+        (and still held) and its `peak_kb` are also reported.
+    """
+    stats = {'result_kb': get_deep_size(func()) / 1024.0}
+    if tracemalloc is not None:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            result = func()
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        del result
+        stats['allocated_kb'] = current / 1024.0
+        stats['peak_kb'] = peak / 1024.0
+    return stats
+
+
+def percentile(values, pct):
+    """ Get the percentile `pct` (0-100) of the given values. """
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = int(round((pct / 100.0) * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def summarize(durations):
+    """
+    Summarize the given durations into throughput and latency statistics.
+
+    Latencies are reported in milliseconds.
+    """
+    total = sum(durations)
+    count = len(durations)
+    return {
+        'count': count,
+        'mean_ms': total / count * 1000 if count else None,
+        'p50_ms': percentile(durations, 50) * 1000 if count else None,
+        'p99_ms': percentile(durations, 99) * 1000 if count else None,
+        'min_ms': min(durations) * 1000 if count else None,
+        'max_ms': max(durations) * 1000 if count else None,
+        'throughput': count / total if total else None,
+    }
+
+
+def get_argparser(description, sizes='10,100,1000', repeat=50):
+    """ Get an argument parser with the options shared by benchmarks. """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        '--sizes', default=sizes,
+        type=lambda x: [int(size) for size in x.split(',')],
+        help='Comma-separated list of dataset sizes.')
+    parser.add_argument('--repeat', type=int, default=repeat,
+                        help='Number of measured iterations.')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Seed of the random data of the benchmark.')
+    parser.add_argument('--output', default=None,
+                        help='File to write the JSON report to.')
+    return parser
+
+
+def write_report(name, results, output=None):
+    """
+    Write a JSON report of the benchmark results.
+
+    Args:
+        name (str): Name of the benchmark.
+        results: Any JSON-serializable object with the results.
+        output (str): (optional) Path of the report file. If `None`, report
+            is written to the standard output.
+    """
+    report = {
+        'benchmark': name,
+        'timestamp': time.time(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'commit': os.environ.get('APIMAS_COMMIT'),
+        'results': results,
+    }
+    data = json.dumps(report, indent=2, sort_keys=True,
+                      separators=(',', ': '))
+    if output is None:
+        sys.stdout.write(data + '\n')
+        return
+    with open(output, 'w') as f:
+        f.write(data + '\n')